@@ -30,9 +30,9 @@ class Backtester:
             SELECT DISTINCT token_id 
             FROM token_metrics_timeseries 
             WHERE instability_index >= $1 
-              AND timestamp > NOW() - ($2 || ' days')::INTERVAL
+              AND timestamp > NOW() - make_interval(days => $2)
             """,
-            self.ii_threshold, str(self.days)
+            self.ii_threshold, self.days
         )
         
         token_ids = [str(r['token_id']) for r in target_tokens]
@@ -2,13 +2,21 @@
 Simple in-memory TTL cache for API responses.
 """
 
+import asyncio
+import heapq
 import time
-from typing import Any
+from typing import Any, Awaitable, Callable
 from loguru import logger
 
 class CacheManager:
-    def __init__(self):
+    def __init__(self, max_entries: int = 10000):
         self._cache = {}
+        # key -> [lock, callers in flight]; dropped when the last caller leaves
+        self._locks: dict[str, list] = {}
+        # (expiry, key) min-heap: eviction pops expired entries without a full scan.
+        # Entries whose expiry no longer matches _cache are stale and skipped.
+        self._expiries: list[tuple[float, str]] = []
+        self._max_entries = max_entries
 
     def get(self, key: str) -> Any | None:
         """Retrieve value if key exists and is not expired."""
@@ -24,11 +32,60 @@ class CacheManager:
 
     def set(self, key: str, value: Any, ttl_seconds: int = 300) -> None:
         """Set value with TTL (default 5 min)."""
-        expiry = time.time() + ttl_seconds
+        now = time.time()
+        if key not in self._cache and len(self._cache) >= self._max_entries:
+            self._evict(now)
+        expiry = now + ttl_seconds
         self._cache[key] = (value, expiry)
+        heapq.heappush(self._expiries, (expiry, key))
+        # Overwrites and lazy deletes in get() leave stale heap entries: rebuild when they dominate
+        if len(self._expiries) > 2 * len(self._cache) + 64:
+            self._expiries = [(exp, k) for k, (_, exp) in self._cache.items()]
+            heapq.heapify(self._expiries)
+
+    def _evict(self, now: float) -> None:
+        """Drop expired entries; if still full, drop the one expiring soonest."""
+        heap = self._expiries
+        while heap:
+            expiry, k = heap[0]
+            entry = self._cache.get(k)
+            if entry is None or entry[1] != expiry:
+                heapq.heappop(heap)  # stale
+                continue
+            if now <= expiry and len(self._cache) < self._max_entries:
+                break
+            heapq.heappop(heap)
+            del self._cache[k]
+
+    async def get_or_compute(self, key: str, compute: Callable[[], Awaitable[Any]],
+                             ttl_seconds: float = 300) -> Any:
+        """Return the cached value, or await `compute()` once and cache it.
+        Concurrent misses on the same key wait for a single computation."""
+        value = self.get(key)
+        if value is not None:
+            return value
+
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                value = self.get(key)
+                if value is None:
+                    value = await compute()
+                    self.set(key, value, ttl_seconds)
+        finally:
+            # Last caller out drops the lock, also when compute() raised
+            entry[1] -= 1
+            if entry[1] == 0 and self._locks.get(key) is entry:
+                del self._locks[key]
+        return value
 
     def clear(self) -> None:
         self._cache.clear()
+        self._locks.clear()
+        self._expiries.clear()
 
 # Global instance
 cache = CacheManager()
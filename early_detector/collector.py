@@ -3,27 +3,45 @@ Data collector — async fetchers for DexScreener, Jupiter, and basic metrics.
 """
 
 import asyncio
+import random
 import aiohttp
 from loguru import logger
 from early_detector.config import (
-    DEXSCREENER_API_URL, PUMPPORTAL_API_KEY
+    DEXSCREENER_API_URL, DEXSCREENER_RPS, DEXSCREENER_BACKGROUND_RPS, PUMPPORTAL_API_KEY, LOG_LEVEL
 )
 from early_detector.helius_client import get_token_largest_accounts, get_asset, get_token_buyers
 from early_detector.cache import cache
+from early_detector.metadata_store import metadata_store
+from early_detector.ratelimit import AsyncTokenBucket
+
+# Resolved once at import: the hot path skips building debug f-strings
+# entirely unless LOG_LEVEL is DEBUG (or lower).
+_DEBUG = logger.level(LOG_LEVEL).no <= logger.level("DEBUG").no
+
+# Shared by every DexScreener call so all callers stay within one quota
+dexscreener_limiter = AsyncTokenBucket(rate=DEXSCREENER_RPS, burst=10)
+# Low-priority lane (creator scan): a caller must pass this bucket before queuing on the
+# shared one, so at most one background request sits ahead of hot-path callers
+dexscreener_background_limiter = AsyncTokenBucket(rate=DEXSCREENER_BACKGROUND_RPS, burst=1)
+# Max seconds a call may wait for a slot (queue included) before giving up
+DEXSCREENER_ACQUIRE_TIMEOUT = 5.0
+DEXSCREENER_BACKGROUND_ACQUIRE_TIMEOUT = 60.0
 
 async def fetch_dex_metadata(session: aiohttp.ClientSession, token_address: str) -> dict | None:
     """Fetch basic name/symbol from DexScreener as a fast fallback."""
     url = f"{DEXSCREENER_API_URL}/dex/tokens/{token_address}"
     try:
-        async with session.get(url, timeout=5) as resp:
+        await dexscreener_limiter.acquire(DEXSCREENER_ACQUIRE_TIMEOUT)
+        async with asyncio.timeout(5), session.get(url) as resp:
+            dexscreener_limiter.update_from_response(resp.status, resp.headers)
             if resp.status == 200:
                 data = await resp.json()
                 pairs = data.get("pairs", [])
                 if pairs:
-                    pair = pairs[0]  # First pair usually has the info
+                    base = pairs[0].get("baseToken") or {}  # First pair usually has the info
                     return {
-                        "name": pair.get("baseToken", {}).get("name"),
-                        "symbol": pair.get("baseToken", {}).get("symbol")
+                        "name": base.get("name"),
+                        "symbol": base.get("symbol")
                     }
     except Exception as e:
         logger.debug(f"Dex metadata fetch failed: {e}")
@@ -38,11 +56,12 @@ async def fetch_jupiter_price(session: aiohttp.ClientSession, token_address: str
     """Fetch price from Jupiter Public API (High rate limit/Free)."""
     url = f"{JUPITER_PRICE_API_URL}?ids={token_address}"
     try:
-        async with session.get(url, timeout=8) as resp:
+        async with asyncio.timeout(8), session.get(url) as resp:
             if resp.status == 200:
                 body = await resp.json()
-                data = body.get("data", {}).get(token_address, {})
-                price = data.get("price")
+                data = body.get("data")
+                entry = data.get(token_address) if data else None
+                price = entry.get("price") if entry else None
                 return float(price) if price else None
             return None
     except Exception as e:
@@ -50,7 +69,10 @@ async def fetch_jupiter_price(session: aiohttp.ClientSession, token_address: str
 
 # ── Helius RPC (Holders & Metadata) ───────────────────────────────────────────
 
-async def fetch_helius_metrics(session: aiohttp.ClientSession, token_address: str) -> dict:
+TOP10_CACHE_TTL = 120  # seconds a computed top10 ratio is reused across scans
+
+async def fetch_helius_metrics(session: aiohttp.ClientSession, token_address: str,
+                               fetch_creator: bool = True) -> dict:
     """
     Fetch Top10 Holders Ratio and Creator info using Helius RPC.
     
@@ -60,91 +82,214 @@ async def fetch_helius_metrics(session: aiohttp.ClientSession, token_address: st
     
     For graduated/established tokens:
     - getTokenLargestAccounts is used to compute real Top10 ratio.
-    - getAsset is used for creator information.
+    - getAsset is used for creator information (skipped when fetch_creator is False).
+
+    All lookups run concurrently.
     """
+    short8 = token_address[:8]
+    is_pump = token_address.endswith("pump")
     res = {}
 
-    if token_address.endswith("pump"):
+    # The three lookups hit different endpoints (RPC pool vs Helius DAS), so they
+    # can't share one JSON-RPC batch; issue them concurrently instead so the
+    # wallclock cost is a single round trip.
+    async def _skipped():
+        return None
+
+    # Holder distribution moves slowly relative to the scan interval; reuse a
+    # recent top10 ratio instead of re-polling getTokenLargestAccounts each scan.
+    top10_key = f"top10:{token_address}"
+    cached_top10 = None if is_pump else cache.get(top10_key)
+
+    accounts, asset, buyers = await asyncio.gather(
+        _skipped() if is_pump or cached_top10 is not None
+        else get_token_largest_accounts(session, token_address),
+        get_asset(session, token_address) if fetch_creator else _skipped(),
+        # V4.8: Fetch recent buyers for Insider Risk detection
+        get_token_buyers(session, token_address, limit=15),
+        return_exceptions=True,
+    )
+
+    if is_pump:
         # Bonding curve tokens: the pump bonding curve contract holds ~100% of supply.
         # This is NORMAL and expected — no need to waste a Helius credit querying it.
         res["top10_ratio"] = 100.0
-        logger.debug(f"Helius: {token_address[:8]} is a pump BC token → top10_ratio=100% (expected)")
-    else:
-        # Graduated / established token — query real holder distribution
-        try:
-            accounts = await get_token_largest_accounts(session, token_address)
-            if accounts:
-                top_10 = sum(float(acc.get("amount", 0)) for acc in accounts[:10])
-                total_supply = sum(float(acc.get("amount", 0)) for acc in accounts)
-                if total_supply > 0:
-                    res["top10_ratio"] = min((top_10 / total_supply) * 100, 100.0)
-                    logger.debug(f"Helius: {token_address[:8]} top10_ratio={res['top10_ratio']:.1f}%")
-        except Exception as e:
-            logger.debug(f"Helius holders error for {token_address[:8]}: {e}")
-
-    # Always try getAsset for creator info (silently skipped if token not indexed yet)
-    try:
-        asset = await get_asset(session, token_address)
-        if asset:
-            creators = asset.get("creators", [])
-            if creators:
-                res["creator"] = creators[0].get("address")
-            else:
-                res["creator"] = asset.get("token_info", {}).get("update_authority")
-            if res.get("creator"):
-                logger.debug(f"Helius: {token_address[:8]} creator={res['creator'][:8]}...")
-    except Exception as e:
-        logger.debug(f"Helius DAS meta error for {token_address[:8]}: {e}")
-
-    # V4.8: Fetch recent buyers for Insider Risk detection
-    try:
-        buyers = await get_token_buyers(session, token_address, limit=15)
-        if buyers:
-            res["buyers_data"] = buyers
-            logger.debug(f"Helius: {token_address[:8]} fetched {len(buyers)} early buyers")
-    except Exception as e:
-        logger.debug(f"Helius buyers fetch error for {token_address[:8]}: {e}")
+        if _DEBUG:
+            logger.debug(f"Helius: {short8} is a pump BC token → top10_ratio=100% (expected)")
+    elif cached_top10 is not None:
+        res["top10_ratio"] = cached_top10
+    elif isinstance(accounts, Exception):
+        logger.debug(f"Helius holders error for {short8}: {accounts}")
+    elif accounts:
+        # Graduated / established token — real holder distribution.
+        # Single pass: accumulate both totals while parsing each amount once
+        top_10 = 0.0
+        total_supply = 0.0
+        for i, acc in enumerate(accounts):
+            amt = float(acc.get("amount", 0) or 0)
+            total_supply += amt
+            if i < 10:
+                top_10 += amt
+        if total_supply > 0:
+            res["top10_ratio"] = min((top_10 / total_supply) * 100, 100.0)
+            cache.set(top10_key, res["top10_ratio"], ttl_seconds=TOP10_CACHE_TTL)
+            if _DEBUG:
+                logger.debug(f"Helius: {short8} top10_ratio={res['top10_ratio']:.1f}%")
+
+    # Creator info from getAsset (empty if token not indexed yet)
+    if isinstance(asset, Exception):
+        logger.debug(f"Helius DAS meta error for {short8}: {asset}")
+    elif asset:
+        creators = asset.get("creators", [])
+        if creators:
+            res["creator"] = creators[0].get("address")
+        else:
+            token_info = asset.get("token_info")
+            res["creator"] = token_info.get("update_authority") if token_info else None
+        if _DEBUG and res.get("creator"):
+            logger.debug(f"Helius: {short8} creator={res['creator'][:8]}...")
+
+    if isinstance(buyers, Exception):
+        logger.debug(f"Helius buyers fetch error for {short8}: {buyers}")
+    elif buyers:
+        res["buyers_data"] = buyers
+        if _DEBUG:
+            logger.debug(f"Helius: {short8} fetched {len(buyers)} early buyers")
 
     return res
 
 # ── DexScreener ───────────────────────────────────────────────────────────────
 
+def _parse_dex_pair(pair: dict) -> dict:
+    """Extract the fields we use from a DexScreener pair object.
+
+    Nested sub-objects are looked up once and bound to locals so that each
+    field costs a single dict lookup instead of a chained ``.get().get()``.
+    """
+    base = pair.get("baseToken") or {}
+    liquidity = pair.get("liquidity") or {}
+    volume = pair.get("volume") or {}
+    txns = pair.get("txns") or {}
+    txns_5m = txns.get("m5") or {}
+    info = pair.get("info") or {}
+
+    has_twitter = False
+    for s in info.get("socials") or ():
+        if s.get("type") == "twitter":
+            has_twitter = True
+            break
+
+    return {
+        "name": base.get("name"),
+        "symbol": base.get("symbol"),
+        "price": float(pair.get("priceUsd", 0) or 0),
+        "marketcap": float(pair.get("fdv", 0) or 0),
+        "liquidity": float(liquidity.get("usd", 0) or 0),
+        "volume_5m": float(volume.get("m5", 0) or 0),
+        "volume_1h": float(volume.get("h1", 0) or 0),
+        "buys_5m": int(txns_5m.get("buys", 0) or 0),
+        "sells_5m": int(txns_5m.get("sells", 0) or 0),
+        "pair_created_at": pair.get("pairCreatedAt"),
+        "has_twitter": has_twitter,
+    }
+
+
+def _best_pair(pairs: list[dict]) -> dict:
+    """Return the pair with highest liquidity (single pass, no key-function dispatch)."""
+    best = pairs[0]
+    best_liq = -1.0
+    for p in pairs:
+        liq = p.get("liquidity")
+        usd = float(liq.get("usd", 0) or 0) if liq else 0.0
+        if usd > best_liq:
+            best_liq = usd
+            best = p
+    return best
+
+
+DEXSCREENER_MAX_ATTEMPTS = 4
+_RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+async def _dexscreener_get_json(session: aiohttp.ClientSession, url: str,
+                                timeout: float = 10, background: bool = False) -> dict | None:
+    """
+    GET a DexScreener URL through the shared limiter, retrying 429/5xx and
+    network errors with jittered exponential backoff (0.2s → 5s).
+    `background` callers go through the low-priority lane first.
+    Returns None on other non-200 statuses; re-raises the last network error
+    (or TimeoutError if no rate-limit slot frees up in time).
+    """
+    for attempt in range(DEXSCREENER_MAX_ATTEMPTS):
+        last = attempt == DEXSCREENER_MAX_ATTEMPTS - 1
+        try:
+            if background:
+                await dexscreener_background_limiter.acquire(DEXSCREENER_BACKGROUND_ACQUIRE_TIMEOUT)
+            await dexscreener_limiter.acquire(DEXSCREENER_ACQUIRE_TIMEOUT)
+            async with asyncio.timeout(timeout), session.get(url) as resp:
+                dexscreener_limiter.update_from_response(resp.status, resp.headers)
+                if resp.status == 200:
+                    return await resp.json()
+                if resp.status not in _RETRY_STATUSES or last:
+                    return None
+        except (aiohttp.ClientError, TimeoutError):
+            if last:
+                raise
+        # On 429 the limiter has already been paused for Retry-After
+        await asyncio.sleep(min(5.0, 0.2 * 2 ** attempt) * random.uniform(0.5, 1.0))
+    return None
+
+
 async def fetch_dexscreener_pair(session: aiohttp.ClientSession,
                                  token_address: str) -> dict | None:
     """Fetch pair data from DexScreener as fallback / enrichment."""
     url = f"{DEXSCREENER_API_URL}/dex/tokens/{token_address}"
     try:
-        async with session.get(url, timeout=10) as resp:
-            if resp.status != 200:
-                return None
-            body = await resp.json()
-            pairs = body.get("pairs", [])
-            if not pairs:
-                return None
-            # Use the pair with highest liquidity
-            pair = max(pairs, key=lambda p: float(p.get("liquidity", {}).get("usd", 0) or 0))
-            
-            socials = pair.get("info", {}).get("socials", [])
-            has_twitter = any(s.get("type") == "twitter" for s in socials)
-            
-            return {
-                "name": pair.get("baseToken", {}).get("name"),
-                "symbol": pair.get("baseToken", {}).get("symbol"),
-                "price": float(pair.get("priceUsd", 0) or 0),
-                "marketcap": float(pair.get("fdv", 0) or 0),
-                "liquidity": float(pair.get("liquidity", {}).get("usd", 0) or 0),
-                "volume_5m": float(pair.get("volume", {}).get("m5", 0) or 0),
-                "volume_1h": float(pair.get("volume", {}).get("h1", 0) or 0),
-                "buys_5m": int(pair.get("txns", {}).get("m5", {}).get("buys", 0) or 0),
-                "sells_5m": int(pair.get("txns", {}).get("m5", {}).get("sells", 0) or 0),
-                "pair_created_at": pair.get("pairCreatedAt"),
-                "has_twitter": has_twitter,
-            }
+        body = await _dexscreener_get_json(session, url)
+        pairs = body.get("pairs") if body else None
+        if not pairs:
+            return None
+        return _parse_dex_pair(_best_pair(pairs))
     except Exception as e:
         logger.error(f"DexScreener fetch error for {token_address}: {e}")
         return None
 
 
+DEXSCREENER_BATCH_SIZE = 30  # max comma-joined addresses accepted by /dex/tokens
+
+
+async def fetch_dexscreener_pairs_batch(session: aiohttp.ClientSession,
+                                        addresses: list[str],
+                                        background: bool = False) -> dict[str, dict]:
+    """
+    Fetch pair data for up to DEXSCREENER_BATCH_SIZE tokens in a single request.
+    Returns {address: metrics} using the highest-liquidity pair of each token;
+    tokens without pairs are absent from the result.
+    background=True: low-priority lane (bulk scans that must not delay the hot path).
+    """
+    addresses = addresses[:DEXSCREENER_BATCH_SIZE]
+    if not addresses:
+        return {}
+    url = f"{DEXSCREENER_API_URL}/dex/tokens/{','.join(addresses)}"
+    try:
+        body = await _dexscreener_get_json(session, url, background=background)
+        if body is None:
+            return {}
+        pairs = body.get("pairs") or []
+    except Exception as e:
+        logger.error(f"DexScreener batch fetch error ({len(addresses)} tokens): {e}")
+        return {}
+
+    wanted = set(addresses)
+    by_token: dict[str, list[dict]] = {}
+    for p in pairs:
+        base = p.get("baseToken")
+        addr = base.get("address") if base else None
+        if addr in wanted:
+            by_token.setdefault(addr, []).append(p)
+    return {addr: _parse_dex_pair(_best_pair(token_pairs)) for addr, token_pairs in by_token.items()}
+
+
 # ── Pump.fun (Authentic Holders/Meta) ──────────────────────────────────────────
 
 async def fetch_pump_fun_metrics(session: aiohttp.ClientSession, token_address: str) -> dict | None:
@@ -153,6 +298,7 @@ async def fetch_pump_fun_metrics(session: aiohttp.ClientSession, token_address:
     """
     if not token_address.endswith("pump"):
         return None
+    short8 = token_address[:8]
     
     # V6.1: Try direct pump.fun API first for accurate bonding curve data
     try:
@@ -163,6 +309,7 @@ async def fetch_pump_fun_metrics(session: aiohttp.ClientSession, token_address:
             # We have real bonding curve data from pump.fun API
             SOL_PRICE = 150.0
             virtual_sol = pump_data.get("virtual_sol_reserves", 0)
+            price_sol = pump_data.get("price_sol")
             
             return {
                 "holders": pump_data.get("holders", 0),
@@ -170,17 +317,19 @@ async def fetch_pump_fun_metrics(session: aiohttp.ClientSession, token_address:
                 "virtual_token_reserves": pump_data.get("virtual_token_reserves", 0),
                 "virtual_sol_reserves": virtual_sol,
                 "market_cap": pump_data.get("market_cap", 0),
-                "price": pump_data.get("price_sol", 0) * SOL_PRICE if pump_data.get("price_sol") else 0,
+                "price": price_sol * SOL_PRICE if price_sol else 0,
                 "liquidity": virtual_sol * SOL_PRICE,  # Real liquidity from SOL reserves
                 "bonding_pct": pump_data.get("bonding_pct", 0),
             }
     except Exception as e:
-        logger.debug(f"Pump.fun API fetch for {token_address[:8]}: {e}")
+        logger.debug(f"Pump.fun API fetch for {short8}: {e}")
     
     # Fallback to DexScreener for pump tokens if pump.fun API fails
     try:
         url = f"{DEXSCREENER_API_URL}/dex/tokens/{token_address}"
-        async with session.get(url, timeout=5) as resp:
+        await dexscreener_limiter.acquire(DEXSCREENER_ACQUIRE_TIMEOUT)
+        async with asyncio.timeout(5), session.get(url) as resp:
+            dexscreener_limiter.update_from_response(resp.status, resp.headers)
             if resp.status == 200:
                 data = await resp.json()
                 pairs = data.get("pairs", [])
@@ -195,7 +344,8 @@ async def fetch_pump_fun_metrics(session: aiohttp.ClientSession, token_address:
                         pump_pair = pairs[0]
                     
                     # Extract liquidity info for SOL reserves estimation
-                    liq = float(pump_pair.get("liquidity", {}).get("usd", 0) or 0)
+                    liq_obj = pump_pair.get("liquidity")
+                    liq = float(liq_obj.get("usd", 0) or 0) if liq_obj else 0.0
                     mcap = float(pump_pair.get("fdv", 0) or 0)
                     price = float(pump_pair.get("priceUsd", 0) or 0)
                     
@@ -214,19 +364,200 @@ async def fetch_pump_fun_metrics(session: aiohttp.ClientSession, token_address:
                         "liquidity": liq,
                     }
     except Exception as e:
-        logger.debug(f"DexScreener fetch for pump token {token_address[:8]}: {e}")
+        logger.debug(f"DexScreener fetch for pump token {short8}: {e}")
     
     return None
 
 
 # ── Unified fetch ─────────────────────────────────────────────────────────────
 
+# Fields that were previously provided by Helius/Birdeye; merged under every
+# result to avoid crashes in feature calculation.
+_DEFAULTS = {
+    "holders": 0.0,
+    "top10_ratio": 0.0,
+    "mint_authority": None,
+    "freeze_authority": None,
+    "creator_risk_score": 0.0,
+    "unique_buyers_50tx": 0.0,
+    "insider_psi": 0.0,
+    "has_twitter": 0.0,
+}
+
+
+async def _enrich_pump_metrics(session: aiohttp.ClientSession, token_address: str,
+                               metrics: dict) -> None:
+    """
+    Pump.fun bonding-curve enrichment: holders, real/virtual liquidity and bonding progress.
+    Only called for pump tokens, so this path carries no per-field is_pump checks.
+    """
+    short8 = token_address[:8]
+    pump_sol_reserves = 0  # Initialize for later use in bonding calculation
+    pump_is_complete = False
+
+    # Fetch Pump.fun data FIRST (before applying any virtual liquidity)
+    pump_meta = await fetch_pump_fun_metrics(session, token_address)
+
+    if pump_meta:
+        # Use Pump.fun as PRIMARY source for these fields (more accurate/real-time)
+        pump_holders = pump_meta.get("holders", 0)
+        pump_mcap = pump_meta.get("market_cap", 0)
+        pump_sol_reserves = pump_meta.get("virtual_sol_reserves", 0)
+        pump_is_complete = pump_meta.get("is_complete", False)
+
+        # Update holders from Pump.fun
+        if pump_holders > 0:
+            metrics["holders"] = pump_holders
+
+        # Update market cap from Pump.fun (more accurate for new tokens)
+        if pump_mcap > 0:
+            metrics["marketcap"] = pump_mcap
+
+        # Calculate REAL liquidity from bonding curve SOL reserves
+        # SOL price is approximately $150-200, we use conservative $150
+        if pump_sol_reserves > 0:
+            # Real liquidity = SOL reserves * SOL price (approx)
+            sol_price_estimate = 150.0  # Conservative estimate
+            real_liq = pump_sol_reserves * sol_price_estimate
+            metrics["liquidity"] = real_liq
+            metrics["liquidity_is_virtual"] = False
+            if _DEBUG:
+                logger.debug(f"Pump.fun liquidity for {short8}: ${real_liq:,.0f} ({pump_sol_reserves:.2f} SOL reserves)")
+
+        if pump_is_complete:
+            metrics["bonding_is_complete"] = True
+
+        if pump_meta.get("twitter"):
+            metrics["has_twitter"] = True
+
+    # Now apply fallbacks if Pump.fun didn't provide complete data
+    mcap = metrics.get("marketcap") or 0
+    price = metrics.get("price") or 0
+
+    # Estimate market cap from price if still not available
+    if mcap <= 0 and price > 0:
+        mcap = price * 1_000_000_000
+        metrics["marketcap"] = mcap
+
+    curr_liq = metrics.get("liquidity") or 0
+
+    # Apply virtual liquidity ONLY if we still don't have real liquidity
+    if curr_liq < 100:
+        if mcap > 0:
+            virtual_liq = min(mcap * 0.20, 2000.0)
+            metrics["liquidity"] = virtual_liq
+            metrics["liquidity_is_virtual"] = True
+            if _DEBUG:
+                logger.debug(f"Applied VIRTUAL liquidity for {short8}: ${virtual_liq:,.0f} (fallback)")
+        elif price > 0:
+            virtual_liq = max(100, min(price * 200_000_000, 500))
+            metrics["liquidity"] = virtual_liq
+            metrics["liquidity_is_virtual"] = True
+            if _DEBUG:
+                logger.debug(f"Applied BASE VIRTUAL liquidity for {short8}: ${virtual_liq:,.0f}")
+    else:
+        if "liquidity_is_virtual" not in metrics:
+            metrics["liquidity_is_virtual"] = False
+
+    # Compute bonding progress percentage
+    # V6.1 FIX: Correct bonding curve calculation
+    # Pump.fun bonding curve starts at ~30 SOL and graduates at ~85 SOL
+    # The progress should be calculated as: (current - start) / (graduation - start)
+    START_SOL = 30.0      # Pump.fun bonding curve starts at ~30 SOL (~$4,500)
+    GRADUATION_SOL = 85.0  # Pump.fun graduates at ~85 SOL (~$12,750)
+    SOL_PRICE = 150.0      # Approximate SOL price for USD conversions
+
+    # Check if we have bonding_pct directly from pump.fun API
+    if pump_meta and pump_meta.get("bonding_pct", 0) > 0:
+        metrics["bonding_pct"] = pump_meta["bonding_pct"]
+        metrics["bonding_is_complete"] = pump_meta.get("is_complete", False)
+        if _DEBUG:
+            logger.debug(f"Bonding from pump.fun API: {metrics['bonding_pct']:.1f}%")
+    elif pump_sol_reserves > 0:
+        # Primary calculation from SOL reserves (most accurate)
+        # Correct formula: progress = (current - start) / (end - start)
+        bonding_pct = ((pump_sol_reserves - START_SOL) / (GRADUATION_SOL - START_SOL)) * 100
+
+        # Only set 100% if SOL reserves actually exceed graduation threshold
+        if pump_sol_reserves >= GRADUATION_SOL or pump_is_complete:
+            # Verify graduation with SOL reserves check
+            if pump_sol_reserves >= GRADUATION_SOL:
+                metrics["bonding_pct"] = 100.0
+                metrics["bonding_is_complete"] = True
+                if _DEBUG:
+                    logger.debug(f"Bonding GRADUATED for {short8}: {pump_sol_reserves:.2f} SOL >= {GRADUATION_SOL} SOL")
+            else:
+                # is_complete might be wrong or stale, trust SOL reserves
+                metrics["bonding_pct"] = min(bonding_pct, 99.0)
+                metrics["bonding_is_complete"] = False
+                if _DEBUG:
+                    logger.debug(f"Bonding progress from SOL reserves: {pump_sol_reserves:.2f} SOL = {bonding_pct:.1f}% (is_complete={pump_is_complete} ignored)")
+        else:
+            metrics["bonding_pct"] = max(0.0, min(bonding_pct, 99.0))
+            metrics["bonding_is_complete"] = False
+            if _DEBUG:
+                logger.debug(f"Bonding progress from SOL reserves: {pump_sol_reserves:.2f} SOL = {bonding_pct:.1f}%")
+    else:
+        # Fallback: Calculate from liquidity or market cap
+        liq = metrics.get("liquidity") or 0
+        mcap = metrics.get("marketcap") or 0
+
+        if liq > (START_SOL * SOL_PRICE):  # More than ~$4,500 liquidity
+            # Estimate SOL reserves from liquidity
+            sol_reserves_est = liq / SOL_PRICE
+            bonding_pct = ((sol_reserves_est - START_SOL) / (GRADUATION_SOL - START_SOL)) * 100
+            metrics["bonding_pct"] = max(0.0, min(bonding_pct, 99.0))
+            if _DEBUG:
+                logger.debug(f"Bonding progress from liquidity: ${liq:.0f} = {sol_reserves_est:.2f} SOL = {bonding_pct:.1f}%")
+        elif mcap > 4500:  # More than ~$4,500 market cap
+            # V6.1: Estimate bonding progress from market cap
+            # Pump.fun bonding curve uses a constant product formula:
+            # price = k * SOL_reserves / token_reserves
+            # 
+            # The bonding curve progresses from ~$4,500 (0%) to ~$69,000 (100%)
+            # But this is NOT linear - the price increases exponentially
+            #
+            # For a more accurate estimate, we use the DexScreener approach:
+            # Progress ≈ (MCAP - START_MCAP) / (GRAD_MCAP - START_MCAP)
+            # Where START_MCAP ≈ $4,500 and GRAD_MCAP ≈ $69,000
+            #
+            # However, the progress shown by DexScreener is based on SOL reserves
+            # not market cap. The relationship is:
+            # bonding_pct = (SOL_reserves - 30) / 55 * 100
+            #
+            # Market cap scales with SOL reserves, but not linearly.
+            # Empirical observation: for tokens around $10K-20K MCAP,
+            # progress is roughly 50-80%
+            #
+            # Let's use a conservative linear approximation:
+            START_MCAP = 4500.0
+            GRADUATION_MCAP = 69000.0
+
+            # Linear interpolation from market cap
+            bonding_pct = ((mcap - START_MCAP) / (GRADUATION_MCAP - START_MCAP)) * 100
+            metrics["bonding_pct"] = max(0.0, min(bonding_pct, 99.0))
+            if _DEBUG:
+                logger.debug(f"Bonding progress from MCAP ${mcap:.0f}: {bonding_pct:.1f}%")
+        else:
+            # Token is very early, show 0% or minimal progress
+            metrics["bonding_pct"] = 0.0
+
+    if _DEBUG:
+        logger.debug(f"Bonding data for {short8}: holders={metrics.get('holders')}, complete={metrics.get('bonding_is_complete')}, pct={metrics.get('bonding_pct', 0):.1f}%")
+
+
 async def fetch_token_metrics(session: aiohttp.ClientSession,
                                token_address: str) -> dict | None:
     """
     Fetch metrics from DexScreener first; fallback to Jupiter for price and metadata.
     Birdeye and Helius RPC removals implemented.
     """
+    is_pump = token_address.endswith("pump")
+    short8 = token_address[:8]
+    default_name = f"Token #{short8}"
+    default_symbol = f"TOK{token_address[:4]}"
+    cached_meta = await metadata_store.aget(token_address)
+
     # DexScreener as primary
     metrics = await fetch_dexscreener_pair(session, token_address)
 
@@ -237,9 +568,9 @@ async def fetch_token_metrics(session: aiohttp.ClientSession,
         if j_price:
             # If we have price but no name/symbol, try to enrich with Jupiter metadata
             if not metrics.get("name"):
-                metrics["name"] = f"Token #{token_address[:8]}"
+                metrics["name"] = default_name
             if not metrics.get("symbol"):
-                metrics["symbol"] = f"TOK{token_address[:4]}"
+                metrics["symbol"] = default_symbol
 
     # Fallback to Jupiter for price if DexScreener fails
     if metrics is None or not metrics.get("price"):
@@ -248,8 +579,8 @@ async def fetch_token_metrics(session: aiohttp.ClientSession,
             if metrics is None:
                 metrics = {"price": j_price, "address": token_address}
                 # Add basic name/symbol if creating new metrics
-                metrics["name"] = f"Token #{token_address[:8]}"
-                metrics["symbol"] = f"TOK{token_address[:4]}"
+                metrics["name"] = default_name
+                metrics["symbol"] = default_symbol
             else:
                 metrics["price"] = j_price
 
@@ -261,153 +592,35 @@ async def fetch_token_metrics(session: aiohttp.ClientSession,
             "marketcap": 0.0,
             "holders": 0,
             "volume_1h": 0.0,
-            "name": f"Token #{token_address[:8]}",
-            "symbol": f"TOK{token_address[:4]}"
+            "name": default_name,
+            "symbol": default_symbol
         }
 
+    # Prefill slow-changing metadata persisted by a previous run
+    if cached_meta:
+        if cached_meta["name"] and metrics.get("name") in (None, "", default_name):
+            metrics["name"] = cached_meta["name"]
+        if cached_meta["symbol"] and metrics.get("symbol") in (None, "", default_symbol):
+            metrics["symbol"] = cached_meta["symbol"]
+        if cached_meta["creator"] and not metrics.get("creator_address"):
+            metrics["creator_address"] = cached_meta["creator"]
+        if cached_meta["has_twitter"] and not metrics.get("has_twitter"):
+            metrics["has_twitter"] = True
+
+    # Fast path: without a price from DexScreener or Jupiter a non-pump token
+    # can't become viable below (no virtual liquidity, no Helius), so skip
+    # the enrichment stages entirely.
+    if not is_pump and not metrics.get("price"):
+        if not metrics.get("liquidity"):
+            if _DEBUG:
+                logger.debug(f"Skipping dead token {short8}: price=0, liquidity=0")
+            return None
+        return {**_DEFAULTS, **metrics}
+
     # ── V5.3: Pump.fun FIRST for accurate real-time data ──
     # Pump.fun has the freshest data for pump tokens - use it as PRIMARY source
-    pump_sol_reserves = 0  # Initialize for later use in bonding calculation
-    if token_address.endswith("pump"):
-        # Fetch Pump.fun data FIRST (before applying any virtual liquidity)
-        pump_meta = await fetch_pump_fun_metrics(session, token_address)
-        
-        if pump_meta:
-            # Use Pump.fun as PRIMARY source for these fields (more accurate/real-time)
-            pump_holders = pump_meta.get("holders", 0)
-            pump_mcap = pump_meta.get("market_cap", 0)
-            pump_sol_reserves = pump_meta.get("virtual_sol_reserves", 0)
-            pump_is_complete = pump_meta.get("is_complete", False)
-            
-            # Update holders from Pump.fun
-            if pump_holders > 0:
-                metrics["holders"] = pump_holders
-                
-            # Update market cap from Pump.fun (more accurate for new tokens)
-            if pump_mcap > 0:
-                metrics["marketcap"] = pump_mcap
-                
-            # Calculate REAL liquidity from bonding curve SOL reserves
-            # SOL price is approximately $150-200, we use conservative $150
-            if pump_sol_reserves > 0:
-                # Real liquidity = SOL reserves * SOL price (approx)
-                sol_price_estimate = 150.0  # Conservative estimate
-                real_liq = pump_sol_reserves * sol_price_estimate
-                metrics["liquidity"] = real_liq
-                metrics["liquidity_is_virtual"] = False
-                logger.debug(f"Pump.fun liquidity for {token_address[:8]}: ${real_liq:,.0f} ({pump_sol_reserves:.2f} SOL reserves)")
-            
-            if pump_is_complete:
-                metrics["bonding_is_complete"] = True
-                
-            if pump_meta.get("twitter"):
-                metrics["has_twitter"] = True
-        
-        # Now apply fallbacks if Pump.fun didn't provide complete data
-        mcap = metrics.get("marketcap") or 0
-        price = metrics.get("price") or 0
-        
-        # Estimate market cap from price if still not available
-        if mcap <= 0 and price > 0:
-            mcap = price * 1_000_000_000
-            metrics["marketcap"] = mcap
-            
-        curr_liq = metrics.get("liquidity") or 0
-        
-        # Apply virtual liquidity ONLY if we still don't have real liquidity
-        if curr_liq < 100:
-            if mcap > 0:
-                virtual_liq = min(mcap * 0.20, 2000.0)
-                metrics["liquidity"] = virtual_liq
-                metrics["liquidity_is_virtual"] = True
-                logger.debug(f"Applied VIRTUAL liquidity for {token_address[:8]}: ${virtual_liq:,.0f} (fallback)")
-            elif price > 0:
-                virtual_liq = max(100, min(price * 200_000_000, 500))
-                metrics["liquidity"] = virtual_liq
-                metrics["liquidity_is_virtual"] = True
-                logger.debug(f"Applied BASE VIRTUAL liquidity for {token_address[:8]}: ${virtual_liq:,.0f}")
-        else:
-            if "liquidity_is_virtual" not in metrics:
-                metrics["liquidity_is_virtual"] = False
-
-        # Compute bonding progress percentage
-        # V6.1 FIX: Correct bonding curve calculation
-        # Pump.fun bonding curve starts at ~30 SOL and graduates at ~85 SOL
-        # The progress should be calculated as: (current - start) / (graduation - start)
-        START_SOL = 30.0      # Pump.fun bonding curve starts at ~30 SOL (~$4,500)
-        GRADUATION_SOL = 85.0  # Pump.fun graduates at ~85 SOL (~$12,750)
-        SOL_PRICE = 150.0      # Approximate SOL price for USD conversions
-        
-        # Check if we have bonding_pct directly from pump.fun API
-        if pump_meta and pump_meta.get("bonding_pct", 0) > 0:
-            metrics["bonding_pct"] = pump_meta["bonding_pct"]
-            metrics["bonding_is_complete"] = pump_meta.get("is_complete", False)
-            logger.debug(f"Bonding from pump.fun API: {metrics['bonding_pct']:.1f}%")
-        elif pump_sol_reserves > 0:
-            # Primary calculation from SOL reserves (most accurate)
-            # Correct formula: progress = (current - start) / (end - start)
-            bonding_pct = ((pump_sol_reserves - START_SOL) / (GRADUATION_SOL - START_SOL)) * 100
-            
-            # Only set 100% if SOL reserves actually exceed graduation threshold
-            if pump_sol_reserves >= GRADUATION_SOL or pump_is_complete:
-                # Verify graduation with SOL reserves check
-                if pump_sol_reserves >= GRADUATION_SOL:
-                    metrics["bonding_pct"] = 100.0
-                    metrics["bonding_is_complete"] = True
-                    logger.debug(f"Bonding GRADUATED for {token_address[:8]}: {pump_sol_reserves:.2f} SOL >= {GRADUATION_SOL} SOL")
-                else:
-                    # is_complete might be wrong or stale, trust SOL reserves
-                    metrics["bonding_pct"] = min(bonding_pct, 99.0)
-                    metrics["bonding_is_complete"] = False
-                    logger.debug(f"Bonding progress from SOL reserves: {pump_sol_reserves:.2f} SOL = {bonding_pct:.1f}% (is_complete={pump_is_complete} ignored)")
-            else:
-                metrics["bonding_pct"] = max(0.0, min(bonding_pct, 99.0))
-                metrics["bonding_is_complete"] = False
-                logger.debug(f"Bonding progress from SOL reserves: {pump_sol_reserves:.2f} SOL = {bonding_pct:.1f}%")
-        else:
-            # Fallback: Calculate from liquidity or market cap
-            liq = metrics.get("liquidity") or 0
-            mcap = metrics.get("marketcap") or 0
-            
-            if liq > (START_SOL * SOL_PRICE):  # More than ~$4,500 liquidity
-                # Estimate SOL reserves from liquidity
-                sol_reserves_est = liq / SOL_PRICE
-                bonding_pct = ((sol_reserves_est - START_SOL) / (GRADUATION_SOL - START_SOL)) * 100
-                metrics["bonding_pct"] = max(0.0, min(bonding_pct, 99.0))
-                logger.debug(f"Bonding progress from liquidity: ${liq:.0f} = {sol_reserves_est:.2f} SOL = {bonding_pct:.1f}%")
-            elif mcap > 4500:  # More than ~$4,500 market cap
-                # V6.1: Estimate bonding progress from market cap
-                # Pump.fun bonding curve uses a constant product formula:
-                # price = k * SOL_reserves / token_reserves
-                # 
-                # The bonding curve progresses from ~$4,500 (0%) to ~$69,000 (100%)
-                # But this is NOT linear - the price increases exponentially
-                #
-                # For a more accurate estimate, we use the DexScreener approach:
-                # Progress ≈ (MCAP - START_MCAP) / (GRAD_MCAP - START_MCAP)
-                # Where START_MCAP ≈ $4,500 and GRAD_MCAP ≈ $69,000
-                #
-                # However, the progress shown by DexScreener is based on SOL reserves
-                # not market cap. The relationship is:
-                # bonding_pct = (SOL_reserves - 30) / 55 * 100
-                #
-                # Market cap scales with SOL reserves, but not linearly.
-                # Empirical observation: for tokens around $10K-20K MCAP,
-                # progress is roughly 50-80%
-                #
-                # Let's use a conservative linear approximation:
-                START_MCAP = 4500.0
-                GRADUATION_MCAP = 69000.0
-                
-                # Linear interpolation from market cap
-                bonding_pct = ((mcap - START_MCAP) / (GRADUATION_MCAP - START_MCAP)) * 100
-                metrics["bonding_pct"] = max(0.0, min(bonding_pct, 99.0))
-                logger.debug(f"Bonding progress from MCAP ${mcap:.0f}: {bonding_pct:.1f}%")
-            else:
-                # Token is very early, show 0% or minimal progress
-                metrics["bonding_pct"] = 0.0
-                 
-        logger.debug(f"Bonding data for {token_address[:8]}: holders={metrics.get('holders')}, complete={metrics.get('bonding_is_complete')}, pct={metrics.get('bonding_pct', 0):.1f}%")
+    if is_pump:
+        await _enrich_pump_metrics(session, token_address, metrics)
 
     # ── V5.2: Virtual Liquidity for ALL tokens with 0 liquidity ──
     # Final catch-all: ensure NO token has 0 liquidity if it has a valid price
@@ -421,7 +634,8 @@ async def fetch_token_metrics(session: aiohttp.ClientSession,
             virtual_liq = min(mcap * 0.15, 1500.0)
             metrics["liquidity"] = virtual_liq
             metrics["liquidity_is_virtual"] = True
-            logger.debug(f"Applied VIRTUAL liquidity for {token_address[:8]}: ${virtual_liq:,.0f} (mcap-based)")
+            if _DEBUG:
+                logger.debug(f"Applied VIRTUAL liquidity for {short8}: ${virtual_liq:,.0f} (mcap-based)")
         else:
             # Estimate mcap from price (1B supply assumption) and apply base liquidity
             mcap = price * 1_000_000_000
@@ -429,7 +643,8 @@ async def fetch_token_metrics(session: aiohttp.ClientSession,
             virtual_liq = max(100, min(mcap * 0.15, 500.0))
             metrics["liquidity"] = virtual_liq
             metrics["liquidity_is_virtual"] = True
-            logger.debug(f"Applied BASE VIRTUAL liquidity for {token_address[:8]}: ${virtual_liq:,.0f} (price-based)")
+            if _DEBUG:
+                logger.debug(f"Applied BASE VIRTUAL liquidity for {short8}: ${virtual_liq:,.0f} (price-based)")
 
     # Integrate Helius metrics if available ONLY FOR VIABLE TOKENS
     # (to save the 1,000,000 requests/month limit)
@@ -437,7 +652,8 @@ async def fetch_token_metrics(session: aiohttp.ClientSession,
     from early_detector.config import FAST_MODE
     h_metrics = {}
     if not FAST_MODE and metrics.get("price", 0) > 0 and metrics.get("liquidity", 0) > 200:
-        h_metrics = await fetch_helius_metrics(session, token_address)
+        h_metrics = await fetch_helius_metrics(session, token_address,
+                                               fetch_creator=not metrics.get("creator_address"))
         if h_metrics:
             if "top10_ratio" in h_metrics:
                 metrics["top10_ratio"] = h_metrics["top10_ratio"]
@@ -446,29 +662,37 @@ async def fetch_token_metrics(session: aiohttp.ClientSession,
             if "buyers_data" in h_metrics:
                 metrics["buyers_data"] = h_metrics["buyers_data"]
 
-    # Initialize missing fields that were previously provided by Helius/Birdeye
-    # to avoid crashes in feature calculation
-    for field in ["holders", "top10_ratio", "mint_authority", "freeze_authority", 
-                  "creator_risk_score", "unique_buyers_50tx", "insider_psi", "has_twitter"]:
-        if field not in metrics:
-            metrics[field] = None if field in ["mint_authority", "freeze_authority"] else 0.0
+    metrics = {**_DEFAULTS, **metrics}
 
     # V5.1: Filter out dead tokens (price=0 AND liquidity=0) - they waste processing time
     # V6.1: BUT allow pump tokens through - they may be too new for DexScreener
     if metrics.get("price", 0) == 0 and metrics.get("liquidity", 0) == 0:
         # For pump tokens, apply virtual values instead of skipping
-        if token_address.endswith("pump"):
-            logger.debug(f"New pump token {token_address[:8]}: applying virtual values")
+        if is_pump:
+            if _DEBUG:
+                logger.debug(f"New pump token {short8}: applying virtual values")
             metrics["price"] = 0.000001  # Minimal price
             metrics["liquidity"] = 500   # Minimal virtual liquidity
             metrics["liquidity_is_virtual"] = True
             metrics["marketcap"] = 1000  # Minimal mcap
         else:
-            logger.debug(f"Skipping dead token {token_address[:8]}: price=0, liquidity=0")
+            if _DEBUG:
+                logger.debug(f"Skipping dead token {short8}: price=0, liquidity=0")
             return None
 
+    # Persist metadata once we have something better than the placeholders
+    # (only when it differs from the cached row, so steady-state scans don't write)
+    name = metrics.get("name")
+    creator = metrics.get("creator_address")
+    if (name and name != default_name) or creator:
+        meta = {"name": name, "symbol": metrics.get("symbol"),
+                "creator": creator, "has_twitter": bool(metrics.get("has_twitter"))}
+        if meta != cached_meta:
+            await metadata_store.aset(token_address, **meta)
+
     # Add logging to debug the metrics being returned
-    logger.debug(f"fetch_token_metrics for {token_address[:8]}: name={metrics.get('name')}, symbol={metrics.get('symbol')}, price={metrics.get('price')}, liquidity={metrics.get('liquidity')}")
+    if _DEBUG:
+        logger.debug(f"fetch_token_metrics for {short8}: name={metrics.get('name')}, symbol={metrics.get('symbol')}, price={metrics.get('price')}, liquidity={metrics.get('liquidity')}")
 
     return metrics
 
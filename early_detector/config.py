@@ -10,12 +10,24 @@ load_dotenv()
 # ── Database ──────────────────────────────────────────────────────────────────
 SUPABASE_DB_URL: str = os.getenv("SUPABASE_DB_URL", "")
 DATA_DIR: str = os.getenv("DATA_DIR", ".")
+# Per process (bot + dashboard). The bot alone runs ~14 concurrent DB users
+# (4 processors x 2 tokens + stream/discovery/background jobs), so 20 avoids acquire queueing
+DB_POOL_MIN_SIZE: int = int(os.getenv("DB_POOL_MIN_SIZE", "4"))
+DB_POOL_MAX_SIZE: int = int(os.getenv("DB_POOL_MAX_SIZE", "20"))
+# asyncpg per-connection prepared statement LRU. Transaction-mode poolers
+# (Supabase pooler on :6543) can't keep prepared statements, so default to off there.
+DB_STATEMENT_CACHE_SIZE: int = int(os.getenv(
+    "DB_STATEMENT_CACHE_SIZE", "0" if ":6543" in SUPABASE_DB_URL else "1024"
+))
 
 # ── API Keys ──────────────────────────────────────────────────────────────────
 DEXSCREENER_API_URL: str = os.getenv(
     "DEXSCREENER_API_URL", "https://api.dexscreener.com/latest"
 )
 PUMPPORTAL_API_KEY: str = os.getenv("PUMPPORTAL_API_KEY", "")
+DEXSCREENER_RPS: float = float(os.getenv("DEXSCREENER_RPS", "5"))  # /dex/tokens allows 300 req/min
+# Share of that quota the background creator scan may use (it also draws from DEXSCREENER_RPS)
+DEXSCREENER_BACKGROUND_RPS: float = float(os.getenv("DEXSCREENER_BACKGROUND_RPS", "1"))
 
 # AI APIs
 GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
@@ -72,7 +84,7 @@ MAX_KELLY_MICROCAP: float = 0.10  # Max 10% Kelly size for tokens < $50k MCap
 # ── Logging ───────────────────────────────────────────────────────────────────
 LOG_FILE: str = "logs/runtime.log"
 LOG_ROTATION: str = "10 MB"
-LOG_LEVEL: str = "INFO"
+LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
 
 # ── Trading (V5.0) ───────────────────────────────────────────────────────────
 WALLET_PRIVATE_KEY: str = os.getenv("WALLET_PRIVATE_KEY", "")
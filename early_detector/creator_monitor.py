@@ -4,17 +4,110 @@ Creator Monitor — Periodic background worker to evaluate creator history (Rug
 
 import asyncio
 import aiohttp
+import numpy as np
 from loguru import logger
-from early_detector.db import get_creators_to_analyze, get_creator_tokens, upsert_creator_stats
-from early_detector.collector import fetch_dexscreener_pair
+from early_detector.db import (
+    get_creators_to_analyze, get_tokens_for_creators, upsert_creator_stats_bulk, new_tokens_event,
+)
+from early_detector.collector import fetch_dexscreener_pairs_batch, DEXSCREENER_BATCH_SIZE
 
 # Esegue l'analisi ogni 6 ore (in secondi)
 CHECK_INTERVAL_SECONDS = 21600
+# Attesa massima prima della prima scansione (termina prima se arriva un nuovo token)
+STARTUP_IDLE_SECONDS = 60
+# Numero massimo di richieste DexScreener in volo durante la scansione creator
+CREATOR_CONCURRENCY = 8
+# Token già segnati come rug nel DB e più vecchi di così non vengono ricontrollati su DexScreener
+KNOWN_RUG_MIN_AGE_HOURS = 24
+
+def _is_known_rug(tk: dict) -> bool:
+    """Rug già noto (flag is_likely_rug dell'ultima metrica) e vecchio: contato senza API."""
+    return bool(tk.get("is_likely_rug")) and float(tk.get("hours_since_creation", 0) or 0) > KNOWN_RUG_MIN_AGE_HOURS
+
+
+async def _fetch_pairs(session: aiohttp.ClientSession, addresses: list[str]) -> dict[str, dict]:
+    """Metriche DexScreener per i token di TUTTI i creatori della scansione:
+    blocchi condivisi da 30 indirizzi, al massimo CREATOR_CONCURRENCY richieste in volo
+    (corsia a bassa priorità del token bucket nel collector: non rallenta il percorso caldo)."""
+    unique = list(dict.fromkeys(addresses))
+    sem = asyncio.Semaphore(CREATOR_CONCURRENCY)
+
+    async def _one(chunk: list[str]) -> dict[str, dict]:
+        async with sem:
+            return await fetch_dexscreener_pairs_batch(session, chunk, background=True)
+
+    results = await asyncio.gather(
+        *(_one(unique[i:i + DEXSCREENER_BATCH_SIZE]) for i in range(0, len(unique), DEXSCREENER_BATCH_SIZE)),
+        return_exceptions=True,
+    )
+    pairs: dict[str, dict] = {}
+    for res in results:
+        if isinstance(res, Exception):
+            logger.error(f"Errore DexScreener nella scansione creator: {res}")
+        else:
+            pairs.update(res)
+    return pairs
+
+
+def _creator_stats(creator: str, tokens: list[dict],
+                   pairs: dict[str, dict]) -> tuple[str, float, float] | None:
+    """Calcola rug_ratio e avg_lifespan di un singolo creatore (None se nessun token valutabile)."""
+    # Una riga (liquidità, mcap, prezzo, ore di vita) per ogni token valutabile
+    rows: list[tuple[float, float, float, float]] = []
+    for tk in tokens:
+        if _is_known_rug(tk):
+            rows.append((0.0, 0.0, 0.0, 0.0))
+            continue
+        # Metriche attuali su DexScreener (token non listati: non valutabili)
+        metrics = pairs.get(tk["address"])
+        if metrics:
+            rows.append((
+                metrics.get("liquidity") or 0,
+                metrics.get("marketcap") or 0,
+                metrics.get("price") or 0,
+                float(tk.get("hours_since_creation", 0) or 0),
+            ))
+
+    # Calcola le metriche finali per questo creatore
+    total_evaluated = len(rows)
+    if total_evaluated > 0:
+        liq, mc, px, hours = np.asarray(rows, dtype=np.float64).T
+
+        # Definiamo "Rug Pull":
+        # 1. Liquidità < $1000
+        # 2. Market Cap crollato < $5000 o prezzo nullo
+        rugged = (liq < 1000) | (mc < 5000) | (px == 0)
+        # Se è "rugged", ha avuto vita breve (consideriamo 0 per abbassare la media severamente)
+        lifespans = np.where(rugged, 0.0, hours)
+
+        rug_ratio = round(float(rugged.mean()), 2)
+        avg_lifespan = round(float(lifespans.mean()), 2)
+
+        if rug_ratio > 0.6:
+            logger.debug(f"🚨 Sviluppatore {creator[:6]} individuato come alto rischio! Rug: {rug_ratio*100}%, V. media: {avg_lifespan}h")
+        elif rug_ratio == 0.0 and total_evaluated >= 2:
+            logger.info(f"💎 Sviluppatore {creator[:6]} solido! {total_evaluated} token vivi.")
+
+        return creator, rug_ratio, avg_lifespan
+    return None
+
+
+async def _wait_first_token() -> None:
+    """Prima scansione: parte al primo nuovo token o dopo STARTUP_IDLE_SECONDS.
+    L'evento serve solo qui: Pump.fun crea token di continuo, quindi i cicli
+    successivi restano a intervallo fisso."""
+    try:
+        await asyncio.wait_for(new_tokens_event.wait(), timeout=STARTUP_IDLE_SECONDS)
+    except asyncio.TimeoutError:
+        pass
+    finally:
+        new_tokens_event.clear()
+
 
 async def creator_performance_job(session: aiohttp.ClientSession) -> None:
     """Worker periodico per calcolare rug_ratio e avg_lifespan dei creatori."""
-    # Attende un po' di tempo prima del primo avvio per dare priorità ad altri task all'avvio
-    await asyncio.sleep(60)
+    # Lascia partire prima gli altri task, senza attendere più del necessario
+    await _wait_first_token()
     
     while True:
         try:
@@ -27,66 +120,31 @@ async def creator_performance_job(session: aiohttp.ClientSession) -> None:
                 # Nessun creatore da analizzare, attende il prossimo ciclo
                 await asyncio.sleep(CHECK_INTERVAL_SECONDS)
                 continue
-                
+
+            # Una sola query per i token di tutti i creatori (niente N+1)
+            tokens_by_creator = await get_tokens_for_creators(creators)
+
+            # Token da verificare di tutti i creatori insieme: i blocchi da 30 vengono
+            # riempiti anche se ogni creatore ha solo 1-3 token
+            pairs = await _fetch_pairs(session, [
+                tk["address"]
+                for creator in creators for tk in tokens_by_creator.get(creator, [])
+                if not _is_known_rug(tk)
+            ])
+
+            stats_rows = []
             for creator in creators:
-                tokens = await get_creator_tokens(creator)
-                
-                if not tokens:
+                try:
+                    res = _creator_stats(creator, tokens_by_creator.get(creator, []), pairs)
+                except Exception as e:
+                    logger.error(f"Errore nella valutazione del creatore {creator[:6]}: {e}")
                     continue
-                
-                rugged_count = 0
-                total_evaluated = 0
-                lifespans = []
-                
-                for tk in tokens:
-                    address = tk["address"]
-                    hours_since_creation = float(tk.get("hours_since_creation", 0) or 0)
-                    
-                    # Verifica le metriche attuali su DexScreener
-                    metrics = await fetch_dexscreener_pair(session, address)
-                    
-                    if metrics:
-                        liquidity = metrics.get("liquidity") or 0
-                        marketcap = metrics.get("marketcap") or 0
-                        price = metrics.get("price") or 0
-                        
-                        # Definiamo "Rug Pull":
-                        # 1. Liquidità < $1000
-                        # 2. Market Cap crollato < $5000 o prezzo nullo
-                        is_rugged = (liquidity < 1000 or marketcap < 5000 or price == 0)
-                        
-                        if is_rugged:
-                            rugged_count += 1
-                            # Se è "rugged", ha avuto vita breve (consideriamo 0 per abbassare la media severamente)
-                            lifespans.append(0.0)
-                        else:
-                            # Token ancora vivo (e sano)
-                            lifespans.append(hours_since_creation)
-                        
-                        total_evaluated += 1
-                        
-                        # Piccola pausa per non intasare l'API di DexScreener o farci bannare
-                        await asyncio.sleep(0.5)
-                
-                # Calcola le metriche finali per questo creatore
-                if total_evaluated > 0:
-                    rug_ratio = round(rugged_count / total_evaluated, 2)
-                    avg_lifespan = 0.0
-                    if lifespans:
-                        avg_lifespan = round(sum(lifespans) / len(lifespans), 2)
-                    
-                    # Aggiorna il DB solo sostituendo rug_ratio e avg_lifespan
-                    # Passiamo "total_tokens": 0 per non incrementare falsamente il conteggio dei token pre-esistenti
-                    await upsert_creator_stats(creator, {
-                        "rug_ratio": rug_ratio,
-                        "avg_lifespan": avg_lifespan,
-                        "total_tokens": 0 
-                    })
-                    
-                    if rug_ratio > 0.6:
-                        logger.debug(f"🚨 Sviluppatore {creator[:6]} individuato come alto rischio! Rug: {rug_ratio*100}%, V. media: {avg_lifespan}h")
-                    elif rug_ratio == 0.0 and total_evaluated >= 2:
-                        logger.info(f"💎 Sviluppatore {creator[:6]} solido! {total_evaluated} token vivi.")
+                if res is not None:
+                    stats_rows.append(res)
+
+            # Aggiorna il DB in un'unica scrittura, sostituendo solo rug_ratio e avg_lifespan
+            # (total_tokens non viene toccato per non falsare il conteggio dei token pre-esistenti)
+            await upsert_creator_stats_bulk(stats_rows)
             
             logger.info("✅ Scansione creator conclusa. Pausa fino al prossimo ciclo...")
         
@@ -6,148 +6,174 @@ Opens at:  http://localhost:8050
 """
 
 import asyncio
-import subprocess
+import hashlib
 import sys
+import time
 from pathlib import Path
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 from contextlib import asynccontextmanager
 from typing import Any
 
 from fastapi import FastAPI, BackgroundTasks, Body, Request
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
+import orjson
 from fastapi.staticfiles import StaticFiles
+import aiohttp
+import numpy as np
 import uvicorn
 from loguru import logger
 
 from early_detector.config import DASHBOARD_PORT, TRADE_AMOUNT_SOL, DEFAULT_TP_PCT, DEFAULT_SL_PCT, SLIPPAGE_BPS
-from early_detector.db import get_pool, close_pool, insert_trade, get_open_trades, close_trade, get_trade_history, get_positions_with_roi
+from early_detector.db import get_pool, close_pool, pool_stats, insert_trade, get_open_trades, close_trade, get_trade_history, get_positions_with_roi
 from early_detector.analyst import analyze_token_signal
 from early_detector.narrative import NarrativeManager
 from early_detector.cache import cache
 from early_detector.trader import execute_buy, execute_sell, get_sol_balance, get_wallet_address
 
 
+DASHBOARD_HTML = Path(__file__).parent / "static" / "dashboard.html"
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Setup logging to file if not already done by main.py (it's a separate process)
     from early_detector.config import LOG_FILE, LOG_ROTATION, LOG_LEVEL
-    logger.add(LOG_FILE, rotation=LOG_ROTATION, level=LOG_LEVEL,
+    # enqueue=True: sinks are written by loguru's worker thread, log calls never block the loop
+    logger.remove()
+    logger.add(sys.stderr, enqueue=True)
+    logger.add(LOG_FILE, rotation=LOG_ROTATION, level=LOG_LEVEL, enqueue=True,
                format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}")
     
-    await get_pool()
+    # Bound once here; handlers read app.state.pool instead of awaiting get_pool()
+    app.state.pool = await get_pool()
+    # One outbound HTTP pool for the process: keep-alive to Jupiter/Helius/CoinGecko
+    app.state.http = aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300),
+        timeout=aiohttp.ClientTimeout(total=30),
+    )
+    # Read once: the page is static for the lifetime of the process
+    app.state.index_html = DASHBOARD_HTML.read_bytes()
+    app.state.index_etag = _etag(app.state.index_html)
     logger.info("=" * 60)
     logger.info("🚀 Solana Early Detector DASHBOARD V4.0.3 (Alpha Engine)")
     logger.info(f"   Listening at http://localhost:{DASHBOARD_PORT}")
     logger.info("=" * 60)
     yield
+    await app.state.http.close()
     await close_pool()
+    await logger.complete()
+
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+
+class ORJSONResponse(JSONResponse):
+    """orjson-backed JSON: datetimes (naive ones as UTC) and numpy values serialize natively."""
 
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, option=ORJSON_OPTIONS)
 
-app = FastAPI(title="Solana Early Detector Dashboard", lifespan=lifespan)
+
+# orjson serializes floats and datetimes natively (no .isoformat() per row)
+app = FastAPI(title="Solana Early Detector Dashboard", lifespan=lifespan,
+              default_response_class=ORJSONResponse)
 
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
     """Log every request for 100% visibility."""
-    start_time = datetime.now()
+    start_time = time.perf_counter()
     response = await call_next(request)
-    duration = (datetime.now() - start_time).total_seconds()
+    duration = time.perf_counter() - start_time
     
     # Quick indicator for POST hits (Webhooks)
-    status_icon = "✅" if response.status_code == 200 else "⚠️"
-    logger.info(f"{status_icon} REQ: {request.method} {request.url.path} -> {response.status_code} ({duration:.3f}s)")
+    status_icon = "✅" if response.status_code in (200, 304) else "⚠️"
+    # Positional args: loguru only formats the line if INFO is enabled
+    logger.info("{} REQ: {} {} -> {} ({:.3f}s)", status_icon, request.method,
+                request.url.path, response.status_code, duration)
     return response
 
+# Short TTL for polled read endpoints: every viewer refresh within the window is
+# served from memory instead of hitting the DB again.
+API_CACHE_TTL = 5
+
+
+def _etag(body: bytes) -> str:
+    return f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+
+
+async def _cached_json(request: Request, key: str, compute) -> Response:
+    """Serve `compute()` from the API cache as pre-serialized JSON bytes.
+    Skips FastAPI's jsonable_encoder pass and re-serialization on every hit;
+    unchanged payloads are answered with 304 via ETag / If-None-Match."""
+    async def render() -> tuple[bytes, str]:
+        body = orjson.dumps(await compute(), option=ORJSON_OPTIONS)
+        return body, _etag(body)
+
+    body, etag = await cache.get_or_compute(key, render, ttl_seconds=API_CACHE_TTL)
+    headers = {"ETag": etag, "Cache-Control": f"max-age={API_CACHE_TTL}"}
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
 @app.get("/api/overview")
-async def api_overview():
+async def api_overview(request: Request):
     """Return overview stats: total tokens, wallets, signals, latest metrics."""
-    pool = await get_pool()
+    return await _cached_json(request, "api:overview", _overview)
 
-    tokens_count = await pool.fetchval("SELECT COUNT(*) FROM tokens")
-    wallets_count = await pool.fetchval("SELECT COUNT(*) FROM wallet_performance WHERE total_trades > 0")
-    signals_count = await pool.fetchval("SELECT COUNT(*) FROM signals")
-    from early_detector.config import SW_MIN_ROI, SW_MIN_TRADES, SW_MIN_WIN_RATE
-    smart_count = await pool.fetchval(
-        "SELECT COUNT(*) FROM wallet_performance "
-        "WHERE (avg_roi > $1 AND total_trades >= $2 AND win_rate > $3) "
-        "OR (avg_roi > 10.0 AND total_trades >= 3)",
-        SW_MIN_ROI, SW_MIN_TRADES, SW_MIN_WIN_RATE
-    )
 
-    # Latest metrics timestamp (proxy for last cycle)
-    last_cycle = await pool.fetchval(
-        "SELECT MAX(timestamp) FROM token_metrics_timeseries"
-    )
+async def _overview() -> dict:
+    pool = app.state.pool
 
-    # Wallet cluster breakdown
-    clusters = await pool.fetch(
-        "SELECT cluster_label, COUNT(*) as cnt FROM wallet_performance GROUP BY cluster_label"
+    from early_detector.config import SW_MIN_ROI, SW_MIN_TRADES, SW_MIN_WIN_RATE
+    # All counters and the cluster breakdown in a single round trip
+    # (MAX(timestamp) of the latest metrics is the proxy for the last cycle)
+    counts = await pool.fetchrow(
+        """
+        SELECT
+            (SELECT COUNT(*) FROM tokens) AS tokens_count,
+            (SELECT COUNT(*) FROM wallet_performance WHERE total_trades > 0) AS wallets_count,
+            (SELECT COUNT(*) FROM signals) AS signals_count,
+            (SELECT COUNT(*) FROM wallet_performance
+              WHERE (avg_roi > $1 AND total_trades >= $2 AND win_rate > $3)
+                 OR (avg_roi > 10.0 AND total_trades >= 3)) AS smart_count,
+            (SELECT MAX(timestamp) FROM token_metrics_timeseries) AS last_cycle,
+            -- Wallet cluster breakdown (NULL label keyed as "null", as before)
+            (SELECT json_object_agg(COALESCE(cluster_label, 'null'), cnt)
+               FROM (SELECT cluster_label, COUNT(*) AS cnt
+                       FROM wallet_performance GROUP BY cluster_label) c) AS clusters
+        """,
+        SW_MIN_ROI, SW_MIN_TRADES, SW_MIN_WIN_RATE
     )
 
     return {
-        "tokens_tracked": tokens_count or 0,
-        "wallets_profiled": wallets_count or 0,
-        "smart_wallets": smart_count or 0,
-        "total_signals": signals_count or 0,
-        "last_cycle": last_cycle.isoformat() if last_cycle else None,
-        "clusters": {r["cluster_label"]: r["cnt"] for r in clusters},
+        "tokens_tracked": counts["tokens_count"] or 0,
+        "wallets_profiled": counts["wallets_count"] or 0,
+        "smart_wallets": counts["smart_count"] or 0,
+        "total_signals": counts["signals_count"] or 0,
+        "last_cycle": counts["last_cycle"],
+        "clusters": orjson.loads(counts["clusters"]) if counts["clusters"] else {},
     }
 
 
-@app.get("/api/signals")
-async def api_signals(limit: int = 50):
-    """Return recent signals with token info."""
-    pool = await get_pool()
-    rows = await pool.fetch(
-        """
-        WITH latest_metrics AS (
-            SELECT DISTINCT ON (token_id) *
-            FROM token_metrics_timeseries
-            ORDER BY token_id, timestamp DESC
-        )
-        SELECT s.id, s.timestamp, s.instability_index, s.entry_price,
-               s.kelly_size, s.confidence,
-               s.insider_psi, s.creator_risk, s.degen_score, s.ai_summary, s.ai_analysis,
-               t.address, t.name, t.symbol,
-               m.marketcap as live_marketcap,
-               m.liquidity as live_liquidity,
-               m.top10_ratio as live_top10_ratio,
-               m.price as live_price
-        FROM signals s
-        JOIN tokens t ON t.id = s.token_id
-        LEFT JOIN latest_metrics m ON m.token_id = s.token_id
-        WHERE (
-            (COALESCE(m.marketcap, s.marketcap) >= 5000 AND COALESCE(m.liquidity, s.liquidity) >= 500)
-            OR s.ai_summary LIKE '%SNIPER%'
-          )
-          AND s.confidence >= 0.20
-        ORDER BY s.timestamp DESC
-        LIMIT $1
-        """,
-        limit,
-    )
+def _finite(vals) -> list[list[float]]:
+    """rows × fields floats with NULL/NaN/±inf mapped to 0, in one vectorized pass."""
+    if len(vals) == 0:
+        return []
+    return np.nan_to_num(np.asarray(vals, dtype=np.float64),
+                         nan=0.0, posinf=0.0, neginf=0.0).tolist()
+
 
-    import math
+def _signal_dicts(rows) -> list[dict]:
+    import json
+    nums = _finite([
+        (r["instability_index"], r["live_price"] or r["entry_price"], r["live_liquidity"],
+         r["live_marketcap"], r["confidence"], r["kelly_size"], r["insider_psi"],
+         r["creator_risk"], r["live_top10_ratio"])
+        for r in rows
+    ])
     signals = []
-    for r in rows:
-        ii = float(r["instability_index"] or 0)
-        price = float(r["live_price"] or r["entry_price"] or 0)
-        liq = float(r["live_liquidity"] or 0)
-        mcap = float(r["live_marketcap"] or 0)
-        conf = float(r["confidence"] or 0)
-        kelly = float(r["kelly_size"] or 0)
-        psi = float(r["insider_psi"] or 0)
-        risk = float(r["creator_risk"] or 0)
-
-        if not math.isfinite(ii): ii = 0
-        if not math.isfinite(price): price = 0
-        if not math.isfinite(liq): liq = 0
-        if not math.isfinite(mcap): mcap = 0
-        if not math.isfinite(conf): conf = 0
-        if not math.isfinite(kelly): kelly = 0
-        if not math.isfinite(psi): psi = 0
-        if not math.isfinite(risk): risk = 0
-
-        import json
+    for r, (ii, price, liq, mcap, conf, kelly, psi, risk, top10) in zip(rows, nums):
         ai_analysis = r["ai_analysis"]
         if isinstance(ai_analysis, str):
             try:
@@ -157,7 +183,7 @@ async def api_signals(limit: int = 50):
 
         signals.append({
             "id": r["id"],
-            "timestamp": r["timestamp"].isoformat() if r["timestamp"] else None,
+            "timestamp": r["timestamp"],
             "instability_index": ii,
             "entry_price": price,
             "liquidity": liq,
@@ -166,7 +192,7 @@ async def api_signals(limit: int = 50):
             "kelly_size": kelly,
             "insider_psi": psi,
             "creator_risk": risk,
-            "top10_ratio": float(r["live_top10_ratio"] or 0),
+            "top10_ratio": top10,
             "degen_score": r["degen_score"],
             "ai_summary": r["ai_summary"],
             "ai_analysis": ai_analysis,
@@ -175,169 +201,186 @@ async def api_signals(limit: int = 50):
             "token_symbol": r["symbol"] or "???",
             "buy_url": f"https://pump.fun/{r['address']}",
         })
+    return signals
 
-    return {"signals": signals}
+
+@app.get("/api/signals")
+async def api_signals(limit: int = 50):
+    """Return recent signals with token info."""
+    pool = app.state.pool
+    rows = await pool.fetch(
+        """
+        SELECT s.id, s.timestamp,
+               s.instability_index, s.entry_price,
+               s.kelly_size, s.confidence,
+               s.insider_psi, s.creator_risk, s.degen_score, s.ai_summary, s.ai_analysis,
+               t.address, t.name, t.symbol,
+               m.marketcap AS live_marketcap,
+               m.liquidity AS live_liquidity,
+               m.top10_ratio AS live_top10_ratio,
+               m.price AS live_price
+        FROM signals s
+        JOIN tokens t ON t.id = s.token_id
+        -- Latest metrics row per signal via idx_token_time instead of deduping the whole table
+        LEFT JOIN LATERAL (
+            SELECT marketcap, liquidity, top10_ratio, price
+            FROM token_metrics_timeseries
+            WHERE token_id = s.token_id
+            ORDER BY timestamp DESC
+            LIMIT 1
+        ) m ON TRUE
+        WHERE (
+            (COALESCE(m.marketcap, s.marketcap) >= 5000 AND COALESCE(m.liquidity, s.liquidity) >= 500)
+            OR s.ai_summary LIKE '%SNIPER%'
+          )
+          AND s.confidence >= 0.20
+        ORDER BY s.timestamp DESC
+        LIMIT $1
+        """,
+        limit,
+    )
+
+    return {"signals": _signal_dicts(rows)}
 
 
 @app.get("/api/signals/recent")
 async def api_signals_recent(minutes: int = 10):
     """Return signals generated in the last N minutes."""
-    pool = await get_pool()
+    pool = app.state.pool
     rows = await pool.fetch(
         """
-        WITH latest_metrics AS (
-            SELECT DISTINCT ON (token_id) *
-            FROM token_metrics_timeseries
-            ORDER BY token_id, timestamp DESC
-        )
-        SELECT s.id, s.timestamp, s.instability_index, s.entry_price,
+        SELECT s.id, s.timestamp,
+               s.instability_index, s.entry_price,
                s.kelly_size, s.confidence,
                s.insider_psi, s.creator_risk, s.degen_score, s.ai_summary, s.ai_analysis,
                t.address, t.name, t.symbol,
-               m.marketcap as live_marketcap,
-               m.liquidity as live_liquidity,
-               m.top10_ratio as live_top10_ratio,
-               m.price as live_price
+               m.marketcap AS live_marketcap,
+               m.liquidity AS live_liquidity,
+               m.top10_ratio AS live_top10_ratio,
+               m.price AS live_price
         FROM signals s
         JOIN tokens t ON t.id = s.token_id
-        LEFT JOIN latest_metrics m ON m.token_id = s.token_id
+        -- Latest metrics row per signal via idx_token_time instead of deduping the whole table
+        LEFT JOIN LATERAL (
+            SELECT marketcap, liquidity, top10_ratio, price
+            FROM token_metrics_timeseries
+            WHERE token_id = s.token_id
+            ORDER BY timestamp DESC
+            LIMIT 1
+        ) m ON TRUE
         WHERE (
-            s.timestamp > NOW() - ($1 || ' minutes')::INTERVAL
+            s.timestamp > NOW() - make_interval(mins => $1)
             OR s.ai_summary LIKE '%SNIPER%'
           )
         ORDER BY s.timestamp DESC
         """,
-        str(minutes),
+        minutes,
     )
 
-    import math
-    signals = []
-    for r in rows:
-        ii = float(r["instability_index"] or 0)
-        price = float(r["live_price"] or r["entry_price"] or 0)
-        liq = float(r["live_liquidity"] or 0)
-        mcap = float(r["live_marketcap"] or 0)
-        conf = float(r["confidence"] or 0)
-        kelly = float(r["kelly_size"] or 0)
-        psi = float(r["insider_psi"] or 0)
-        risk = float(r["creator_risk"] or 0)
-
-        if not math.isfinite(ii): ii = 0
-        if not math.isfinite(price): price = 0
-        if not math.isfinite(liq): liq = 0
-        if not math.isfinite(mcap): mcap = 0
-        if not math.isfinite(conf): conf = 0
-        if not math.isfinite(kelly): kelly = 0
-        if not math.isfinite(psi): psi = 0
-        if not math.isfinite(risk): risk = 0
-
-        import json
-        ai_analysis = r["ai_analysis"]
-        if isinstance(ai_analysis, str):
-            try:
-                ai_analysis = json.loads(ai_analysis)
-            except:
-                pass
-
-        signals.append({
-            "id": r["id"],
-            "timestamp": r["timestamp"].isoformat() if r["timestamp"] else None,
-            "instability_index": ii,
-            "entry_price": price,
-            "liquidity": liq,
-            "marketcap": mcap,
-            "confidence": conf,
-            "kelly_size": kelly,
-            "insider_psi": psi,
-            "creator_risk": risk,
-            "top10_ratio": float(r["live_top10_ratio"] or 0),
-            "degen_score": r["degen_score"],
-            "ai_summary": r["ai_summary"],
-            "ai_analysis": ai_analysis,
-            "token_address": r["address"],
-            "token_name": r["name"] or "Unknown",
-            "token_symbol": r["symbol"] or "???",
-            "buy_url": f"https://pump.fun/{r['address']}",
-        })
-
-    return {"signals": signals}
+    return {"signals": _signal_dicts(rows)}
 
 
 @app.get("/api/tokens")
-async def api_tokens(limit: int = 50):
+async def api_tokens(request: Request, limit: int = 50):
     """Return recently tracked tokens with latest metrics (LEFT JOIN for webhook/new discovery)."""
-    pool = await get_pool()
-    rows = await pool.fetch(
+    return await _cached_json(request, f"api:tokens:{limit}", lambda: _tokens(limit))
+
+
+# Rows are pulled through a server-side cursor in chunks of this size, so a large
+# `limit` never holds the full Record list and the output list at the same time.
+CURSOR_PREFETCH = 64
+
+
+async def _cursor_batches(sql: str, *args):
+    """Yield rows of `sql` in lists of CURSOR_PREFETCH from a server-side cursor
+    (cursors need a transaction)."""
+    pool = app.state.pool
+    async with pool.acquire() as conn, conn.transaction():
+        cur = await conn.cursor(sql, *args)
+        while batch := await cur.fetch(CURSOR_PREFETCH):
+            yield batch
+
+
+async def _cursor_rows(sql: str, *args):
+    """Yield rows of `sql` one at a time (see _cursor_batches)."""
+    async for batch in _cursor_batches(sql, *args):
+        for r in batch:
+            yield r
+
+
+async def _tokens(limit: int) -> dict:
+    batches = _cursor_batches(
         """
-        SELECT DISTINCT ON (t.address)
+        SELECT
             t.address, t.name, t.symbol, t.first_seen_at, t.narrative,
             m.price, m.marketcap, m.liquidity, m.holders,
             m.volume_5m, m.buys_5m, m.sells_5m, m.instability_index,
             m.timestamp as last_metric_at, m.insider_psi, m.creator_risk_score
         FROM tokens t
-        LEFT JOIN token_metrics_timeseries m ON m.token_id = t.id
-        ORDER BY t.address, m.timestamp DESC NULLS LAST
+        -- Latest metrics row per token via idx_token_time (token_id, timestamp DESC)
+        LEFT JOIN LATERAL (
+            SELECT price, marketcap, liquidity, holders,
+                   volume_5m, buys_5m, sells_5m, instability_index,
+                   timestamp, insider_psi, creator_risk_score
+            FROM token_metrics_timeseries
+            WHERE token_id = t.id
+            ORDER BY timestamp DESC
+            LIMIT 1
+        ) m ON TRUE
+        ORDER BY t.first_seen_at DESC NULLS LAST
         LIMIT $1
         """,
         limit,
     )
 
-    import math
     results = []
-    for r in rows:
-        price = float(r["price"] or 0)
-        mcap = float(r["marketcap"] or 0)
-        liq = float(r["liquidity"] or 0)
-        vol = float(r["volume_5m"] or 0)
-        ii = float(r["instability_index"] or 0)
-        psi = float(r["insider_psi"] or 0)
-        risk = float(r["creator_risk_score"] or 0)
-        
-        # Sanitize
-        if not math.isfinite(price): price = 0
-        if not math.isfinite(mcap): mcap = 0
-        if not math.isfinite(liq): liq = 0
-        if not math.isfinite(vol): vol = 0
-        if not math.isfinite(ii): ii = 0
-        if not math.isfinite(psi): psi = 0
-        if not math.isfinite(risk): risk = 0
-
-        # Fallback for name/symbol
-        name = r["name"]
-        symbol = r["symbol"]
-        if not symbol or symbol == "???":
-            symbol = r["address"][:4] + "..."
-        if not name or name == "Unknown":
-            name = symbol
-
-        results.append({
-            "address": r["address"],
-            "name": name,
-            "symbol": symbol,
-            "first_seen": r["first_seen_at"].isoformat() if r["first_seen_at"] else None,
-            "price": price,
-            "marketcap": mcap,
-            "liquidity": liq,
-            "holders": r["holders"],
-            "volume_5m": vol,
-            "buys_5m": r["buys_5m"] or 0,
-            "sells_5m": r["sells_5m"] or 0,
-            "instability_index": ii,
-            "insider_psi": psi,
-            "creator_risk": risk,
-            "narrative": r["narrative"] or "GENERIC",
-            "buy_url": f"https://pump.fun/{r['address']}",
-        })
-    
-    # Final sort: most recently seen first
-    results.sort(key=lambda x: x["first_seen"] or "", reverse=True)
+    async for batch in batches:
+        # One vectorized sanitize per cursor batch
+        nums = _finite([
+            (r["price"], r["marketcap"], r["liquidity"], r["volume_5m"],
+             r["instability_index"], r["insider_psi"], r["creator_risk_score"])
+            for r in batch
+        ])
+        for r, (price, mcap, liq, vol, ii, psi, risk) in zip(batch, nums):
+            # Fallback for name/symbol
+            name = r["name"]
+            symbol = r["symbol"]
+            if not symbol or symbol == "???":
+                symbol = r["address"][:4] + "..."
+            if not name or name == "Unknown":
+                name = symbol
+
+            results.append({
+                "address": r["address"],
+                "name": name,
+                "symbol": symbol,
+                "first_seen": r["first_seen_at"],
+                "price": price,
+                "marketcap": mcap,
+                "liquidity": liq,
+                "holders": r["holders"],
+                "volume_5m": vol,
+                "buys_5m": r["buys_5m"] or 0,
+                "sells_5m": r["sells_5m"] or 0,
+                "instability_index": ii,
+                "insider_psi": psi,
+                "creator_risk": risk,
+                "narrative": r["narrative"] or "GENERIC",
+                "buy_url": f"https://pump.fun/{r['address']}",
+            })
+
     return {"tokens": results}
 
 
+# AI verdicts are keyed on the metrics snapshot they were computed from
+ANALYSIS_CACHE_TTL = 600
+_analysis_inflight: dict[tuple[str, Any], asyncio.Task] = {}
+
+
 @app.get("/api/analyze/{address}")
 async def api_analyze_token(address: str):
     """Get AI analysis for a specific token."""
-    pool = await get_pool()
+    pool = app.state.pool
     
     # Get latest metrics (preferring those with instability_index)
     latest_row = await pool.fetchrow(
@@ -346,7 +389,8 @@ async def api_analyze_token(address: str):
                m.price, m.marketcap, m.liquidity, m.holders,
                m.volume_5m, m.buys_5m, m.sells_5m, m.instability_index,
                m.insider_psi, m.creator_risk_score,
-               m.mint_authority, m.freeze_authority, m.top10_ratio
+               m.mint_authority, m.freeze_authority, m.top10_ratio,
+               m.timestamp AS metrics_at
         FROM tokens t
         JOIN token_metrics_timeseries m ON m.token_id = t.id
         WHERE t.address = $1
@@ -356,40 +400,64 @@ async def api_analyze_token(address: str):
         address,
     )
     
-    # Enrich with latest signal data if available
-    signal_row = await pool.fetchrow(
-        "SELECT instability_index, degen_score, ai_analysis FROM signals WHERE token_id = $1 ORDER BY timestamp DESC LIMIT 1",
-        latest_row["id"] if latest_row else None
-    )
-    
     if not latest_row:
         return JSONResponse(status_code=404, content={"message": "Token not found"})
         
     token_data = dict(latest_row)
-    
+    key = (address, token_data.pop("metrics_at"))
+    cache_key = f"ai_analysis:{key[0]}:{key[1]}"
+
+    analysis = cache.get(cache_key)
+    if analysis:
+        logger.info(f"Returning cached AI analysis for {address}")
+        return analysis
+
+    # Concurrent requests for the same snapshot share one LLM call
+    task = _analysis_inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_analyze(address, token_data, cache_key))
+        _analysis_inflight[key] = task
+        task.add_done_callback(lambda _: _analysis_inflight.pop(key, None))
+    # shield: a client disconnect must not cancel the analysis other callers wait on
+    return await asyncio.shield(task)
+
+
+async def _refresh_pump_holders(address: str, token_data: dict) -> None:
     # V4.8: Enforce real-time holder count for Pump.fun tokens if missing in DB
     if address.endswith("pump") and (token_data.get("holders") or 0) < 5:
         try:
-             import aiohttp
              from early_detector.collector import fetch_pump_fun_metrics
-             async with aiohttp.ClientSession() as session:
-                 pump_meta = await fetch_pump_fun_metrics(session, address)
-                 if pump_meta and pump_meta.get("holders"):
-                     token_data["holders"] = pump_meta["holders"]
-                     logger.info(f"Dashboard: Refreshed holder count for {address[:8]} via Pump.fun API: {token_data['holders']}")
+             pump_meta = await fetch_pump_fun_metrics(app.state.http, address)
+             if pump_meta and pump_meta.get("holders"):
+                 token_data["holders"] = pump_meta["holders"]
+                 logger.info(f"Dashboard: Refreshed holder count for {address[:8]} via Pump.fun API: {token_data['holders']}")
         except Exception as e:
              logger.error(f"Dashboard: Failed to refresh pump holders: {e}")
 
-    # Get history for growth calculation
-    history_rows = await pool.fetch(
-        """
-        SELECT holders, price, timestamp
-        FROM token_metrics_timeseries
-        WHERE token_id = $1
-        ORDER BY timestamp DESC
-        LIMIT 10
-        """,
-        token_data["id"],
+
+async def _analyze(address: str, token_data: dict, cache_key: str) -> dict:
+    pool = app.state.pool
+
+    # Signal enrichment, growth history and the pump holder refresh are independent:
+    # run them concurrently
+    signal_row, history_rows, _ = await asyncio.gather(
+        # Enrich with latest signal data if available
+        pool.fetchrow(
+            "SELECT instability_index, degen_score, ai_analysis FROM signals WHERE token_id = $1 ORDER BY timestamp DESC LIMIT 1",
+            token_data["id"]
+        ),
+        # Get history for growth calculation
+        pool.fetch(
+            """
+            SELECT holders, price, timestamp
+            FROM token_metrics_timeseries
+            WHERE token_id = $1
+            ORDER BY timestamp DESC
+            LIMIT 10
+            """,
+            token_data["id"],
+        ),
+        _refresh_pump_holders(address, token_data),
     )
     
     history = [dict(r) for r in history_rows]
@@ -399,31 +467,24 @@ async def api_analyze_token(address: str):
         if not token_data.get("instability_index") or token_data["instability_index"] < (signal_row["instability_index"] or 0):
              token_data["instability_index"] = signal_row["instability_index"]
         token_data["signal_degen_score"] = signal_row["degen_score"]
-    
-    # Convert Decimals to float for the analyst
-    for k, v in token_data.items():
-        if hasattr(v, '__float__') and not isinstance(v, (int, float)):
-            token_data[k] = float(v)
-            
-    analysis = cache.get(f"ai_analysis_{address}")
-    if analysis:
-        logger.info(f"Returning cached AI analysis for {address}")
-        return analysis
 
     analysis = await analyze_token_signal(token_data, history)
     
     # Cache the result if it's not an error or a transient wait
     if analysis.get("verdict") not in ["ERROR", "WAIT"]:
-        cache.set(f"ai_analysis_{address}", analysis, ttl_seconds=300)
+        cache.set(cache_key, analysis, ttl_seconds=ANALYSIS_CACHE_TTL)
         
     return analysis
 
 
 @app.get("/api/wallets")
-async def api_wallets(limit: int = 100):
+async def api_wallets(request: Request, limit: int = 100):
     """Return wallet performance stats."""
-    pool = await get_pool()
-    rows = await pool.fetch(
+    return await _cached_json(request, f"api:wallets:{limit}", lambda: _wallets(limit))
+
+
+async def _wallets(limit: int) -> dict:
+    rows = _cursor_rows(
         """
         SELECT wallet, avg_roi, total_trades, win_rate, cluster_label, last_active
         FROM wallet_performance
@@ -434,14 +495,14 @@ async def api_wallets(limit: int = 100):
     )
 
     wallets = []
-    for r in rows:
+    async for r in rows:
         wallets.append({
             "wallet": r["wallet"],
-            "avg_roi": float(r["avg_roi"] or 0),
+            "avg_roi": r["avg_roi"] or 0.0,
             "total_trades": r["total_trades"] or 0,
-            "win_rate": float(r["win_rate"] or 0),
+            "win_rate": r["win_rate"] or 0.0,
             "cluster_label": r["cluster_label"] or "unknown",
-            "last_active": r["last_active"].isoformat() if r["last_active"] else None,
+            "last_active": r["last_active"],
         })
 
     return {"wallets": wallets}
@@ -449,21 +510,34 @@ async def api_wallets(limit: int = 100):
 
 
 @app.get("/api/analytics")
-async def api_analytics():
+async def api_analytics(request: Request):
     """
     Return data for visualization:
     1. Heatmap (Instability vs Free Float/Mcap) - using Instability directly.
     2. Explosiveness (Volume/Liquidity Ratio).
     3. Narrative Dominance (Capital Rotation).
     """
-    pool = await get_pool()
+    return await _cached_json(request, "api:analytics", _analytics)
+
+
+# V6.1 FIX: Pump.fun bonding curve starts at ~30 SOL and graduates at ~85 SOL
+# Formula: progress = (current - start) / (graduation - start)
+START_LIQ = 4500.0    # ~30 SOL * $150 = $4,500 (bonding curve start)
+GRADUATION_LIQ = 12750.0  # ~85 SOL * $150 = $12,750 (graduation threshold)
+START_MCAP = 4500.0   # Starting market cap
+GRADUATION_MCAP = 69000.0  # Graduation market cap (~85 SOL * ~$800/SOL in bonding curve terms)
+
+
+async def _analytics() -> dict:
+    """Heatmap as columns (one array per field, index-aligned); leaders are row indices."""
+    pool = app.state.pool
     
     # Get latest metrics for all active tokens (last 30m, fallback to 4h if none)
     rows = await pool.fetch(
         """
         WITH recent_metrics AS (
             SELECT t.address, t.symbol, t.name,
-                   m.price, m.marketcap, m.liquidity, 
+                   m.marketcap, m.liquidity,
                    m.volume_5m, m.buys_5m, m.sells_5m,
                    m.instability_index, m.timestamp, m.bonding_is_complete, m.bonding_pct,
                    ROW_NUMBER() OVER(PARTITION BY t.address ORDER BY m.timestamp DESC) as rn
@@ -478,123 +552,90 @@ async def api_analytics():
         """
     )
     
-    import math
-    
-    data = []
+    n = len(rows)
+    # Column-major so every field below is a contiguous array (orjson needs C-contiguous)
+    raw = np.ascontiguousarray(np.asarray(
+        [(r["liquidity"] or 0, r["volume_5m"] or 0, r["instability_index"] or 0,
+          r["marketcap"] or 0, r["bonding_pct"] if r["bonding_pct"] is not None else np.nan)
+         for r in rows], dtype=np.float64).reshape(-1, 5).T)
+    liq, vol, ii, mcap, db_pct = raw
+    # Calculate Velocity (Turnover) 
+    # V5.8: Removal of liq > 0 check to ensure high-volume/untracked tokens show activity
+    with np.errstate(divide="ignore", invalid="ignore"):
+        velocity = (vol / (liq + 1)) * 100
+    # Sanitize for JSON (no NaN or Inf), whole columns at once
+    liq, vol, velocity, instability, mcap = (
+        np.nan_to_num(c, nan=0.0, posinf=0.0, neginf=0.0)
+        for c in (liq, vol, velocity, np.minimum(ii, 500.0), mcap)
+    )
+
+    # Opportunity Score (V4.0): instability weighs more than velocity, capped at 100
+    score = np.where((instability > 0) & (velocity > 0),
+                     np.minimum(instability * 0.7 + velocity * 0.3, 100.0), 0.0)
+
+    # Bonding Curve Progress: DB value (from SOL reserves) > is_complete > liq/mcap estimate
+    complete = np.fromiter((bool(r["bonding_is_complete"]) for r in rows), dtype=bool, count=n)
+    is_pump = np.fromiter((r["address"].endswith("pump") for r in rows), dtype=bool, count=n)
+    with np.errstate(invalid="ignore"):
+        has_db = db_pct > 0
+    # Cap at 99% unless bonding_is_complete is True
+    from_db = np.where(complete & (db_pct >= 99.0), 100.0, db_pct)
+    estimate = np.where(
+        liq > START_LIQ,
+        np.clip((liq - START_LIQ) / (GRADUATION_LIQ - START_LIQ) * 100, 0.0, 99.0),
+        np.where(mcap > START_MCAP,
+                 np.clip((mcap - START_MCAP) / (GRADUATION_MCAP - START_MCAP) * 100, 0.0, 99.0),
+                 0.0),  # Token is very early
+    )
+    # Non-pump tokens are considered graduated
+    bonding_pct = np.select([has_db, complete, is_pump], [from_db, 100.0, estimate], 100.0)
+
+    names, symbols = [], []
     for r in rows:
-        liq = float(r["liquidity"] or 0)
-        vol = float(r["volume_5m"] or 0)
-        
-        # Calculate Velocity (Turnover) 
-        # V5.8: Removal of liq > 0 check to ensure high-volume/untracked tokens show activity
-        velocity = (vol / (liq + 1)) * 100 
-        
-        # Sanitize for JSON (no NaN or Inf)
-        instability = min(float(r["instability_index"] or 0), 500.0)
-        mcap = float(r["marketcap"] or 0)
-        
-        if not math.isfinite(velocity): velocity = 0.0
-        if not math.isfinite(instability): instability = 0.0
-        if not math.isfinite(liq): liq = 0.0
-        if not math.isfinite(mcap): mcap = 0.0
-        if not math.isfinite(vol): vol = 0.0
-        
         symbol = r["symbol"]
         name = r["name"] or "Unknown"
-        
         # UI Fallback: Symbol > Name > Truncated Address
-        display_symbol = symbol
-        if not display_symbol or display_symbol == "???":
-            if name and name != "Unknown":
-                display_symbol = name[:8] # Use start of name
-            else:
-                display_symbol = r["address"][:4] + "..."
-            
-        # Calculate Opportunity Score (V4.0)
-        # Higher instability + higher velocity = higher opportunity score
-        # Normalize to 0-100 range for better UX
-        score = 0.0
-        if instability > 0 and velocity > 0:
-            # Combine instability and velocity with weights
-            # Instability is more important for early detection
-            score = (instability * 0.7) + (velocity * 0.3)
-            # Cap the score to avoid extreme values
-            score = min(score, 100.0)
-        
-        # Calculate Bonding Curve Progress
-        # V6.1 FIX: Correct bonding curve calculation
-        # Pump.fun bonding curve starts at ~30 SOL and graduates at ~85 SOL
-        # Formula: progress = (current - start) / (graduation - start)
-        START_LIQ = 4500.0    # ~30 SOL * $150 = $4,500 (bonding curve start)
-        GRADUATION_LIQ = 12750.0  # ~85 SOL * $150 = $12,750 (graduation threshold)
-        START_MCAP = 4500.0   # Starting market cap
-        GRADUATION_MCAP = 69000.0  # Graduation market cap (~85 SOL * ~$800/SOL in bonding curve terms)
-        
-        if r.get("bonding_pct") is not None and float(r.get("bonding_pct")) > 0:
-            # Trust the DB value (calculated from SOL reserves)
-            bonding_pct = float(r.get("bonding_pct"))
-            # Cap at 99% unless bonding_is_complete is True AND we have high SOL reserves
-            if r.get("bonding_is_complete") and bonding_pct >= 99.0:
-                bonding_pct = 100.0
-        elif r.get("bonding_is_complete"):
-            # Only trust is_complete if we don't have bonding_pct
-            bonding_pct = 100.0
-        else:
-            # Fallback calculation from liquidity or market cap
-            if r["address"].endswith("pump"):
-                if liq > START_LIQ:
-                    # Calculate from liquidity
-                    bonding_pct = ((liq - START_LIQ) / (GRADUATION_LIQ - START_LIQ)) * 100
-                    bonding_pct = max(0.0, min(bonding_pct, 99.0))
-                elif mcap > START_MCAP:
-                    # V6.1: Fallback to market cap calculation
-                    # Linear interpolation from market cap
-                    # START_MCAP ≈ $4,500 (0%) to GRADUATION_MCAP ≈ $69,000 (100%)
-                    GRADUATION_MCAP = 69000.0
-                    bonding_pct = ((mcap - START_MCAP) / (GRADUATION_MCAP - START_MCAP)) * 100
-                    bonding_pct = max(0.0, min(bonding_pct, 99.0))
-                else:
-                    # Token is very early
-                    bonding_pct = 0.0
-            else:
-                # Non-pump tokens are considered graduated
-                bonding_pct = 100.0
-
-        data.append({
-            "address": r["address"],
-            "symbol": display_symbol,
-            "name": name,
-            "instability_index": instability,
-            "liquidity": liq,
-            "marketcap": mcap,
-            "volume_5m": vol,
-            "buys_5m": r["buys_5m"] or 0,
-            "sells_5m": r["sells_5m"] or 0,
-            "velocity": velocity,
-            "bonding_pct": round(bonding_pct, 1),
-            "score": round(score, 2),
-            "timestamp": r["timestamp"]
-        })
-    
+        if not symbol or symbol == "???":
+            symbol = name[:8] if name != "Unknown" else r["address"][:4] + "..."
+        names.append(name)
+        symbols.append(symbol)
+    timestamps = [r["timestamp"] for r in rows]
+
+    heatmap = {
+        "address": [r["address"] for r in rows],
+        "symbol": symbols,
+        "name": names,
+        "instability_index": instability,
+        "liquidity": liq,
+        "marketcap": mcap,
+        "volume_5m": vol,
+        "buys_5m": np.fromiter((r["buys_5m"] or 0 for r in rows), dtype=np.int64, count=n),
+        "sells_5m": np.fromiter((r["sells_5m"] or 0 for r in rows), dtype=np.int64, count=n),
+        "velocity": velocity,
+        "bonding_pct": np.round(bonding_pct, 1),
+        "score": np.round(score, 2),
+        "timestamp": timestamps,
+    }
+
     # Narrative Statistics
-    narrative_stats = NarrativeManager.get_narrative_stats(data)
+    narrative_stats = NarrativeManager.get_narrative_stats(
+        [{"name": nm, "symbol": sym, "volume_5m": v} for nm, sym, v in zip(names, symbols, vol.tolist())]
+    )
     
     # Sorts - FILTERING: Only show tokens with real liquidity (> $500) 
     # AND updated in the last 2 minutes to avoid stale 'explosive' signals
-    from datetime import datetime, timedelta, timezone
     cutoff = datetime.now(timezone.utc) - timedelta(minutes=2)
-    
-    fresh_data = [d for d in data if d["timestamp"] > cutoff]
-    
-    real_market_data = [d for d in fresh_data if d["liquidity"] > 500]
-    
-    explosive = sorted(real_market_data, key=lambda x: x["velocity"], reverse=True)[:10]
-    unstable = sorted(fresh_data, key=lambda x: x["instability_index"], reverse=True)[:10]
-    
+    fresh = np.fromiter((ts > cutoff for ts in timestamps), dtype=bool, count=n)
+
+    def top10(mask, key):
+        idx = np.flatnonzero(mask)
+        # stable: ties keep SQL order, like sorted(reverse=True)
+        return idx[np.argsort(-key[idx], kind="stable")[:10]]
+
     return {
-        "heatmap": data,
-        "explosive_leaders": explosive,
-        "instability_leaders": unstable,
+        "heatmap": heatmap,
+        "explosive_leaders": top10(fresh & (liq > 500), velocity),
+        "instability_leaders": top10(fresh, instability),
         "narrative_stats": narrative_stats
     }
 
@@ -607,33 +648,8 @@ async def action_seed_wallets(background_tasks: BackgroundTasks):
     
     async def run_seed_async():
         try:
-            from scripts.seed_wallets import recluster_all_wallets, prune_stale_wallets
-            import aiohttp
-            from scripts.seed_wallets import discover_wallets_from_dexscreener
-            from early_detector.db import upsert_wallet
-
-            # 1. Discover from DexScreener
-            async with aiohttp.ClientSession() as session:
-                new_wallets = await discover_wallets_from_dexscreener(session, limit=15)
-                for w in new_wallets:
-                    try:
-                        await upsert_wallet(w["wallet"], {
-                            "avg_roi": 1.0, "total_trades": 1,
-                            "win_rate": 0.0, "cluster_label": "unknown",
-                        })
-                    except Exception:
-                        pass
-
-            # 2. Prune stale
-            pruned = await prune_stale_wallets(days=7)
-
-            # 3. Re-cluster
-            stats = await recluster_all_wallets()
-
-            logger.info(
-                f"✅ Seed V5.0 complete: {stats['total']} wallets, "
-                f"{stats['smart']} smart, {pruned} pruned"
-            )
+            from scripts.seed_wallets import run_seed
+            await run_seed()
         except Exception as e:
             logger.error(f"❌ Seed script error: {e}")
 
@@ -645,7 +661,7 @@ async def action_seed_wallets(background_tasks: BackgroundTasks):
 async def action_refresh_wallets():
     """Refresh smart wallet list by re-querying the DB."""
     from early_detector.config import SW_MIN_ROI, SW_MIN_TRADES, SW_MIN_WIN_RATE
-    pool = await get_pool()
+    pool = app.state.pool
     rows = await pool.fetch(
         """
         SELECT wallet FROM wallet_performance 
@@ -661,12 +677,17 @@ async def action_refresh_wallets():
     }
 
 
+@app.get("/api/actions/pool-stats")
+async def action_pool_stats():
+    """DB connection pool occupancy."""
+    return pool_stats()
+
+
 # ── Trading Endpoints (V5.0) ─────────────────────────────────────────────────
 
 @app.post("/api/trade/buy")
 async def api_trade_buy(request: Request):
     """Execute a BUY trade via Jupiter."""
-    import aiohttp
     body = await request.json()
     token_address = body.get("address")
     amount_sol = float(body.get("amount_sol", TRADE_AMOUNT_SOL))
@@ -677,8 +698,7 @@ async def api_trade_buy(request: Request):
     if not token_address:
         return JSONResponse({"success": False, "error": "Indirizzo token mancante"}, status_code=400)
 
-    async with aiohttp.ClientSession() as session:
-        result = await execute_buy(session, token_address, amount_sol, slippage)
+    result = await execute_buy(app.state.http, token_address, amount_sol, slippage)
 
     if result["success"]:
         trade_id = await insert_trade(
@@ -701,7 +721,6 @@ async def api_trade_buy(request: Request):
 @app.post("/api/trade/sell")
 async def api_trade_sell(request: Request):
     """Execute a manual SELL trade."""
-    import aiohttp
     body = await request.json()
     token_address = body.get("address")
     trade_id = body.get("trade_id")
@@ -709,8 +728,7 @@ async def api_trade_sell(request: Request):
     if not token_address:
         return JSONResponse({"success": False, "error": "Indirizzo token mancante"}, status_code=400)
 
-    async with aiohttp.ClientSession() as session:
-        result = await execute_sell(session, token_address)
+    result = await execute_sell(app.state.http, token_address)
 
     if result["success"] and trade_id:
         await close_trade(
@@ -727,84 +745,70 @@ async def api_trade_sell(request: Request):
 @app.get("/api/trade/positions")
 async def api_trade_positions():
     """Get open positions with live ROI."""
+    # Postgres builds the JSON array; wrap it without parsing
     positions = await get_positions_with_roi()
-    safe = []
-    for p in positions:
-        entry = float(p.get("price_entry") or 0)
-        current = float(p.get("current_price") or 0)
-        roi = ((current - entry) / entry * 100) if entry > 0 and current > 0 else float(p.get("roi_pct") or 0)
-        safe.append({
-            "id": p["id"],
-            "token_address": p["token_address"],
-            "symbol": p.get("symbol") or p["token_address"][:6],
-            "name": p.get("name") or "Unknown",
-            "amount_sol": float(p.get("amount_sol") or 0),
-            "price_entry": entry,
-            "current_price": current,
-            "roi_pct": round(roi, 2),
-            "tp_pct": float(p.get("tp_pct") or 50),
-            "sl_pct": float(p.get("sl_pct") or 30),
-            "created_at": str(p.get("created_at", "")),
-        })
-    return {"positions": safe}
+    return Response(content=f'{{"positions":{positions}}}', media_type="application/json")
 
 
 @app.get("/api/trade/history")
 async def api_trade_history(limit: int = 50):
     """Get closed trades history."""
     trades = await get_trade_history(limit)
-    safe = []
-    for t in trades:
-        safe.append({
-            "id": t["id"],
-            "token_address": t["token_address"],
-            "symbol": t.get("symbol") or t["token_address"][:6],
-            "amount_sol": float(t.get("amount_sol") or 0),
-            "price_entry": float(t.get("price_entry") or 0),
-            "price_exit": float(t.get("price_exit") or 0),
-            "roi_pct": float(t.get("roi_pct") or 0),
-            "status": t["status"],
-            "created_at": str(t.get("created_at", "")),
-            "closed_at": str(t.get("closed_at", "")),
-        })
-    return {"trades": safe}
+    return Response(content=f'{{"trades":{trades}}}', media_type="application/json")
 
 
 @app.get("/api/wallet/balance")
 async def api_wallet_balance():
     """Get wallet SOL balance."""
-    import aiohttp
     wallet = get_wallet_address()
     if not wallet:
         return {"balance": 0, "wallet": None, "error": "Wallet non configurato"}
-    async with aiohttp.ClientSession() as session:
-        balance = await get_sol_balance(session)
+    balance = await get_sol_balance(app.state.http)
     return {"balance": round(balance, 5), "wallet": wallet}
 
 
-@app.get("/api/trade/sol-price")
-async def api_sol_price():
-    """Get SOL price from CoinGecko (reliable fallback)."""
-    import aiohttp
-    cached = cache.get("sol_price_usd")
-    if cached:
-        return {"price": cached}
-        
-    try:
-        async with aiohttp.ClientSession() as session:
-            url = "https://api.jup.ag/price/v2?ids=So11111111111111111111111111111111111111112"
-            # Try CoinGecko as fallback for SOL since Jup V2 might be restricted
+SOL_PRICE_KEY = "sol_price_usd"
+SOL_PRICE_FRESH_SECONDS = 60
+# Oltre questo il prezzo non viene più servito e la richiesta attende CoinGecko
+SOL_PRICE_STALE_SECONDS = 600
+_sol_price_lock = asyncio.Lock()
+
+
+async def _refresh_sol_price() -> float | None:
+    """Fetch SOL/USD from CoinGecko and cache it as (price, fetched_at).
+    Only one refresh runs at a time; waiters reuse its result."""
+    async with _sol_price_lock:
+        entry = cache.get(SOL_PRICE_KEY)
+        if entry and time.time() - entry[1] < SOL_PRICE_FRESH_SECONDS:
+            return entry[0]
+        try:
+            # CoinGecko: Jup V2 price API might be restricted
             url = "https://api.coingecko.com/api/v3/simple/price?ids=solana&vs_currencies=usd"
-            async with session.get(url, timeout=5) as resp:
+            async with app.state.http.get(url, timeout=aiohttp.ClientTimeout(total=5)) as resp:
                 if resp.status == 200:
                     data = await resp.json()
                     price = float(data["solana"]["usd"])
-                    cache.set("sol_price_usd", price, ttl_seconds=60)
-                    return {"price": price}
-    except Exception as e:
-        logger.error(f"SOL price error: {e}")
-        
-    return {"price": 0.0}
+                    cache.set(SOL_PRICE_KEY, (price, time.time()), ttl_seconds=SOL_PRICE_STALE_SECONDS)
+                    return price
+        except Exception as e:
+            logger.error(f"SOL price error: {e}")
+    return None
+
+
+@app.get("/api/trade/sol-price")
+async def api_sol_price(background_tasks: BackgroundTasks):
+    """Get SOL price from CoinGecko (stale-while-revalidate)."""
+    entry = cache.get(SOL_PRICE_KEY)
+    if entry:
+        price, fetched_at = entry
+        # Stale: answer now, refresh after the response is sent
+        if time.time() - fetched_at >= SOL_PRICE_FRESH_SECONDS and not _sol_price_lock.locked():
+            background_tasks.add_task(_refresh_sol_price)
+        return {"price": price}
+
+    # Nothing cached at all: only this path blocks on CoinGecko
+    price = await _refresh_sol_price()
+    return {"price": price or 0.0}
 
 
 @app.get("/api/logs")
@@ -816,24 +820,42 @@ async def api_logs(limit: int = 100):
         return {"logs": "Log file not found."}
     
     try:
-        # Simple tail implementation
-        with open(log_path, "r", encoding="utf-8") as f:
-            lines = f.readlines()
-            return {"logs": "".join(lines[-limit:])}
+        return {"logs": await asyncio.to_thread(_tail, log_path, limit)}
     except Exception as e:
         return {"logs": f"Error reading logs: {e}"}
 
 
+def _tail(path: Path, limit: int, block_size: int = 8192) -> str:
+    """Last `limit` lines of a file, reading backwards in blocks from EOF."""
+    if limit <= 0:
+        return ""
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        pos = f.tell()
+        data = b""
+        # limit lines need limit+1 newlines unless the file ends without one
+        while pos > 0 and data.count(b"\n") <= limit:
+            step = min(block_size, pos)
+            pos -= step
+            f.seek(pos)
+            data = f.read(step) + data
+    lines = data.splitlines(keepends=True)
+    return b"".join(lines[-limit:]).decode("utf-8", errors="replace")
+
+
 # Helius Webhook processing removed.
 
 
 # ── HTML Dashboard ────────────────────────────────────────────────────────────
 
 @app.get("/", response_class=HTMLResponse)
-async def serve_dashboard():
-    """Serve the dashboard HTML."""
-    html_path = Path(__file__).parent / "static" / "dashboard.html"
-    return HTMLResponse(content=html_path.read_text(encoding="utf-8"))
+async def serve_dashboard(request: Request):
+    """Serve the dashboard HTML (304 when the browser already has this build)."""
+    # no-cache = il browser rivalida sempre, ma dopo un deploy riceve la pagina nuova
+    headers = {"ETag": app.state.index_etag, "Cache-Control": "no-cache"}
+    if app.state.index_etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return HTMLResponse(content=app.state.index_html, headers=headers)
 
 if __name__ == "__main__":
     uvicorn.run(
@@ -841,4 +863,7 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=DASHBOARD_PORT,
         reload=False,
+        # uvloop has no Windows build; elsewhere it comes from requirements.txt
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
     )
@@ -2,13 +2,30 @@
 Database module — async PostgreSQL connection pool and CRUD helpers.
 """
 
+import asyncio
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 import asyncpg
-from decimal import Decimal
+import orjson
 from loguru import logger
-from early_detector.config import SUPABASE_DB_URL
+from early_detector.cache import cache
+from early_detector.config import (
+    SUPABASE_DB_URL, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_STATEMENT_CACHE_SIZE,
+)
 
 _pool: asyncpg.Pool | None = None
 
+# Set whenever upsert_token inserts a previously unseen token (wakes the creator monitor)
+new_tokens_event = asyncio.Event()
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Per-connection setup: decode NUMERIC straight to float (no Decimal per value)."""
+    await conn.set_type_codec(
+        "numeric", encoder=str, decoder=float, schema="pg_catalog", format="text"
+    )
+
 
 async def get_pool() -> asyncpg.Pool:
     """Return (and lazily create) a shared connection pool."""
@@ -17,9 +34,16 @@ async def get_pool() -> asyncpg.Pool:
         logger.info("Creating database connection pool…")
         _pool = await asyncpg.create_pool(
             SUPABASE_DB_URL, 
-            min_size=1, 
-            max_size=2,
-            statement_cache_size=0
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            max_queries=50000,
+            # Recycle idle connections before Supabase drops them server-side
+            max_inactive_connection_lifetime=300,
+            command_timeout=60,
+            statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+            # Keep prepared plans for the pool's lifetime instead of re-preparing every 300s
+            max_cached_statement_lifetime=0,
+            init=_init_connection,
         )
         logger.info("Database pool created.")
     return _pool
@@ -34,8 +58,51 @@ async def close_pool() -> None:
         logger.info("Database pool closed.")
 
 
+@asynccontextmanager
+async def pipeline():
+    """One connection + one transaction for a group of statements issued back to back
+    (single acquire, prepared statements stay on the same connection)."""
+    pool = await get_pool()
+    async with pool.acquire() as conn, conn.transaction():
+        yield conn
+
+
+def pool_stats() -> dict:
+    """Current pool occupancy, for observability."""
+    if _pool is None:
+        return {"size": 0, "idle": 0, "min_size": DB_POOL_MIN_SIZE, "max_size": DB_POOL_MAX_SIZE}
+    return {
+        "size": _pool.get_size(),
+        "idle": _pool.get_idle_size(),
+        "min_size": _pool.get_min_size(),
+        "max_size": _pool.get_max_size(),
+    }
+
+
 # ── Token helpers ─────────────────────────────────────────────────────────────
 
+_UPSERT_TOKEN_SQL = """
+    INSERT INTO tokens (address, name, symbol, narrative, creator_address)
+    VALUES ($1, $2, $3, $4, $5)
+    ON CONFLICT (address) DO UPDATE SET 
+        name = CASE 
+            WHEN tokens.name IS NULL OR tokens.name = 'Unknown' OR tokens.name = '' OR tokens.name LIKE 'Token #%'
+            THEN COALESCE(NULLIF($2, 'Unknown'), tokens.name)
+            ELSE tokens.name 
+        END,
+        symbol = CASE 
+            WHEN tokens.symbol IS NULL OR tokens.symbol = '???' OR tokens.symbol = '' OR tokens.symbol LIKE 'TOK%'
+            THEN COALESCE(NULLIF($3, '???'), tokens.symbol)
+            ELSE tokens.symbol 
+        END,
+        narrative = COALESCE(NULLIF($4, 'GENERIC'), tokens.narrative),
+        creator_address = COALESCE($5, tokens.creator_address),
+        mint_authority = COALESCE($6, tokens.mint_authority),
+        freeze_authority = COALESCE($7, tokens.freeze_authority)
+    RETURNING id, (xmax = 0) AS inserted
+"""
+
+
 async def upsert_token(address: str, name: str | None = None,
                        symbol: str | None = None, narrative: str | None = None,
                        creator_address: str | None = None,
@@ -44,28 +111,28 @@ async def upsert_token(address: str, name: str | None = None,
     """Insert a token if it doesn't exist; return its UUID."""
     pool = await get_pool()
     row = await pool.fetchrow(
-        """
-        INSERT INTO tokens (address, name, symbol, narrative, creator_address)
-        VALUES ($1, $2, $3, $4, $5)
-        ON CONFLICT (address) DO UPDATE SET 
-            name = CASE 
-                WHEN tokens.name IS NULL OR tokens.name = 'Unknown' OR tokens.name = '' OR tokens.name LIKE 'Token #%'
-                THEN COALESCE(NULLIF($2, 'Unknown'), tokens.name)
-                ELSE tokens.name 
-            END,
-            symbol = CASE 
-                WHEN tokens.symbol IS NULL OR tokens.symbol = '???' OR tokens.symbol = '' OR tokens.symbol LIKE 'TOK%'
-                THEN COALESCE(NULLIF($3, '???'), tokens.symbol)
-                ELSE tokens.symbol 
-            END,
-            narrative = COALESCE(NULLIF($4, 'GENERIC'), tokens.narrative),
-            creator_address = COALESCE($5, tokens.creator_address),
-            mint_authority = COALESCE($6, tokens.mint_authority),
-            freeze_authority = COALESCE($7, tokens.freeze_authority)
-        RETURNING id
-        """,
+        _UPSERT_TOKEN_SQL,
         address, name, symbol, narrative, creator_address, mint_authority, freeze_authority,
     )
+    if row["inserted"]:
+        new_tokens_event.set()
+    return str(row["id"])
+
+
+async def register_launch(address: str, name: str | None, symbol: str | None,
+                          narrative: str | None, creator_address: str | None) -> str:
+    """New launch from the live feed: upsert the token and bump the creator's
+    token count in one pipeline (single acquire, single transaction). Returns the token UUID."""
+    async with pipeline() as conn:
+        row = await conn.fetchrow(
+            _UPSERT_TOKEN_SQL,
+            address, name, symbol, narrative, creator_address, None, None,
+        )
+        if creator_address:
+            await conn.execute(_UPSERT_CREATOR_SQL, *_creator_args(creator_address, {"total_tokens": 1}))
+    # Wake the monitor only once the row is committed and visible to other connections
+    if row["inserted"]:
+        new_tokens_event.set()
     return str(row["id"])
 
 
@@ -77,22 +144,48 @@ async def get_token_creator(address: str) -> str | None:
 
 # ── Creator helpers ───────────────────────────────────────────────────────────
 
+_UPSERT_CREATOR_SQL = """
+    INSERT INTO creator_performance (creator_address, rug_ratio, avg_lifespan, total_tokens)
+    VALUES ($1, $2, $3, $4)
+    ON CONFLICT (creator_address) DO UPDATE
+        SET rug_ratio = $2, 
+            avg_lifespan = $3, 
+            total_tokens = creator_performance.total_tokens + $4
+"""
+
+
+def _creator_args(creator_address: str, stats: dict) -> tuple:
+    return (
+        creator_address,
+        stats.get("rug_ratio", 0.0),
+        stats.get("avg_lifespan", 0.0),
+        stats.get("total_tokens", 1),
+    )
+
+
 async def upsert_creator_stats(creator_address: str, stats: dict) -> None:
     """Track creator history: rug_ratio, avg_lifespan, etc."""
     pool = await get_pool()
+    await pool.execute(_UPSERT_CREATOR_SQL, *_creator_args(creator_address, stats))
+
+
+async def upsert_creator_stats_bulk(rows: list[tuple[str, float, float]]) -> None:
+    """Replace rug_ratio/avg_lifespan for many creators in a single statement.
+    `rows` are (creator_address, rug_ratio, avg_lifespan); total_tokens is left untouched."""
+    if not rows:
+        return
+    creators, rug_ratios, lifespans = zip(*rows)
+    pool = await get_pool()
     await pool.execute(
         """
         INSERT INTO creator_performance (creator_address, rug_ratio, avg_lifespan, total_tokens)
-        VALUES ($1, $2, $3, $4)
+        SELECT u.creator_address, u.rug_ratio, u.avg_lifespan, 0
+        FROM UNNEST($1::text[], $2::float8[], $3::float8[]) AS u(creator_address, rug_ratio, avg_lifespan)
         ON CONFLICT (creator_address) DO UPDATE
-            SET rug_ratio = $2, 
-                avg_lifespan = $3, 
-                total_tokens = creator_performance.total_tokens + $4
+            SET rug_ratio = EXCLUDED.rug_ratio,
+                avg_lifespan = EXCLUDED.avg_lifespan
         """,
-        creator_address,
-        stats.get("rug_ratio", 0.0),
-        stats.get("avg_lifespan", 0.0),
-        stats.get("total_tokens", 1),
+        list(creators), list(rug_ratios), list(lifespans),
     )
 
 
@@ -100,7 +193,10 @@ async def get_creator_stats(creator_address: str) -> dict | None:
     """Retrieve creator historical performance."""
     pool = await get_pool()
     row = await pool.fetchrow(
-        "SELECT * FROM creator_performance WHERE creator_address = $1",
+        """
+        SELECT creator_address, rug_ratio, avg_lifespan, total_tokens
+        FROM creator_performance WHERE creator_address = $1
+        """,
         creator_address
     )
     return dict(row) if row else None
@@ -135,64 +231,129 @@ async def get_creator_tokens(creator_address: str) -> list[dict]:
     return [dict(r) for r in rows]
 
 
+async def get_tokens_for_creators(creators: list[str]) -> dict[str, list[dict]]:
+    """Retrieve the tokens of many creators in one query, grouped by creator.
+
+    Each token carries the `is_likely_rug` flag of its latest metrics row
+    (None if it was never sampled).
+    """
+    pool = await get_pool()
+    rows = await pool.fetch(
+        """
+        SELECT t.creator_address, t.address,
+               EXTRACT(EPOCH FROM (NOW() - t.created_at))/3600 AS hours_since_creation,
+               m.is_likely_rug
+        FROM tokens t
+        LEFT JOIN LATERAL (
+            SELECT is_likely_rug
+            FROM token_metrics_timeseries
+            WHERE token_id = t.id
+            ORDER BY timestamp DESC
+            LIMIT 1
+        ) m ON TRUE
+        WHERE t.creator_address = ANY($1::text[])
+        """,
+        creators
+    )
+    grouped: dict[str, list[dict]] = {}
+    for r in rows:
+        grouped.setdefault(r["creator_address"], []).append(
+            {"address": r["address"], "hours_since_creation": r["hours_since_creation"],
+             "is_likely_rug": r["is_likely_rug"]}
+        )
+    return grouped
+
+
 # ── Metrics helpers ───────────────────────────────────────────────────────────
 
+# (column, default) in insert order; shared by the single-row and batch writers
+_METRIC_FIELDS = (
+    ("price", None), ("marketcap", None), ("liquidity", None), ("holders", None),
+    ("volume_5m", None), ("volume_1h", None), ("buys_5m", None), ("sells_5m", None),
+    ("top10_ratio", None), ("smart_wallets_active", 0), ("instability_index", None),
+    ("insider_psi", 0.0), ("creator_risk_score", 0.0), ("mint_authority", None),
+    ("freeze_authority", None), ("bonding_is_complete", False), ("bonding_pct", 0.0),
+)
+_METRIC_COLUMNS = ", ".join(f for f, _ in _METRIC_FIELDS)
+
+
+def _metrics_values(data: dict) -> tuple:
+    return tuple(data.get(f, default) for f, default in _METRIC_FIELDS)
+
+
 async def insert_metrics(token_id: str, data: dict) -> None:
     """Insert a row into token_metrics_timeseries."""
     pool = await get_pool()
     await pool.execute(
-        """
-        INSERT INTO token_metrics_timeseries
-            (token_id, price, marketcap, liquidity, holders,
-             volume_5m, volume_1h, buys_5m, sells_5m,
-             top10_ratio, smart_wallets_active, instability_index,
-             insider_psi, creator_risk_score, mint_authority, freeze_authority,
-             bonding_is_complete, bonding_pct)
+        f"""
+        INSERT INTO token_metrics_timeseries (token_id, {_METRIC_COLUMNS})
         VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, $15, $16, $17, $18)
         """,
         token_id,
-        data.get("price"),
-        data.get("marketcap"),
-        data.get("liquidity"),
-        data.get("holders"),
-        data.get("volume_5m"),
-        data.get("volume_1h"),
-        data.get("buys_5m"),
-        data.get("sells_5m"),
-        data.get("top10_ratio"),
-        data.get("smart_wallets_active", 0),
-        data.get("instability_index"),
-        data.get("insider_psi", 0.0),
-        data.get("creator_risk_score", 0.0),
-        data.get("mint_authority"),
-        data.get("freeze_authority"),
-        data.get("bonding_is_complete", False),
-        data.get("bonding_pct", 0.0),
-    )
-
-def _clean_dict(row: dict) -> dict:
-    """Utility to convert Decimal values to float for JSON/math compatibility."""
-    d = dict(row)
-    for k, v in d.items():
-        if isinstance(v, Decimal):
-            d[k] = float(v)
-    return d
+        *_metrics_values(data),
+    )
+
+
+# Column arrays go through UNNEST: NUMERIC columns travel as float8[] (the text NUMERIC
+# codec has no binary form, so COPY/numeric[] can't carry them)
+_INSERT_METRICS_BATCH_SQL = f"""
+    INSERT INTO token_metrics_timeseries (token_id, {_METRIC_COLUMNS})
+    SELECT * FROM UNNEST(
+        $1::uuid[],
+        $2::float8[], $3::float8[], $4::float8[], $5::int[],
+        $6::float8[], $7::float8[], $8::int[], $9::int[],
+        $10::float8[], $11::int[], $12::float8[],
+        $13::float8[], $14::float8[], $15::text[],
+        $16::text[], $17::bool[], $18::float8[]
+    )
+"""
+
+# Rows per UNNEST statement on backfill paths (keeps parameter arrays and statements bounded)
+METRICS_BATCH_SIZE = 5000
+
+
+def _metrics_columns(rows: list[tuple[str, dict]]) -> list[list]:
+    """Column-major parameters for _INSERT_METRICS_BATCH_SQL."""
+    return [[token_id for token_id, _ in rows]] + [
+        [data.get(f, default) for _, data in rows] for f, default in _METRIC_FIELDS
+    ]
+
+
+async def insert_metrics_batch(rows: list[tuple[str, dict]]) -> None:
+    """Insert many (token_id, metrics) rows into token_metrics_timeseries in one statement."""
+    if not rows:
+        return
+    pool = await get_pool()
+    await pool.execute(_INSERT_METRICS_BATCH_SQL, *_metrics_columns(rows))
+
+
+async def bulk_insert_metrics(token_id: str, rows: list[dict]) -> None:
+    """Backfill/replay: insert many metric rows for one token, METRICS_BATCH_SIZE rows
+    per statement, all on one connection and in one transaction."""
+    if not rows:
+        return
+    async with pipeline() as conn:
+        for i in range(0, len(rows), METRICS_BATCH_SIZE):
+            chunk = rows[i:i + METRICS_BATCH_SIZE]
+            await conn.execute(_INSERT_METRICS_BATCH_SQL, *_metrics_columns([(token_id, d) for d in chunk]))
 
 
 async def get_recent_metrics(token_id: str, minutes: int = 60) -> list[dict]:
-    """Fetch recent metric rows for a token within the last N minutes."""
+    """Fetch recent metric rows for a token within the last N minutes.
+    Only the columns the feature pipeline reads (newest first)."""
     pool = await get_pool()
     rows = await pool.fetch(
         """
-        SELECT * FROM token_metrics_timeseries
+        SELECT timestamp, price, liquidity, holders, buys_5m, sells_5m, instability_index
+        FROM token_metrics_timeseries
         WHERE token_id = $1
-          AND timestamp > NOW() - ($2 || ' minutes')::INTERVAL
+          AND timestamp > NOW() - make_interval(mins => $2)
         ORDER BY timestamp DESC
         """,
-        token_id, str(minutes),
+        token_id, minutes,
     )
-    # Convert Decimal values to float for numpy/math compatibility
-    return [_clean_dict(r) for r in rows]
+    # NUMERIC already arrives as float (pool codec)
+    return [dict(r) for r in rows]
 
 
 async def get_all_recent_instability(minutes: int = 60) -> list[dict]:
@@ -204,17 +365,30 @@ async def get_all_recent_instability(minutes: int = 60) -> list[dict]:
             token_id, instability_index, price, marketcap, liquidity,
             holders, top10_ratio, timestamp
         FROM token_metrics_timeseries
-        WHERE timestamp > NOW() - ($1 || ' minutes')::INTERVAL
+        WHERE timestamp > NOW() - make_interval(mins => $1)
           AND instability_index IS NOT NULL
         ORDER BY token_id, timestamp DESC
         """,
-        str(minutes),
+        minutes,
     )
-    return [_clean_dict(r) for r in rows]
+    return [dict(r) for r in rows]
 
 
 # ── Signal helpers ────────────────────────────────────────────────────────────
 
+# token_id -> monotonic time of its last known signal (LRU, bounded).
+# A miss only means one extra DB check, so eviction is harmless.
+RECENT_SIGNALS_MAX = 4096
+_recent_signals: OrderedDict[str, float] = OrderedDict()
+
+
+def _remember_signal(token_id: str, ts: float) -> None:
+    _recent_signals[token_id] = ts
+    _recent_signals.move_to_end(token_id)
+    if len(_recent_signals) > RECENT_SIGNALS_MAX:
+        _recent_signals.popitem(last=False)
+
+
 async def insert_signal(token_id: str, instability_index: float,
                         entry_price: float, liquidity: float,
                         marketcap: float, confidence: float = 0.5,
@@ -228,7 +402,6 @@ async def insert_signal(token_id: str, instability_index: float,
                         mint_authority: str | None = None,
                         freeze_authority: str | None = None) -> None:
     """Record a generated signal."""
-    import json
     pool = await get_pool()
     await pool.execute(
         """
@@ -241,71 +414,87 @@ async def insert_signal(token_id: str, instability_index: float,
         """,
         token_id, instability_index, entry_price, liquidity, marketcap, 
         confidence, kelly_size, insider_psi, creator_risk, hard_stop, tp_1,
-        degen_score, ai_summary, json.dumps(ai_analysis) if ai_analysis else None,
+        degen_score, ai_summary,
+        # JSONB text param; numpy scalars / non-str keys as stdlib json accepted them
+        orjson.dumps(ai_analysis, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS).decode()
+        if ai_analysis else None,
         mint_authority, freeze_authority
     )
+    _remember_signal(str(token_id), time.monotonic())
     logger.info(f"Signal saved for token {token_id} — II={instability_index:.3f}, Degen={degen_score}")
 
 
 async def has_recent_signal(token_id: str, minutes: int = 60) -> bool:
     """Check if a signal was already generated for this token recently."""
+    ts = _recent_signals.get(token_id)
+    if ts is not None and time.monotonic() - ts < minutes * 60:
+        return True
     pool = await get_pool()
-    val = await pool.fetchval(
+    # Age of the latest signal in the window (NULL if none): lets a DB hit seed the LRU too
+    age = await pool.fetchval(
         """
-        SELECT 1 FROM signals
+        SELECT EXTRACT(EPOCH FROM NOW() - MAX(timestamp))::float8 FROM signals
         WHERE token_id = $1
-          AND timestamp > NOW() - ($2 || ' minutes')::INTERVAL
-        LIMIT 1
+          AND timestamp > NOW() - make_interval(mins => $2)
         """,
-        token_id, str(minutes),
+        token_id, minutes,
     )
-    return val is not None
+    if age is None:
+        return False
+    _remember_signal(token_id, time.monotonic() - age)
+    return True
 
 
 # ── Wallet helpers ────────────────────────────────────────────────────────────
 
+# Single statement: the weighted average is computed against the locked row
+# (no read-then-write round trip, no lost update between concurrent writers)
+_UPSERT_WALLET_SQL = """
+    INSERT INTO wallet_performance AS wp
+        (wallet, avg_roi, total_trades, win_rate, cluster_label, last_active)
+    VALUES ($1, $2, $3, $4, $5, NOW())
+    ON CONFLICT (wallet) DO UPDATE
+        SET total_trades = COALESCE(wp.total_trades, 0) + EXCLUDED.total_trades,
+            -- Weighted average (a stored ROI of 0/NULL counts as the 1.0 baseline)
+            avg_roi = CASE WHEN COALESCE(wp.total_trades, 0) + EXCLUDED.total_trades > 0
+                THEN (COALESCE(NULLIF(wp.avg_roi, 0), 1.0) * COALESCE(wp.total_trades, 0)
+                      + EXCLUDED.avg_roi * EXCLUDED.total_trades)
+                     / (COALESCE(wp.total_trades, 0) + EXCLUDED.total_trades)
+                ELSE EXCLUDED.avg_roi END,
+            win_rate = CASE WHEN COALESCE(wp.total_trades, 0) + EXCLUDED.total_trades > 0
+                THEN (COALESCE(wp.win_rate, 0) * COALESCE(wp.total_trades, 0)
+                      + EXCLUDED.win_rate * EXCLUDED.total_trades)
+                     / (COALESCE(wp.total_trades, 0) + EXCLUDED.total_trades)
+                ELSE EXCLUDED.win_rate END,
+            cluster_label = EXCLUDED.cluster_label,
+            last_active = NOW()
+"""
+
+
+def _wallet_args(wallet: str, stats: dict) -> tuple:
+    return (
+        wallet,
+        stats.get("avg_roi", 1.0),
+        stats.get("total_trades", 0),
+        stats.get("win_rate", 0.0),
+        stats.get("cluster_label", "unknown"),
+    )
+
+
 async def upsert_wallet(wallet: str, stats: dict) -> None:
     """Insert or update wallet performance stats cumulatively."""
     pool = await get_pool()
-    # Check if wallet exists to calculate cumulative stats
-    row = await pool.fetchrow("SELECT total_trades, avg_roi, win_rate FROM wallet_performance WHERE wallet = $1", wallet)
-    
-    new_trades = stats.get("total_trades", 0)
-    new_roi = stats.get("avg_roi", 1.0)
-    new_wr = stats.get("win_rate", 0.0)
-    cluster = stats.get("cluster_label", "unknown")
-
-    if row:
-        old_trades = row["total_trades"] or 0
-        old_roi = float(row["avg_roi"] or 1.0)
-        old_wr = float(row["win_rate"] or 0.0)
-        
-        total_trades = old_trades + new_trades
-        if total_trades > 0:
-            # Weighted average
-            updated_roi = (old_roi * old_trades + new_roi * new_trades) / total_trades
-            updated_wr = (old_wr * old_trades + new_wr * new_trades) / total_trades
-        else:
-            updated_roi = new_roi
-            updated_wr = new_wr
-            
-        await pool.execute(
-            """
-            UPDATE wallet_performance 
-            SET avg_roi = $2, total_trades = $3, win_rate = $4,
-                cluster_label = $5, last_active = NOW()
-            WHERE wallet = $1
-            """,
-            wallet, updated_roi, total_trades, updated_wr, cluster
-        )
-    else:
-        await pool.execute(
-            """
-            INSERT INTO wallet_performance (wallet, avg_roi, total_trades, win_rate, cluster_label, last_active)
-            VALUES ($1, $2, $3, $4, $5, NOW())
-            """,
-            wallet, new_roi, new_trades, new_wr, cluster
-        )
+    await pool.execute(_UPSERT_WALLET_SQL, *_wallet_args(wallet, stats))
+
+
+async def upsert_wallets_bulk(rows: list[tuple[str, dict]]) -> None:
+    """upsert_wallet for many (wallet, stats) pairs: one pipelined executemany in a
+    single transaction. Repeated wallets are merged in order, like sequential calls."""
+    if not rows:
+        return
+    pool = await get_pool()
+    async with pool.acquire() as conn, conn.transaction():
+        await conn.executemany(_UPSERT_WALLET_SQL, [_wallet_args(w, stats) for w, stats in rows])
 
 
 async def increment_wallet_trades(wallet: str, cluster: str = "retail") -> None:
@@ -324,6 +513,37 @@ async def increment_wallet_trades(wallet: str, cluster: str = "retail") -> None:
     )
 
 
+async def increment_wallet_trades_bulk(rows: list[tuple[str, int, str]]) -> None:
+    """Apply many (wallet, trade_count, cluster) increments in one statement."""
+    if not rows:
+        return
+    wallets, counts, clusters = zip(*rows)
+    pool = await get_pool()
+    await pool.execute(
+        """
+        INSERT INTO wallet_performance (wallet, avg_roi, total_trades, win_rate, cluster_label, last_active)
+        SELECT w, 1.0, n, 0.0, c, NOW()
+        FROM UNNEST($1::text[], $2::int[], $3::text[]) AS u(w, n, c)
+        ON CONFLICT (wallet) DO UPDATE SET 
+            total_trades = wallet_performance.total_trades + EXCLUDED.total_trades,
+            last_active = NOW(),
+            cluster_label = CASE WHEN wallet_performance.cluster_label = 'new' THEN EXCLUDED.cluster_label ELSE wallet_performance.cluster_label END
+        """,
+        list(wallets), list(counts), list(clusters)
+    )
+
+
+async def touch_wallets_bulk(wallets: list[str]) -> None:
+    """Update last_active for many wallets in one statement."""
+    if not wallets:
+        return
+    pool = await get_pool()
+    await pool.execute(
+        "UPDATE wallet_performance SET last_active = NOW() WHERE wallet = ANY($1::text[])",
+        wallets
+    )
+
+
 async def touch_wallet(wallet: str) -> None:
     """Update the last_active timestamp for a wallet without changing stats."""
     pool = await get_pool()
@@ -336,11 +556,23 @@ async def get_all_wallet_performance() -> list[dict]:
     """Retrieve all wallet performance rows for global re-clustering."""
     pool = await get_pool()
     rows = await pool.fetch("SELECT wallet, avg_roi, total_trades, win_rate FROM wallet_performance")
-    return [_clean_dict(r) for r in rows]
+    return [dict(r) for r in rows]
+
+
+# Read-mostly aggregates shared by workers; single-flight TTL cache (seconds)
+SMART_WALLETS_CACHE_TTL = 30
+AVG_VOLUME_CACHE_TTL = 30
 
 
 async def get_smart_wallets_stats() -> dict[str, dict]:
-    """Return a dictionary of {wallet_address: {stats}} for verified smart wallets."""
+    """Return a dictionary of {wallet_address: {stats}} for verified smart wallets.
+    Cached for SMART_WALLETS_CACHE_TTL: treat the result as read-only."""
+    return await cache.get_or_compute(
+        "db:smart_wallets_stats", _fetch_smart_wallets_stats, ttl_seconds=SMART_WALLETS_CACHE_TTL
+    )
+
+
+async def _fetch_smart_wallets_stats() -> dict[str, dict]:
     from early_detector.config import SW_MIN_ROI, SW_MIN_TRADES, SW_MIN_WIN_RATE
     pool = await get_pool()
     rows = await pool.fetch(
@@ -353,7 +585,7 @@ async def get_smart_wallets_stats() -> dict[str, dict]:
         """,
         SW_MIN_ROI, SW_MIN_TRADES, SW_MIN_WIN_RATE
     )
-    return {r["wallet"]: _clean_dict(r) for r in rows}
+    return {r["wallet"]: dict(r) for r in rows}
 
 
 async def get_smart_wallets() -> list[str]:
@@ -365,34 +597,40 @@ async def get_smart_wallets() -> list[str]:
 async def get_tracked_tokens(limit: int = 500) -> list[str]:
     """Return addresses of recently active tokens and signals for refresh."""
     pool = await get_pool()
+    # Each leg aggregates on token_id alone (no per-row join to tokens) and keeps only
+    # its top $1 by recency; tokens is joined for the final <= $1 rows only
     rows = await pool.fetch(
         """
-        WITH recent_signals AS (
-            SELECT DISTINCT t.address, MAX(s.timestamp) as last_sig
-            FROM tokens t
-            JOIN signals s ON s.token_id = t.id
-            WHERE s.timestamp > NOW() - INTERVAL '12 hours'
-            GROUP BY t.address
-        ),
-        recent_metrics AS (
-            SELECT DISTINCT t.address, MAX(m.timestamp) as last_met
-            FROM tokens t
-            JOIN token_metrics_timeseries m ON m.token_id = t.id
-            WHERE m.timestamp > NOW() - INTERVAL '4 hours'
-            GROUP BY t.address
-        )
-        SELECT address FROM (
-            SELECT address, last_sig as sort_time FROM recent_signals
-            UNION
-            SELECT address, last_met as sort_time FROM recent_metrics
-        ) combined
-        ORDER BY sort_time DESC
-        LIMIT $1
+        SELECT t.address
+        FROM (
+            SELECT token_id, MAX(sort_time) AS sort_time
+            FROM (
+                (SELECT token_id, MAX(timestamp) AS sort_time
+                 FROM signals
+                 WHERE timestamp > NOW() - INTERVAL '12 hours'
+                 GROUP BY token_id
+                 ORDER BY sort_time DESC
+                 LIMIT $1)
+                UNION ALL
+                (SELECT token_id, MAX(timestamp) AS sort_time
+                 FROM token_metrics_timeseries
+                 WHERE timestamp > NOW() - INTERVAL '4 hours'
+                 GROUP BY token_id
+                 ORDER BY sort_time DESC
+                 LIMIT $1)
+            ) legs
+            GROUP BY token_id
+            ORDER BY sort_time DESC
+            LIMIT $1
+        ) recent
+        JOIN tokens t ON t.id = recent.token_id
+        ORDER BY recent.sort_time DESC
         """,
         limit,
     )
     return [r["address"] for r in rows]
 
+
 async def log_market_regime(total_volume: float, regime_label: str) -> None:
     """Log the current market regime for historical analysis."""
     pool = await get_pool()
@@ -403,13 +641,19 @@ async def log_market_regime(total_volume: float, regime_label: str) -> None:
 
 
 async def get_avg_volume_history(minutes: int = 120) -> float:
-    """Calculate average historical batch volume."""
-    pool = await get_pool()
-    val = await pool.fetchval(
-        "SELECT AVG(total_volume_5m) FROM market_regime WHERE timestamp > NOW() - ($1 || ' minutes')::INTERVAL",
-        str(minutes)
+    """Calculate average historical batch volume (cached for AVG_VOLUME_CACHE_TTL:
+    every scored batch asks, the 2h average barely moves between them)."""
+    async def compute() -> float:
+        pool = await get_pool()
+        val = await pool.fetchval(
+            "SELECT AVG(total_volume_5m) FROM market_regime WHERE timestamp > NOW() - make_interval(mins => $1)",
+            minutes
+        )
+        return float(val or 0.0)
+
+    return await cache.get_or_compute(
+        f"db:avg_volume:{minutes}", compute, ttl_seconds=AVG_VOLUME_CACHE_TTL
     )
-    return float(val or 0.0)
 
 
 async def get_unprocessed_tokens(limit: int = 20) -> list[str]:
@@ -439,24 +683,22 @@ async def insert_trade(token_address: str, side: str, amount_sol: float,
                        tp_pct: float, sl_pct: float, tx_hash: str) -> int | None:
     """Insert a new trade record. Returns the trade ID."""
     pool = await get_pool()
-    # Get or create token
-    token_id = await pool.fetchval(
-        "SELECT id FROM tokens WHERE address = $1", token_address
-    )
-    if not token_id:
-        token_id = await pool.fetchval(
-            "INSERT INTO tokens (address) VALUES ($1) ON CONFLICT (address) DO UPDATE SET address = $1 RETURNING id",
-            token_address
-        )
-    
+    # Get-or-create the token and insert the trade in one round trip.
+    # DO UPDATE (not DO NOTHING) so RETURNING yields the id for existing tokens too.
     trade_id = await pool.fetchval(
         """
+        WITH tok AS (
+            INSERT INTO tokens (address) VALUES ($1)
+            ON CONFLICT (address) DO UPDATE SET address = EXCLUDED.address
+            RETURNING id
+        )
         INSERT INTO trades (token_id, token_address, side, amount_sol, amount_token,
                            price_entry, tp_pct, sl_pct, tx_hash_buy, status)
-        VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, 'OPEN')
+        SELECT tok.id, $1, $2, $3, $4, $5, $6, $7, $8, 'OPEN'
+        FROM tok
         RETURNING id
         """,
-        token_id, token_address, side, amount_sol, amount_token,
+        token_address, side, amount_sol, amount_token,
         price_entry, tp_pct, sl_pct, tx_hash
     )
     return trade_id
@@ -494,44 +736,109 @@ async def close_trade(trade_id: int, status: str, exit_price: float,
     )
 
 
-async def get_trade_history(limit: int = 50) -> list[dict]:
-    """Get closed trades history."""
+async def get_trade_history(limit: int = 50) -> str:
+    """Get closed trades history as a JSON array (shaped by Postgres, ready to send)."""
     pool = await get_pool()
-    rows = await pool.fetch(
+    return await pool.fetchval(
         """
-        SELECT t.id, t.token_address, t.side, t.amount_sol,
-               t.price_entry, t.price_exit, t.tp_pct, t.sl_pct,
-               t.roi_pct, t.status, t.tx_hash_buy, t.tx_hash_sell,
-               t.created_at, t.closed_at, tk.symbol, tk.name
-        FROM trades t
-        LEFT JOIN tokens tk ON tk.id = t.token_id
-        WHERE t.status != 'OPEN'
-        ORDER BY t.closed_at DESC
-        LIMIT $1
+        SELECT COALESCE(json_agg(json_build_object(
+                   'id', h.id,
+                   'token_address', h.token_address,
+                   'symbol', COALESCE(NULLIF(h.symbol, ''), LEFT(h.token_address, 6)),
+                   'amount_sol', COALESCE(h.amount_sol, 0),
+                   'price_entry', COALESCE(h.price_entry, 0),
+                   'price_exit', COALESCE(h.price_exit, 0),
+                   'roi_pct', COALESCE(h.roi_pct, 0),
+                   'status', h.status,
+                   'created_at', h.created_at,
+                   'closed_at', h.closed_at
+               ) ORDER BY h.closed_at DESC), '[]'::json)
+        FROM (
+            SELECT t.id, t.token_address, t.amount_sol,
+                   t.price_entry, t.price_exit, t.roi_pct, t.status,
+                   t.created_at, t.closed_at, tk.symbol
+            FROM trades t
+            LEFT JOIN tokens tk ON tk.id = t.token_id
+            WHERE t.status != 'OPEN'
+            ORDER BY t.closed_at DESC
+            LIMIT $1
+        ) h
         """,
         limit
     )
-    return [dict(r) for r in rows]
 
 
-async def get_positions_with_roi() -> list[dict]:
-    """Get open positions with latest price for ROI calculation."""
+async def get_positions_with_roi() -> str:
+    """Get open positions with live ROI as a JSON array (shaped by Postgres, ready to send)."""
     pool = await get_pool()
-    rows = await pool.fetch(
+    return await pool.fetchval(
         """
-        SELECT t.id, t.token_address, t.amount_sol, t.amount_token,
-               t.price_entry, t.tp_pct, t.sl_pct, t.roi_pct,
-               t.created_at, tk.symbol, tk.name,
-               (SELECT m.price FROM token_metrics_timeseries m 
-                WHERE m.token_id = t.token_id 
-                ORDER BY m.timestamp DESC LIMIT 1) as current_price
-        FROM trades t
-        LEFT JOIN tokens tk ON tk.id = t.token_id
-        WHERE t.status = 'OPEN' AND t.side = 'BUY'
-        ORDER BY t.created_at DESC
+        SELECT COALESCE(json_agg(json_build_object(
+                   'id', p.id,
+                   'token_address', p.token_address,
+                   'symbol', COALESCE(NULLIF(p.symbol, ''), LEFT(p.token_address, 6)),
+                   'name', COALESCE(NULLIF(p.name, ''), 'Unknown'),
+                   'amount_sol', COALESCE(p.amount_sol, 0),
+                   'price_entry', COALESCE(p.price_entry, 0),
+                   'current_price', COALESCE(p.current_price, 0),
+                   -- Live ROI from the latest price, else the stored one
+                   'roi_pct', ROUND(CASE WHEN p.price_entry > 0 AND p.current_price > 0
+                                         THEN (p.current_price - p.price_entry) / p.price_entry * 100
+                                         ELSE COALESCE(p.roi_pct, 0) END, 2),
+                   'tp_pct', COALESCE(NULLIF(p.tp_pct, 0), 50),
+                   'sl_pct', COALESCE(NULLIF(p.sl_pct, 0), 30),
+                   'created_at', p.created_at
+               ) ORDER BY p.created_at DESC), '[]'::json)
+        FROM (
+            SELECT t.id, t.token_address, t.amount_sol,
+                   t.price_entry, t.tp_pct, t.sl_pct, t.roi_pct,
+                   t.created_at, tk.symbol, tk.name,
+                   lp.price AS current_price
+            FROM trades t
+            LEFT JOIN tokens tk ON tk.id = t.token_id
+            -- Latest price per position: one idx_token_time dive each
+            LEFT JOIN LATERAL (
+                SELECT m.price FROM token_metrics_timeseries m
+                WHERE m.token_id = t.token_id
+                ORDER BY m.timestamp DESC LIMIT 1
+            ) lp ON TRUE
+            WHERE t.status = 'OPEN' AND t.side = 'BUY'
+        ) p
         """
     )
-    return [dict(r) for r in rows]
+
+
+async def _hypertables(pool: asyncpg.Pool) -> set[str]:
+    """Names of TimescaleDB hypertables (empty without the extension)."""
+    if not await pool.fetchval("SELECT to_regclass('timescaledb_information.hypertables') IS NOT NULL"):
+        return set()
+    rows = await pool.fetch("SELECT hypertable_name FROM timescaledb_information.hypertables")
+    return {r["hypertable_name"] for r in rows}
+
+
+# Rows per DELETE statement in cleanup: short transactions, short row locks, no bloat spikes
+CLEANUP_BATCH_SIZE = 10000
+
+
+async def _delete_in_batches(pool: asyncpg.Pool, table: str, where: str, *args) -> int:
+    """DELETE FROM `table` WHERE `where` in CLEANUP_BATCH_SIZE chunks (each its own
+    transaction) until a batch comes back short. The batch size is the last parameter."""
+    limit_param = f"${len(args) + 1}"
+    deleted = 0
+    while True:
+        res = await pool.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE ctid = ANY(ARRAY(
+                SELECT ctid FROM {table} WHERE {where} LIMIT {limit_param}
+            ))
+            """,
+            *args, CLEANUP_BATCH_SIZE
+        )
+        n = int(res.split()[-1]) if res and res.startswith("DELETE") else 0
+        deleted += n
+        if n < CLEANUP_BATCH_SIZE:
+            return deleted
 
 
 async def cleanup_old_data(days: int = 2) -> int:
@@ -541,43 +848,40 @@ async def cleanup_old_data(days: int = 2) -> int:
     """
     pool = await get_pool()
     try:
+        hypertables = await _hypertables(pool)
         # 1. Clean metrics (Time-Series) - Aggressive keeping only 48h
-        await pool.execute(
-            "DELETE FROM token_metrics_timeseries WHERE timestamp < NOW() - ($1 || ' days')::INTERVAL",
-            str(days)
-        )
-        
         # 2. Clean signals - Keep for 2 days
-        await pool.execute(
-            "DELETE FROM signals WHERE timestamp < NOW() - ($1 || ' days')::INTERVAL",
-            str(days)
-        )
+        for table in ("token_metrics_timeseries", "signals"):
+            if table in hypertables:
+                # TimescaleDB (migrations/005): drop whole chunks, no heap scan
+                await pool.execute(
+                    f"SELECT drop_chunks('{table}', older_than => make_interval(days => $1))",
+                    days
+                )
+            else:
+                await _delete_in_batches(
+                    pool, table, "timestamp < NOW() - make_interval(days => $1)", days
+                )
         
         # 3. Clean orphaned tokens 
-        # (Tokens with no metrics AND NOT in an active 'OPEN' trade)
-        res = await pool.execute(
+        # (Tokens with no metrics, no signals AND NOT in an active 'OPEN' trade)
+        # NOT EXISTS plans as anti-joins; NOT IN matched nothing once trades.token_id had a NULL
+        deleted_count = await _delete_in_batches(
+            pool, "tokens t",
             """
-            DELETE FROM tokens 
-            WHERE id NOT IN (SELECT DISTINCT token_id FROM token_metrics_timeseries)
-            AND id NOT IN (SELECT DISTINCT token_id FROM trades WHERE status = 'OPEN')
-            AND id NOT IN (SELECT DISTINCT token_id FROM signals)
-            AND created_at < NOW() - INTERVAL '48 hours'
+            NOT EXISTS (SELECT 1 FROM token_metrics_timeseries m WHERE m.token_id = t.id)
+            AND NOT EXISTS (SELECT 1 FROM trades tr WHERE tr.token_id = t.id AND tr.status = 'OPEN')
+            AND NOT EXISTS (SELECT 1 FROM signals s WHERE s.token_id = t.id)
+            AND t.created_at < NOW() - INTERVAL '48 hours'
             """
         )
 
         # 4. Clean old wallets (Clear noise from 'Wallets Profiled')
         # Delete wallets not active in 2 days that aren't smart or insider
-        await pool.execute(
-            """
-            DELETE FROM wallet_performance 
-            WHERE last_active < NOW() - INTERVAL '2 days'
-            AND cluster_label NOT IN ('smart', 'insider')
-            """
+        await _delete_in_batches(
+            pool, "wallet_performance",
+            "last_active < NOW() - INTERVAL '2 days' AND cluster_label NOT IN ('smart', 'insider')"
         )
-        
-        deleted_count = 0
-        if res and "DELETE" in res:
-            deleted_count = int(res.split()[-1])
             
         logger.info(f"🧹 DB Cleanup: Removed data older than {days} days and {deleted_count} stale tokens.")
         return deleted_count
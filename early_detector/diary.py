@@ -3,13 +3,64 @@ Quantitative Diary (V4.0).
 Logs detailed signal context for later re-calibration and analysis.
 """
 
-import json
+import asyncio
 import os
+import orjson
 from datetime import datetime
 from loguru import logger
 from early_detector.config import DATA_DIR
 
 DIARY_FILE = os.path.join(DATA_DIR or ".", "quant_diary.jsonl")
+# Lines per append: the writer drains whatever is queued, up to this many
+DIARY_BATCH_MAX = 64
+
+_queue: asyncio.Queue | None = None
+_writer_task: asyncio.Task | None = None
+
+
+def _append(lines: list[bytes]) -> None:
+    """Blocking append of complete JSONL lines (runs in a worker thread)."""
+    try:
+        with open(DIARY_FILE, "ab") as f:
+            f.write(b"".join(lines))
+    except Exception as e:
+        logger.error(f"Failed to log to quant diary: {e}")
+
+
+async def _writer() -> None:
+    """Single background writer: batches queued lines so file I/O never runs on the loop."""
+    while True:
+        batch = [await _queue.get()]
+        while len(batch) < DIARY_BATCH_MAX and not _queue.empty():
+            batch.append(_queue.get_nowait())
+        try:
+            await asyncio.to_thread(_append, batch)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+
+
+def _enqueue(line: bytes) -> None:
+    global _queue, _writer_task
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        # No event loop (scripts/tests): write inline
+        _append([line])
+        return
+    # One writer per event loop, started on first use
+    if _writer_task is None or _writer_task.done() or _writer_task.get_loop() is not loop:
+        _queue = asyncio.Queue()
+        _writer_task = loop.create_task(_writer())
+    _queue.put_nowait(line)
+
+
+async def flush_diary() -> None:
+    """Wait until every queued diary line has been written."""
+    if _writer_task is not None and not _writer_task.done() \
+            and _writer_task.get_loop() is asyncio.get_running_loop():
+        await _queue.join()
+
 
 def log_trade_signal(signal_data: dict, market_regime: str):
     """
@@ -31,10 +82,12 @@ def log_trade_signal(signal_data: dict, market_regime: str):
     }
     
     try:
-        with open(DIARY_FILE, "a", encoding="utf-8") as f:
-            f.write(json.dumps(entry) + "\n")
+        line = orjson.dumps(entry, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_APPEND_NEWLINE)
     except Exception as e:
         logger.error(f"Failed to log to quant diary: {e}")
+        return
+    # Queued for the background writer; the signal path never touches the file
+    _enqueue(line)
 
 def update_signal_outcome(token_id: str, outcome: float):
     """
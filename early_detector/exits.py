@@ -3,6 +3,7 @@
 Provides multi-stage exit strategy for meme coin trading.
 """
 
+from functools import lru_cache
 from loguru import logger
 
 class ExitStrategy:
@@ -16,6 +17,10 @@ class ExitStrategy:
     STOP_LOSS_RATIO = 0.15
     TP_1_RATIO = 0.40
     TRAILING_RATIO = 0.20
+    # Price multipliers, folded once at class creation
+    _STOP_MUL = 1 - STOP_LOSS_RATIO
+    _TP1_MUL = 1 + TP_1_RATIO
+    _TRAIL_MUL = 1 - TRAILING_RATIO
     
     @staticmethod
     def calculate_levels(entry_price: float) -> dict:
@@ -24,11 +29,12 @@ class ExitStrategy:
         """
         if entry_price <= 0:
             return {}
-            
+        
+        hard_stop, tp_1, trailing_trigger = _levels(entry_price)
         return {
-            "hard_stop": entry_price * (1 - ExitStrategy.STOP_LOSS_RATIO),
-            "tp_1": entry_price * (1 + ExitStrategy.TP_1_RATIO),
-            "trailing_trigger": entry_price * (1 + ExitStrategy.TP_1_RATIO), # Trailing starts after TP1
+            "hard_stop": hard_stop,
+            "tp_1": tp_1,
+            "trailing_trigger": trailing_trigger, # Trailing starts after TP1
             "trailing_distance": ExitStrategy.TRAILING_RATIO
         }
         
@@ -38,20 +44,36 @@ class ExitStrategy:
         """
         Returns advice: 'HOLD', 'HALF-SELL', 'EXIT', 'TRAILING-STOP'.
         """
-        levels = ExitStrategy.calculate_levels(entry_price)
-        if not levels:
+        if entry_price <= 0:
             return "HOLD"
-            
-        if current_price <= levels["hard_stop"]:
+        hard_stop, tp_1, _ = _levels(entry_price)
+        return ExitStrategy.advise(current_price, hard_stop, tp_1, is_halved, max_price)
+
+    @staticmethod
+    def advise(current_price: float, hard_stop: float, tp_1: float,
+               is_halved: bool = False, max_price: float = 0.0) -> str:
+        """
+        get_exit_advice on levels already known (e.g. hard_stop/tp_1 stored with the
+        signal at entry): float compares only, no level computation per tick.
+        """
+        if current_price <= hard_stop:
             return "EXIT (Stop Loss)"
             
-        if not is_halved and current_price >= levels["tp_1"]:
+        if not is_halved and current_price >= tp_1:
             return "HALF-SELL (+40% TP)"
             
         if is_halved:
             # Trailing stop logic: exit if price falls 20% from peak
             peak = max(max_price, current_price)
-            if current_price <= peak * (1 - ExitStrategy.TRAILING_RATIO):
+            if current_price <= peak * ExitStrategy._TRAIL_MUL:
                 return "EXIT (Trailing Stop)"
                 
         return "HOLD"
+
+
+@lru_cache(maxsize=4096)
+def _levels(entry_price: float) -> tuple[float, float, float]:
+    """(hard_stop, tp_1, trailing_trigger) per entry price: computed once per position,
+    not on every price tick. Tuple, so callers can't mutate the cached value."""
+    tp_1 = entry_price * ExitStrategy._TP1_MUL
+    return entry_price * ExitStrategy._STOP_MUL, tp_1, tp_1
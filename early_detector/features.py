@@ -6,6 +6,21 @@ V6.0 OPTIMIZED: Enhanced momentum features, volume analysis, and trend detection
 import numpy as np
 
 
+def _clip(x: float, lo: float, hi: float) -> float:
+    """Scalar clip: np.clip's array dispatch costs far more than two compares."""
+    x = float(x)
+    return lo if x < lo else hi if x > hi else x
+
+
+def _mean_std(x: np.ndarray) -> tuple[float, float]:
+    """Mean and population std (ddof=0) with one sum + one dot.
+    Same result as np.mean/np.std without their per-call reduction overhead."""
+    n = len(x)
+    mean = x.sum() / n
+    d = x - mean
+    return float(mean), float(np.sqrt(d.dot(d) / n))
+
+
 def holder_acceleration(h_t: int, h_t10: int, h_t20: int) -> float:
     """
     Normalised second derivative of holder growth.
@@ -21,36 +36,40 @@ def holder_acceleration(h_t: int, h_t10: int, h_t20: int) -> float:
     v2 = h_t10 - h_t20
     raw_acc = (v1 - v2) / (h_t + 1)
     # Clip to reasonable range to prevent outliers
-    return float(np.clip(raw_acc, -10.0, 10.0))
+    return _clip(raw_acc, -10.0, 10.0)
 
 
 def stealth_accumulation(unique_buyers: int, sells_20m: int,
-                         buys_20m: int, price_series: np.ndarray) -> float:
+                         buys_20m: int, price_series: np.ndarray,
+                         stats: tuple[float, float] | None = None) -> float:
     """
     Stealth Accumulation Score.
 
     SA = unique_buyers × (1 - sell_ratio) × price_stability
 
     High SA = many unique buyers, few sells, stable price → silent accumulation.
+    stats: precomputed _mean_std(price_series), if the caller already has it.
     """
     sell_ratio = sells_20m / (buys_20m + 1e-9)
-    mean_price = np.mean(price_series)
-    price_stability = 1.0 - (np.std(price_series) / (mean_price + 1e-9))
+    mean_price, std_price = stats or _mean_std(price_series)
+    price_stability = 1.0 - (std_price / (mean_price + 1e-9))
     # Clamp stability to [0, 1]
     price_stability = max(0.0, min(1.0, price_stability))
     return unique_buyers * (1.0 - sell_ratio) * price_stability
 
 
-def volatility_shift(price_20m: np.ndarray, price_5m: np.ndarray) -> float:
+def volatility_shift(price_20m: np.ndarray, price_5m: np.ndarray,
+                     stats_20m: tuple[float, float] | None = None) -> float:
     """
     Volatility Shift — detects compression → breakout.
 
     VS = std(P_5m) / std(P_20m)
 
     High VS = recent volatility expanding relative to longer window → potential breakout.
+    stats_20m: precomputed _mean_std(price_20m), if the caller already has it.
     """
-    vol_20 = np.std(price_20m)
-    vol_5 = np.std(price_5m)
+    vol_20 = (stats_20m or _mean_std(price_20m))[1]
+    vol_5 = _mean_std(price_5m)[1]
     return vol_5 / (vol_20 + 1e-9)
 
 
@@ -82,37 +101,20 @@ def compute_liquidity_acceleration(liq_series: np.ndarray) -> float:
     return accel / (l_t + 1e-9)
 
 
-def compute_volume_hhi(buyers_data: list[dict]) -> float:
+def compute_volume_hhi(buyers_volumes: np.ndarray | list[float]) -> float:
     """
     Herfindahl-Hirschman Index (HHI) for volume concentration.
-    HHI = sum(s^2) where s is market share of each buyer.
-    
-    buyers_data: list of dicts with 'amount' or similar. 
-    Note: 'buyers_data' from Helius only has valid wallet addresses currently, 
-    we need volume per wallet. If we don't have volume, we use simple count 
-    concentration or assume equal volume (which makes HHI = 1/N).
-    
-    CRITICAL: 'get_buyers_stats' currently returns unique wallets and first trade time, 
-    BUT NOT volume per wallet. We need to upgrade 'get_buyers_stats' to return volume 
-    or use a proxy. 
-    
-    Proxy for now: If we can't get volume, we return 0.0 (neutral).
-    Actually, let's allow passing a list of volumes.
+    HHI = sum(s^2) where s is market share of each buyer = sum(v^2) / sum(v)^2.
+
+    buyers_volumes: volume per buyer wallet. No volume data → 0.0 (neutral).
     """
-    if not buyers_data:
+    v = np.asarray(buyers_volumes, dtype=np.float64)
+    if v.size == 0:
         return 0.0
-        
-    # extract volumes if available, else assume uniform (useless for HHI)
-    # If the input list is just volumes, use that.
-    # We will assume buyers_data contains {"volume": float} for this feature.
-    cols = [b.get("volume", 0) for b in buyers_data]
-    total_vol = sum(cols)
-    if total_vol == 0:
+    total_vol = v.sum()
+    if not total_vol > 0:
         return 0.0
-        
-    shares = [v / total_vol for v in cols]
-    hhi = sum(s**2 for s in shares)
-    return hhi
+    return float(v.dot(v) / (total_vol * total_vol))
 
 
 def compute_dip_recovery(price_series: np.ndarray) -> float:
@@ -126,9 +128,11 @@ def compute_dip_recovery(price_series: np.ndarray) -> float:
     if len(price_series) < 2:
         return 0.5
         
-    high = np.max(price_series)
-    low = np.min(price_series)
-    current = price_series[-1]
+    # Short window (5m slice): builtin min/max over Python floats beat two numpy reductions
+    prices = np.asarray(price_series).tolist()
+    high = max(prices)
+    low = min(prices)
+    current = prices[-1]
     
     range_ = high - low
     if range_ == 0:
@@ -158,24 +162,25 @@ def compute_all_features(h_t: int, h_t10: int, h_t20: int,
     """Compute all features for a single token at the current timestamp.
     V6.0: Enhanced with momentum and trend features."""
     
-    # helper for HHI input
-    buyers_dicts = [{"volume": v} for v in buyers_volumes]
+    # Mean/std of the 20m window: shared by SA, vol shift and trend quality
+    stats_20m = _mean_std(price_series_20m)
     
     # V6.0: Compute advanced features
     momentum_score = compute_momentum_score(price_series_5m, vol_5m, liquidity)
-    trend_quality = compute_trend_quality(price_series_20m)
+    trend_quality = compute_trend_quality(price_series_20m, stats_20m)
     volume_quality = compute_volume_quality(vol_5m, liquidity, buys_5m, sells_5m)
     
     return {
         "holder_acc": holder_acceleration(h_t, h_t10, h_t20),
         "sa": stealth_accumulation(unique_buyers, sells_20m, buys_20m,
-                                   price_series_20m),
-        "vol_shift": volatility_shift(price_series_20m, price_series_5m),
-        "sell_pressure": sell_pressure(sells_5m, buys_5m),
+                                   price_series_20m, stats_20m),
+        "vol_shift": volatility_shift(price_series_20m, price_series_5m, stats_20m),
+        # sell_pressure / volume_intensity inlined (one division each, no call per token)
+        "sell_pressure": sells_5m / (buys_5m + sells_5m + 1),
         "accel_liq": compute_liquidity_acceleration(liquidity_series),
-        "vol_hhi": compute_volume_hhi(buyers_dicts),
+        "vol_hhi": compute_volume_hhi(buyers_volumes),
         "dip_recovery": compute_dip_recovery(price_series_5m),
-        "vol_intensity": volume_intensity(vol_5m, liquidity),
+        "vol_intensity": vol_5m / (liquidity + 1.0),
         "swr": swr,
         # V6.0: New enhanced features
         "momentum_score": momentum_score,
@@ -203,39 +208,32 @@ def compute_momentum_score(price_series: np.ndarray, volume_5m: float,
     if len(price_series) < 3:
         return 0.5
     
+    # Last 5 prices as Python floats: the math below is a handful of scalar ops
+    recent_prices = np.asarray(price_series[-5:]).tolist()
+    
     # 1. Price Momentum - slope of recent prices
-    recent_prices = price_series[-5:] if len(price_series) >= 5 else price_series
-    if len(recent_prices) >= 2:
-        price_start = np.mean(recent_prices[:2])
-        price_end = np.mean(recent_prices[-2:])
-        if price_start > 0:
-            price_momentum = (price_end - price_start) / price_start
-            price_momentum = float(np.clip(price_momentum, -0.5, 0.5)) + 0.5  # Normalize to 0-1
-        else:
-            price_momentum = 0.5
+    price_start = (recent_prices[0] + recent_prices[1]) / 2
+    price_end = (recent_prices[-2] + recent_prices[-1]) / 2
+    if price_start > 0:
+        price_momentum = (price_end - price_start) / price_start
+        price_momentum = _clip(price_momentum, -0.5, 0.5) + 0.5  # Normalize to 0-1
     else:
         price_momentum = 0.5
     
     # 2. Volume Momentum - turnover rate
     if liquidity > 0:
         turnover = volume_5m / liquidity
-        volume_momentum = float(np.clip(turnover / 2.0, 0.0, 1.0))  # 200% turnover = max
+        volume_momentum = _clip(turnover / 2.0, 0.0, 1.0)  # 200% turnover = max
     else:
         volume_momentum = 0.5
     
-    # 3. Acceleration - second derivative of price
-    if len(price_series) >= 3:
-        first_deriv = np.diff(price_series[-3:])
-        if len(first_deriv) >= 2:
-            acceleration = first_deriv[-1] - first_deriv[0]
-            # Normalize acceleration
-            price_range = np.max(price_series[-3:]) - np.min(price_series[-3:])
-            if price_range > 0:
-                acceleration = float(np.clip((acceleration / price_range + 1) / 2, 0.0, 1.0))
-            else:
-                acceleration = 0.5
-        else:
-            acceleration = 0.5
+    # 3. Acceleration - second derivative of price over the last 3 points
+    p0, p1, p2 = recent_prices[-3:]
+    acceleration = (p2 - p1) - (p1 - p0)
+    # Normalize acceleration
+    price_range = max(p0, p1, p2) - min(p0, p1, p2)
+    if price_range > 0:
+        acceleration = _clip((acceleration / price_range + 1) / 2, 0.0, 1.0)
     else:
         acceleration = 0.5
     
@@ -246,10 +244,11 @@ def compute_momentum_score(price_series: np.ndarray, volume_5m: float,
         acceleration * 0.25
     )
     
-    return float(np.clip(momentum_score, 0.0, 1.0))
+    return _clip(momentum_score, 0.0, 1.0)
 
 
-def compute_trend_quality(price_series: np.ndarray) -> float:
+def compute_trend_quality(price_series: np.ndarray,
+                          stats: tuple[float, float] | None = None) -> float:
     """
     V6.0: Valuta la qualità del trend prezzo.
     
@@ -259,23 +258,20 @@ def compute_trend_quality(price_series: np.ndarray) -> float:
     - Pulizia del trend (volatilità relativa)
     
     Ritorna un valore 0.0-1.0.
+    stats: _mean_std(price_series) già calcolato dal chiamante (opzionale).
     """
     if len(price_series) < 5:
         return 0.5
     
-    # 1. Count higher highs and higher lows
-    highs = []
-    lows = []
-    
-    for i in range(1, len(price_series) - 1):
-        if price_series[i] > price_series[i-1] and price_series[i] > price_series[i+1]:
-            highs.append(price_series[i])
-        elif price_series[i] < price_series[i-1] and price_series[i] < price_series[i+1]:
-            lows.append(price_series[i])
+    # 1. Count higher highs and higher lows (swing points: strict local max / min)
+    p = np.asarray(price_series)
+    mid, prev, nxt = p[1:-1], p[:-2], p[2:]
+    highs = mid[(mid > prev) & (mid > nxt)]
+    lows = mid[(mid < prev) & (mid < nxt)]
     
     # Trend consistency score
-    hh_count = sum(1 for i in range(1, len(highs)) if highs[i] > highs[i-1]) if len(highs) > 1 else 0
-    hl_count = sum(1 for i in range(1, len(lows)) if lows[i] > lows[i-1]) if len(lows) > 1 else 0
+    hh_count = int(np.count_nonzero(highs[1:] > highs[:-1]))
+    hl_count = int(np.count_nonzero(lows[1:] > lows[:-1]))
     
     total_swings = len(highs) + len(lows)
     if total_swings > 0:
@@ -284,15 +280,15 @@ def compute_trend_quality(price_series: np.ndarray) -> float:
         consistency = 0.5
     
     # 2. Trend strength - direction consistency
-    up_moves = sum(1 for i in range(1, len(price_series)) if price_series[i] > price_series[i-1])
-    trend_strength = up_moves / (len(price_series) - 1)
+    up_moves = int(np.count_nonzero(p[1:] > p[:-1]))
+    trend_strength = up_moves / (len(p) - 1)
     
     # 3. Clean trend - low volatility relative to move
     total_move = abs(price_series[-1] - price_series[0])
-    volatility = np.std(price_series)
+    volatility = (stats or _mean_std(p))[1]
     
     if total_move > 0 and volatility > 0:
-        efficiency = float(np.clip(total_move / (volatility * len(price_series) + 1e-9), 0.0, 1.0))
+        efficiency = _clip(total_move / (volatility * len(price_series) + 1e-9), 0.0, 1.0)
     else:
         efficiency = 0.5
     
@@ -303,7 +299,7 @@ def compute_trend_quality(price_series: np.ndarray) -> float:
         efficiency * 0.25
     )
     
-    return float(np.clip(trend_quality, 0.0, 1.0))
+    return _clip(trend_quality, 0.0, 1.0)
 
 
 def compute_volume_quality(volume_5m: float, liquidity: float, 
@@ -352,7 +348,7 @@ def compute_volume_quality(volume_5m: float, liquidity: float,
     # 3. Participation Score
     if total_trades > 0:
         # More trades = more participation = better
-        participation_score = float(np.clip(total_trades / 50, 0.3, 1.0))
+        participation_score = _clip(total_trades / 50, 0.3, 1.0)
     else:
         participation_score = 0.3
     
@@ -363,7 +359,7 @@ def compute_volume_quality(volume_5m: float, liquidity: float,
         participation_score * 0.25
     )
     
-    return float(np.clip(volume_quality, 0.0, 1.0))
+    return _clip(volume_quality, 0.0, 1.0)
 
 
 def compute_relative_strength(price_series: np.ndarray, 
@@ -396,12 +392,12 @@ def compute_relative_strength(price_series: np.ndarray,
             relative_return = token_return - market_return
             
             # Normalize to 0-1
-            rs = float(np.clip((relative_return + 0.2) / 0.4, 0.0, 1.0))
+            rs = _clip((relative_return + 0.2) / 0.4, 0.0, 1.0)
         else:
             rs = 0.5
     else:
         # No market data, use absolute performance
         # Normalize token return to 0-1
-        rs = float(np.clip((token_return + 0.2) / 0.4, 0.0, 1.0))
+        rs = _clip((token_return + 0.2) / 0.4, 0.0, 1.0)
     
     return rs
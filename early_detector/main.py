@@ -9,6 +9,7 @@ Architecture (v3.0):
 """
 
 import asyncio
+import sys
 import aiohttp
 import numpy as np
 import pandas as pd
@@ -17,7 +18,7 @@ from loguru import logger
 from early_detector.config import SCAN_INTERVAL, LOG_FILE, LOG_ROTATION, LOG_LEVEL, AUTO_TRADE_ENABLED, TRADE_AMOUNT_SOL, DEFAULT_TP_PCT, DEFAULT_SL_PCT, SLIPPAGE_BPS
 from early_detector.collector import fetch_token_metrics
 from early_detector.db import (
-    get_pool, close_pool, upsert_token, insert_metrics,
+    get_pool, close_pool, upsert_token, insert_metrics_batch,
     get_recent_metrics, get_smart_wallets_stats, get_tracked_tokens, upsert_wallet,
     get_unprocessed_tokens, insert_trade,
 )
@@ -29,10 +30,13 @@ from early_detector.narrative import NarrativeManager
 from early_detector.trader import execute_buy
 from early_detector.tp_sl_monitor import tp_sl_worker
 from early_detector.pumpportal import pumpportal_worker
-from early_detector.creator_monitor import creator_performance_job
+from early_detector.creator_monitor import creator_performance_job, CREATOR_CONCURRENCY
 
 # ── Logging Setup ─────────────────────────────────────────────────────────────
-logger.add(LOG_FILE, rotation=LOG_ROTATION, level=LOG_LEVEL,
+# enqueue=True: sinks are written by loguru's worker thread, log calls never block the loop
+logger.remove()
+logger.add(sys.stderr, enqueue=True)
+logger.add(LOG_FILE, rotation=LOG_ROTATION, level=LOG_LEVEL, enqueue=True,
            format="{time:YYYY-MM-DD HH:mm:ss} | {level} | {message}")
 
 # ── Global State ──────────────────────────────────────────────────────────────
@@ -149,21 +153,19 @@ async def processor_worker_batch(worker_id: int, session: aiohttp.ClientSession)
                     scored_df["delta_instability"] = 0.0
 
                 # ── SAVE SCORED METRICS TO DB ──
-                for idx, row in scored_df.iterrows():
-                    token_id = row["token_id"]
-                    # Find original metrics in results
-                    original_metrics = None
-                    for res in results:
-                        if res and res.get("token_id") == token_id:
-                            original_metrics = res.get("_metrics_raw")
-                            break
-                    
+                # Original metrics by token (first result wins), then one bulk insert per batch
+                raw_by_token = {}
+                for res in features_rows:
+                    raw_by_token.setdefault(res.get("token_id"), res.get("_metrics_raw"))
+                metric_rows = []
+                for token_id, inst_val in zip(scored_df["token_id"], scored_df["instability"]):
+                    original_metrics = raw_by_token.get(token_id)
                     if original_metrics:
-                        inst_val = row["instability"]
                         if pd.isna(inst_val):
                             inst_val = 0.0
                         original_metrics["instability_index"] = float(inst_val)
-                        await insert_metrics(token_id, original_metrics)
+                        metric_rows.append((token_id, original_metrics))
+                await insert_metrics_batch(metric_rows)
 
                 max_inst = scored_df["instability"].max()
                 logger.info(f"Scoring results: Batch size {len(scored_df)}, Max II: {max_inst:.4f}")
@@ -463,7 +465,19 @@ async def run() -> None:
     await get_pool()
     smart_wallet_stats = await get_smart_wallets_stats()
     
-    async with aiohttp.ClientSession() as session:
+    # Keep-alive + DNS caching for the few hosts we hammer (DexScreener, RPCs).
+    # Invariant: limit_per_host >= CREATOR_CONCURRENCY so parallel creator scans never
+    # queue behind each other for a DexScreener connection.
+    connector = aiohttp.TCPConnector(
+        limit=64,
+        limit_per_host=max(16, CREATOR_CONCURRENCY),
+        ttl_dns_cache=300,
+        keepalive_timeout=60,
+        enable_cleanup_closed=True,
+    )
+    # Hard upper bound for every request; per-call deadlines are set with asyncio.timeout()
+    async with aiohttp.ClientSession(connector=connector,
+                                     timeout=aiohttp.ClientTimeout(total=30)) as session:
         # Start Workers
         sw_list = list(smart_wallet_stats.keys())
         producers = [
@@ -482,7 +496,10 @@ async def run() -> None:
             await asyncio.gather(*producers, *consumers, *cron_jobs, *monitors)
         finally:
             from early_detector.db import close_pool
+            from early_detector.diary import flush_diary
+            await flush_diary()
             await close_pool()
+            await logger.complete()
 
 
 
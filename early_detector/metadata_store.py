@@ -0,0 +1,94 @@
+"""
+Persistent SQLite cache for slow-changing token metadata.
+Name/symbol/creator/twitter survive restarts so warm starts don't re-hit upstream APIs.
+"""
+
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from loguru import logger
+from early_detector.config import DATA_DIR
+
+METADATA_DB_FILE = os.path.join(DATA_DIR or ".", "metadata_cache.db")
+METADATA_TTL_SECONDS = 24 * 3600
+
+
+class MetadataStore:
+    def __init__(self, path: str = METADATA_DB_FILE, ttl_seconds: int = METADATA_TTL_SECONDS):
+        self._path = path
+        self._ttl = ttl_seconds
+        self._conn: sqlite3.Connection | None = None
+        # aget/aset girano nei worker thread di to_thread: una connessione, accesso serializzato
+        self._lock = threading.Lock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open the database lazily and create the table on first use."""
+        if self._conn is None:
+            conn = sqlite3.connect(self._path, check_same_thread=False)
+            # WAL + NORMAL sync keeps single-row upserts well under a millisecond
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS meta ("
+                "mint TEXT PRIMARY KEY, name TEXT, symbol TEXT, creator TEXT, "
+                "has_twitter INTEGER, updated_at REAL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get(self, mint: str) -> dict | None:
+        """Return cached metadata for a mint if present and not older than the TTL."""
+        try:
+            with self._lock:
+                row = self._connect().execute(
+                    "SELECT name, symbol, creator, has_twitter FROM meta "
+                    "WHERE mint = ? AND updated_at > ?",
+                    (mint, time.time() - self._ttl),
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.debug(f"Metadata store read failed for {mint[:8]}: {e}")
+            return None
+        if row is None:
+            return None
+        name, symbol, creator, has_twitter = row
+        return {
+            "name": name,
+            "symbol": symbol,
+            "creator": creator,
+            "has_twitter": bool(has_twitter),
+        }
+
+    def set(self, mint: str, name: str | None, symbol: str | None,
+            creator: str | None, has_twitter: bool) -> None:
+        """Insert or replace the metadata row for a mint."""
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute(
+                    "INSERT OR REPLACE INTO meta (mint, name, symbol, creator, has_twitter, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (mint, name, symbol, creator, int(bool(has_twitter)), time.time()),
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.debug(f"Metadata store write failed for {mint[:8]}: {e}")
+
+    async def aget(self, mint: str) -> dict | None:
+        """get() off the event loop: sqlite reads/commits (and WAL checkpoints) block."""
+        return await asyncio.to_thread(self.get, mint)
+
+    async def aset(self, mint: str, name: str | None, symbol: str | None,
+                   creator: str | None, has_twitter: bool) -> None:
+        """set() off the event loop."""
+        await asyncio.to_thread(self.set, mint, name, symbol, creator, has_twitter)
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+# Global instance
+metadata_store = MetadataStore()
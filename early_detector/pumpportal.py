@@ -5,7 +5,7 @@ import json
 import aiohttp
 from loguru import logger
 from early_detector.config import PUMPPORTAL_API_KEY
-from early_detector.db import upsert_token, touch_wallet, get_pool, upsert_wallet, upsert_creator_stats
+from early_detector.db import register_launch, get_pool, upsert_wallet
 
 
 async def fetch_pumpportal_token_data(session: aiohttp.ClientSession, token_address: str) -> dict | None:
@@ -69,12 +69,57 @@ async def fetch_pumpportal_token_data(session: aiohttp.ClientSession, token_addr
         return None
 
 
+# Wallet activity from the trade stream is buffered and written in one statement
+# every WALLET_FLUSH_SECONDS (timer task) or at WALLET_FLUSH_MAX wallets, not one round trip per trade
+WALLET_FLUSH_SECONDS = 2.0
+WALLET_FLUSH_MAX = 200
+
+
+async def _flush_wallet_activity(trades: dict[str, list], touched: set[str]) -> None:
+    """Write buffered trade increments ({wallet: [count, cluster]}) and touches."""
+    from early_detector.db import increment_wallet_trades_bulk, touch_wallets_bulk
+    rows = [(w, n, cluster) for w, (n, cluster) in trades.items()]
+    wallets = list(touched - trades.keys())
+    trades.clear()
+    touched.clear()
+    try:
+        await increment_wallet_trades_bulk(rows)
+        await touch_wallets_bulk(wallets)
+    except Exception as e:
+        logger.error(f"Error flushing wallet activity ({len(rows)} trades, {len(wallets)} touches): {e}")
+
+
+async def _wallet_flush_loop(trades: dict[str, list], touched: set[str]) -> None:
+    """Flush buffered wallet activity every WALLET_FLUSH_SECONDS, even when no message arrives."""
+    while True:
+        await asyncio.sleep(WALLET_FLUSH_SECONDS)
+        if trades or touched:
+            # shield: a cancel mid-write must not lose the batch already taken from the buffers
+            await asyncio.shield(_flush_wallet_activity(trades, touched))
+
+
 async def pumpportal_worker(token_queue: asyncio.Queue, smart_wallets: list[str]) -> None:
     """
     Worker that connects to PumpPortal Websocket.
     Discovered tokens and smart wallet trades are immediately sent to the processing queue.
     V6.0: Now uses API key for enhanced data access.
     """
+    # Survives reconnects so nothing buffered is dropped
+    pending_trades: dict[str, list] = {}
+    pending_touches: set[str] = set()
+    flusher = asyncio.create_task(_wallet_flush_loop(pending_trades, pending_touches))
+    try:
+        await _pumpportal_loop(token_queue, smart_wallets, pending_trades, pending_touches)
+    finally:
+        # Shutdown/cancel: write what is still buffered instead of dropping it
+        flusher.cancel()
+        if pending_trades or pending_touches:
+            await asyncio.shield(_flush_wallet_activity(pending_trades, pending_touches))
+
+
+async def _pumpportal_loop(token_queue: asyncio.Queue, smart_wallets: list[str],
+                           pending_trades: dict[str, list], pending_touches: set[str]) -> None:
+    """Websocket connect/read loop of pumpportal_worker; wallet activity goes into the shared buffers."""
     # Build URI with API key if available
     if PUMPPORTAL_API_KEY:
         uri = f"wss://pumpportal.fun/api/data?api-key={PUMPPORTAL_API_KEY}"
@@ -150,6 +195,11 @@ async def pumpportal_worker(token_queue: asyncio.Queue, smart_wallets: list[str]
                             recently_queued.clear()
                             last_queued_clear = asyncio.get_event_loop().time()
 
+                        # 0b. Flush buffered wallet activity early when the buffer is full
+                        # (time-based flushes run in _wallet_flush_loop)
+                        if len(pending_trades) + len(pending_touches) >= WALLET_FLUSH_MAX:
+                            await _flush_wallet_activity(pending_trades, pending_touches)
+
                         # 1. Periodically refresh known_wallets from DB (every 5 mins)
                         if asyncio.get_event_loop().time() - last_known_wallets_refresh > 300:
                             rows = await pool.fetch("SELECT wallet FROM wallet_performance")
@@ -198,11 +248,8 @@ async def pumpportal_worker(token_queue: asyncio.Queue, smart_wallets: list[str]
                             virtual_sol_reserves = float(data.get("virtual_sol_reserves", 0) or 0)
                             
                             logger.info(f"🆕 PumpPortal: New Token {symbol} ({mint[:6]}...) by {trader[:6]}... (initial_sol={initial_sol:.4f})")
-                            token_id = await upsert_token(mint, name, symbol, narrative="GENERIC", creator_address=trader)
-                            
-                            # Increment tokens launched by this creator
-                            if trader:
-                                await upsert_creator_stats(trader, {"total_tokens": 1})
+                            # Token upsert + creator token count in one acquire/transaction
+                            token_id = await register_launch(mint, name, symbol, narrative="GENERIC", creator_address=trader)
                             
                             # ── SNIPER LOGIC (V6.3) ──
                             from early_detector.config import SNIPER_ENABLED, SNIPER_AMOUNT_SOL, SLIPPAGE_BPS, DEFAULT_TP_PCT, DEFAULT_SL_PCT, AUTO_TRADE_ENABLED
@@ -271,17 +318,19 @@ async def pumpportal_worker(token_queue: asyncio.Queue, smart_wallets: list[str]
                         if trader and tx_type in ["buy", "sell", "migration"]:
                             is_trade = tx_type in ["buy", "sell"]
                             
-                            # 1. Update wallet activity
-                            from early_detector.db import increment_wallet_trades
+                            # 1. Update wallet activity (buffered, see _flush_wallet_activity)
                             if trader in known_wallets:
                                 if is_trade:
-                                    await increment_wallet_trades(trader, cluster="retail")
+                                    entry = pending_trades.setdefault(trader, [0, "retail"])
+                                    entry[0] += 1
+                                    entry[1] = "retail"
                                 else:
-                                    await touch_wallet(trader)
+                                    pending_touches.add(trader)
                             else:
                                 try:
                                     # Create new entry for previously unknown wallet
-                                    await increment_wallet_trades(trader, cluster="new")
+                                    entry = pending_trades.setdefault(trader, [0, "new"])
+                                    entry[0] += 1
                                     known_wallets.add(trader)
                                     
                                     # Sniper V6.0: If a smart wallet buys a token early, consider it a 'Smart Snipe'
@@ -0,0 +1,73 @@
+"""
+Async token-bucket rate limiter, steered by upstream rate-limit response headers.
+"""
+
+import asyncio
+import time
+from typing import Mapping
+
+
+class AsyncTokenBucket:
+    """
+    Allows `rate` requests/second on average with bursts of up to `burst`.
+
+    Callers `await acquire()` before each request and hand the response back via
+    `update_from_response()` so that `x-ratelimit-remaining` / `retry-after`
+    hints tighten the bucket before the server starts answering 429.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._last = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    async def acquire(self, timeout: float | None = None) -> None:
+        """Wait until a request slot is available and consume it.
+        Raises TimeoutError if that takes longer than `timeout` seconds (queue time included)."""
+        async with asyncio.timeout(timeout):
+            # Holding the lock while sleeping keeps waiters in FIFO order
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    if now < self._paused_until:
+                        await asyncio.sleep(self._paused_until - now)
+                        continue
+                    self._refill(now)
+                    if self._tokens >= 1.0:
+                        self._tokens -= 1.0
+                        return
+                    await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+    def pause(self, seconds: float) -> None:
+        """Block all callers for `seconds` (e.g. after a 429) and drain the bucket."""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+        self._tokens = 0.0
+
+    def update_from_response(self, status: int, headers: Mapping[str, str]) -> None:
+        """Adjust the bucket from rate-limit hints in a response."""
+        retry_after = _parse_float(headers.get("retry-after"))
+        if status == 429:
+            self.pause(retry_after if retry_after is not None else 1.0)
+        elif retry_after is not None:
+            self.pause(retry_after)
+
+        remaining = _parse_float(headers.get("x-ratelimit-remaining"))
+        if remaining is not None:
+            # Never hand out more slots than the server says are left in its window
+            self._tokens = min(self._tokens, remaining)
+
+
+def _parse_float(value: str | None) -> float | None:
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
@@ -4,16 +4,43 @@ TP/SL Monitor — Watches open positions and auto-sells on TP or SL triggers.
 
 import asyncio
 import aiohttp
+import numpy as np
 from loguru import logger
 
 from early_detector.db import get_open_trades, close_trade
 from early_detector.trader import execute_sell
-from early_detector.collector import fetch_dexscreener_pair
+from early_detector.collector import fetch_dexscreener_pairs_batch, DEXSCREENER_BATCH_SIZE
 
 
 CHECK_INTERVAL = 10  # seconds between price checks
 
 
+async def fetch_prices(session: aiohttp.ClientSession, addresses: list[str]) -> dict[str, float]:
+    """Current price per token, DEXSCREENER_BATCH_SIZE tokens per DexScreener request."""
+    unique = list(dict.fromkeys(addresses))
+    results = await asyncio.gather(*(
+        fetch_dexscreener_pairs_batch(session, unique[i:i + DEXSCREENER_BATCH_SIZE])
+        for i in range(0, len(unique), DEXSCREENER_BATCH_SIZE)
+    ))
+    return {
+        addr: float(m["price"])
+        for batch in results for addr, m in batch.items()
+        if m and m.get("price")
+    }
+
+
+def scan_positions(entry: np.ndarray, current: np.ndarray,
+                   tp_pct: np.ndarray, sl_pct: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Evaluate every open position at once (one array per field).
+    Returns (roi_pct, tp_hit, sl_hit); TP wins when both would trigger.
+    """
+    roi_pct = (current - entry) / entry * 100
+    tp_hit = roi_pct >= tp_pct
+    sl_hit = ~tp_hit & (roi_pct <= -sl_pct)
+    return roi_pct, tp_hit, sl_hit
+
+
 async def tp_sl_worker(session: aiohttp.ClientSession) -> None:
     """
     Background worker: checks open positions every 10s.
@@ -29,54 +56,46 @@ async def tp_sl_worker(session: aiohttp.ClientSession) -> None:
                 await asyncio.sleep(CHECK_INTERVAL)
                 continue
 
-            for trade in open_trades:
+            trades = [t for t in open_trades if float(t["price_entry"] or 0) > 0]
+            prices = await fetch_prices(session, [t["token_address"] for t in trades])
+            trades = [t for t in trades if t["token_address"] in prices]
+            if not trades:
+                await asyncio.sleep(CHECK_INTERVAL)
+                continue
+
+            entry = np.array([float(t["price_entry"]) for t in trades])
+            current = np.array([prices[t["token_address"]] for t in trades])
+            tp_pct = np.array([float(t["tp_pct"] or 50) for t in trades])
+            sl_pct = np.array([float(t["sl_pct"] or 30) for t in trades])
+            roi_pct, tp_hit, sl_hit = scan_positions(entry, current, tp_pct, sl_pct)
+
+            # Update ROI in DB (one statement for all positions)
+            await update_trades_roi([t["id"] for t in trades], roi_pct.tolist())
+
+            for i in np.flatnonzero(tp_hit | sl_hit).tolist():
+                trade = trades[i]
                 trade_id = trade["id"]
                 token_address = trade["token_address"]
-                entry_price = float(trade["price_entry"] or 0)
-                tp_pct = float(trade["tp_pct"] or 50)
-                sl_pct = float(trade["sl_pct"] or 30)
-
-                if entry_price <= 0:
-                    continue
-
-                # Get current price from DexScreener
-                metrics = await fetch_dexscreener_pair(session, token_address)
-                if not metrics or not metrics.get("price"):
-                    continue
-
-                current_price = float(metrics["price"])
-                roi_pct = ((current_price - entry_price) / entry_price) * 100
-
-                # Update ROI in DB
-                await update_trade_roi(trade_id, roi_pct, current_price)
-
-                # Check TP
-                if roi_pct >= tp_pct:
-                    logger.info(f"🎯 TP HIT! {token_address[:8]}... ROI: {roi_pct:+.1f}% (target: +{tp_pct}%)")
-                    result = await execute_sell(session, token_address)
-                    if result["success"]:
-                        await close_trade(trade_id, "TP_HIT", current_price, roi_pct, result.get("tx_hash", ""))
-                        logger.info(f"✅ TP sell executed for {token_address[:8]}...")
-                    else:
-                        error_msg = result.get('error')
-                        logger.warning(f"⚠️ TP sell failed: {error_msg}")
-                        if result.get("reason") == "ZERO_BALANCE":
-                            logger.info(f"🧹 Closing trade {trade_id} as MANUAL_CLOSE (no tokens found in wallet)")
-                            await close_trade(trade_id, "MANUAL_CLOSE", current_price, roi_pct, "N/A")
-
-                # Check SL
-                elif roi_pct <= -sl_pct:
-                    logger.info(f"🛑 SL HIT! {token_address[:8]}... ROI: {roi_pct:+.1f}% (limit: -{sl_pct}%)")
-                    result = await execute_sell(session, token_address)
-                    if result["success"]:
-                        await close_trade(trade_id, "SL_HIT", current_price, roi_pct, result.get("tx_hash", ""))
-                        logger.info(f"✅ SL sell executed for {token_address[:8]}...")
-                    else:
-                        error_msg = result.get('error')
-                        logger.warning(f"⚠️ SL sell failed: {error_msg}")
-                        if result.get("reason") == "ZERO_BALANCE":
-                            logger.info(f"🧹 Closing trade {trade_id} as MANUAL_CLOSE (no tokens found in wallet)")
-                            await close_trade(trade_id, "MANUAL_CLOSE", current_price, roi_pct, "N/A")
+                current_price = float(current[i])
+                roi = float(roi_pct[i])
+
+                if tp_hit[i]:
+                    status, label = "TP_HIT", "TP"
+                    logger.info(f"🎯 TP HIT! {token_address[:8]}... ROI: {roi:+.1f}% (target: +{tp_pct[i]}%)")
+                else:
+                    status, label = "SL_HIT", "SL"
+                    logger.info(f"🛑 SL HIT! {token_address[:8]}... ROI: {roi:+.1f}% (limit: -{sl_pct[i]}%)")
+
+                result = await execute_sell(session, token_address)
+                if result["success"]:
+                    await close_trade(trade_id, status, current_price, roi, result.get("tx_hash", ""))
+                    logger.info(f"✅ {label} sell executed for {token_address[:8]}...")
+                else:
+                    error_msg = result.get('error')
+                    logger.warning(f"⚠️ {label} sell failed: {error_msg}")
+                    if result.get("reason") == "ZERO_BALANCE":
+                        logger.info(f"🧹 Closing trade {trade_id} as MANUAL_CLOSE (no tokens found in wallet)")
+                        await close_trade(trade_id, "MANUAL_CLOSE", current_price, roi, "N/A")
 
         except Exception as e:
             logger.error(f"TP/SL monitor error: {e}")
@@ -84,11 +103,15 @@ async def tp_sl_worker(session: aiohttp.ClientSession) -> None:
         await asyncio.sleep(CHECK_INTERVAL)
 
 
-async def update_trade_roi(trade_id: int, roi_pct: float, current_price: float) -> None:
-    """Update the real-time ROI of an open trade."""
+async def update_trades_roi(trade_ids: list[int], roi_pcts: list[float]) -> None:
+    """Update the real-time ROI of many open trades in one statement."""
     from early_detector.db import get_pool
     pool = await get_pool()
     await pool.execute(
-        "UPDATE trades SET roi_pct = $1 WHERE id = $2",
-        roi_pct, trade_id
+        """
+        UPDATE trades t SET roi_pct = u.roi_pct
+        FROM UNNEST($1::bigint[], $2::float8[]) AS u(id, roi_pct)
+        WHERE t.id = u.id
+        """,
+        trade_ids, roi_pcts
     )
@@ -0,0 +1,11 @@
+-- ============================================================================
+-- Rug flag computed by Postgres on every metrics row
+-- (same rule as creator_monitor: liquidity < $1000, mcap < $5000 or no price)
+-- ============================================================================
+
+ALTER TABLE token_metrics_timeseries
+    ADD COLUMN IF NOT EXISTS is_likely_rug BOOLEAN GENERATED ALWAYS AS (
+        COALESCE(liquidity, 0) < 1000
+        OR COALESCE(marketcap, 0) < 5000
+        OR COALESCE(price, 0) = 0
+    ) STORED;
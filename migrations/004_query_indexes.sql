@@ -0,0 +1,21 @@
+-- ============================================================================
+-- Indexes backing the hot lookups in db.py / dashboard.py
+-- (token_metrics_timeseries(token_id, timestamp DESC) already exists: idx_token_time)
+--
+-- CONCURRENTLY does not block writers but cannot run inside a transaction:
+-- execute the statements one at a time.
+-- ============================================================================
+
+-- Latest signal per token: has_recent_signal, the analyze enrichment lookup,
+-- the signals join in get_tracked_tokens
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_signals_token_ts
+    ON signals (token_id, timestamp DESC);
+
+-- Creator scans: get_creators_to_analyze (created_at cutoff), get_tokens_for_creators
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tokens_creator_created
+    ON tokens (creator_address, created_at)
+    WHERE creator_address IS NOT NULL;
+
+-- /api/tokens: ORDER BY first_seen_at DESC NULLS LAST LIMIT $1
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_tokens_first_seen
+    ON tokens (first_seen_at DESC NULLS LAST);
@@ -0,0 +1,26 @@
+-- ============================================================================
+-- OPTIONAL — only where the timescaledb extension is available.
+-- Turns the two time-series tables into hypertables so that retention
+-- (cleanup_old_data) drops whole chunks instead of DELETE-scanning the heap.
+-- db.cleanup_old_data detects hypertables and falls back to DELETE without them.
+-- ============================================================================
+
+CREATE EXTENSION IF NOT EXISTS timescaledb;
+
+-- Unique constraints on a hypertable must include the partitioning column
+ALTER TABLE token_metrics_timeseries
+    DROP CONSTRAINT IF EXISTS token_metrics_timeseries_pkey,
+    ADD PRIMARY KEY (id, timestamp);
+
+ALTER TABLE signals
+    DROP CONSTRAINT IF EXISTS signals_pkey,
+    ADD PRIMARY KEY (id, timestamp);
+
+-- 6h chunks: retention is 2 days with a cleanup every 6h (main.db_maintenance_job)
+SELECT create_hypertable('token_metrics_timeseries', 'timestamp',
+                         chunk_time_interval => INTERVAL '6 hours',
+                         migrate_data => TRUE, if_not_exists => TRUE);
+
+SELECT create_hypertable('signals', 'timestamp',
+                         chunk_time_interval => INTERVAL '1 day',
+                         migrate_data => TRUE, if_not_exists => TRUE);
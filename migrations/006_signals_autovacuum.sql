@@ -0,0 +1,16 @@
+-- ============================================================================
+-- Keep the signals visibility map current so has_recent_signal
+-- (SELECT EXTRACT(EPOCH FROM NOW() - MAX(timestamp)) ... WHERE token_id = $1
+-- AND timestamp > ...) stays an index-only scan on idx_signals_token_ts
+-- (migrations/004): MAX(timestamp) and both predicate columns are in the index
+-- key, heap pages are only visited when not all-visible.
+-- signals is append-mostly: vacuum after ~2% new rows instead of the 20% default.
+-- ============================================================================
+
+ALTER TABLE signals SET (
+    autovacuum_vacuum_scale_factor = 0.02,
+    autovacuum_vacuum_insert_scale_factor = 0.02
+);
+
+-- One-off: sets the visibility map now (VACUUM cannot run inside a transaction)
+VACUUM (ANALYZE) signals;
@@ -19,7 +19,7 @@ from loguru import logger
 from datetime import datetime, timezone, timedelta
 
 from early_detector.db import (
-    get_pool, close_pool, upsert_wallet,
+    get_pool, close_pool, upsert_wallet, upsert_wallets_bulk,
     get_all_wallet_performance, get_smart_wallets,
 )
 from early_detector.config import SW_MIN_ROI, SW_MIN_TRADES, SW_MIN_WIN_RATE
@@ -209,7 +209,8 @@ async def recluster_all_wallets() -> dict:
 
     # Run K-Means clustering
     try:
-        clustered = cluster_wallets(df)
+        # K-Means is CPU-bound: keep it off the event loop (the dashboard runs this in-process)
+        clustered = await asyncio.to_thread(cluster_wallets, df)
 
         # Update cluster labels in DB (Bulk Update for performance)
         logger.info(f"Applying labels to {len(clustered)} wallets...")
@@ -277,6 +278,52 @@ async def prune_stale_wallets(days: int = 7) -> int:
     return deleted
 
 
+async def save_discovered_wallets(rows: list[tuple[str, dict]]) -> int:
+    """
+    Bulk upsert of discovered wallets; if the single transaction fails (one bad row
+    rolls back all of them) fall back to per-row upserts. Returns the rows saved.
+    """
+    try:
+        await upsert_wallets_bulk(rows)
+        return len(rows)
+    except Exception as e:
+        logger.error(f"Bulk upsert of {len(rows)} discovered wallets failed, retrying per row: {e}")
+
+    saved = 0
+    for wallet, stats in rows:
+        try:
+            await upsert_wallet(wallet, stats)
+            saved += 1
+        except Exception as e:
+            logger.error(f"Error upserting wallet {wallet[:8]}: {e}")
+    return saved
+
+
+async def run_seed() -> dict:
+    """
+    Lightweight in-process seed (discover → prune → re-cluster) for long-running
+    callers such as the dashboard: reuses their DB pool and never closes it.
+    """
+    async with aiohttp.ClientSession() as session:
+        new_wallets = await discover_wallets_from_dexscreener(session, limit=15)
+    await save_discovered_wallets([
+        (w["wallet"], {
+            "avg_roi": 1.0, "total_trades": 1,
+            "win_rate": 0.0, "cluster_label": "unknown",
+        })
+        for w in new_wallets
+    ])
+
+    pruned = await prune_stale_wallets(days=7)
+    stats = await recluster_all_wallets()
+
+    logger.info(
+        f"✅ Seed V5.0 complete: {stats['total']} wallets, "
+        f"{stats['smart']} smart, {pruned} pruned"
+    )
+    return stats
+
+
 async def seed():
     """Main seed function V5.0 — no Helius dependency."""
     logger.info("=" * 60)
@@ -291,17 +338,16 @@ async def seed():
         new_wallets = await discover_wallets_from_dexscreener(session, limit=15)
         logger.info(f"  → Discovered {len(new_wallets)} wallet entries from trending pairs")
 
-        # Save newly discovered wallets
-        for w in new_wallets:
-            try:
-                await upsert_wallet(w["wallet"], {
-                    "avg_roi": 1.0,
-                    "total_trades": 1,
-                    "win_rate": 0.0,
-                    "cluster_label": "new",
-                })
-            except Exception as e:
-                logger.debug(f"Error upserting wallet {w['wallet'][:8]}: {e}")
+        # Save newly discovered wallets (one pipelined batch, per-row fallback)
+        await save_discovered_wallets([
+            (w["wallet"], {
+                "avg_roi": 1.0,
+                "total_trades": 1,
+                "win_rate": 0.0,
+                "cluster_label": "new",
+            })
+            for w in new_wallets
+        ])
 
     # 2. Refresh top wallets via Helius (NEW V5.0 step)
     logger.info("Step 2: Refreshing TOP active wallets via Helius for ROI calculation...")
@@ -11,7 +11,7 @@ import pandas as pd
 from loguru import logger
 
 from early_detector.config import BIRDEYE_API_KEY
-from early_detector.db import get_pool, close_pool, upsert_wallet, get_pool
+from early_detector.db import get_pool, close_pool, upsert_wallets_bulk, get_pool
 from early_detector.smart_wallets import cluster_wallets
 
 
@@ -217,16 +217,17 @@ async def seed_alt():
 
         # 5. Save to database
         logger.info("Saving to wallet_performance table...")
-        saved = 0
+        rows = []
         for wallet_addr in clustered.index:
             row = clustered.loc[wallet_addr]
-            await upsert_wallet(wallet_addr, {
+            rows.append((wallet_addr, {
                 "avg_roi": float(row["avg_roi"]),
                 "total_trades": int(row["total_trades"]),
                 "win_rate": float(row["win_rate"]),
                 "cluster_label": row.get("cluster_label", "unknown"),
-            })
-            saved += 1
+            }))
+        await upsert_wallets_bulk(rows)
+        saved = len(rows)
 
         logger.info(f"✅ Saved {saved} wallets to wallet_performance")
 
@@ -1,3 +1,5 @@
+import asyncio
+import pytest
 import time
 from early_detector.cache import CacheManager
 
@@ -11,3 +13,66 @@ def test_cache_expiry():
     c.set("key", "value", ttl_seconds=1)
     time.sleep(1.1)
     assert c.get("key") is None
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+@pytest.mark.anyio
+async def test_cache_get_or_compute_coalesces():
+    c = CacheManager()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"n": calls}
+
+    results = await asyncio.gather(*(c.get_or_compute("k", compute, ttl_seconds=10) for _ in range(5)))
+    assert calls == 1
+    assert all(r == {"n": 1} for r in results)
+    assert await c.get_or_compute("k", compute, ttl_seconds=10) == {"n": 1}
+
+def test_cache_evicts_when_full():
+    c = CacheManager(max_entries=2)
+    c.set("old", 1, ttl_seconds=10)
+    c.set("mid", 2, ttl_seconds=10)
+    c.set("new", 3, ttl_seconds=10)
+    assert c.get("old") is None
+    assert c.get("mid") == 2 and c.get("new") == 3
+
+def test_cache_evicts_expired_before_live():
+    c = CacheManager(max_entries=2)
+    c.set("short", 1, ttl_seconds=-1)  # già scaduto
+    c.set("live", 2, ttl_seconds=10)
+    c.set("new", 3, ttl_seconds=10)
+    assert c.get("live") == 2 and c.get("new") == 3
+    assert len(c._cache) == 2
+
+def test_cache_overwrite_keeps_new_expiry():
+    c = CacheManager(max_entries=2)
+    c.set("a", 1, ttl_seconds=10)
+    c.set("b", 2, ttl_seconds=20)
+    c.set("a", 3, ttl_seconds=30)  # la vecchia scadenza di "a" resta nell'heap, stale
+    c.set("c", 4, ttl_seconds=10)
+    assert c.get("a") == 3 and c.get("b") is None and c.get("c") == 4
+
+@pytest.mark.anyio
+async def test_cache_get_or_compute_releases_locks():
+    c = CacheManager()
+
+    async def boom():
+        raise ValueError("upstream down")
+
+    with pytest.raises(ValueError):
+        await c.get_or_compute("bad", boom)
+
+    async def compute():
+        await asyncio.sleep(0.01)
+        return 1
+
+    await asyncio.gather(*(c.get_or_compute("k", compute) for _ in range(3)))
+    assert c._locks == {}
+    c.clear()
+    assert c._locks == {} and c.get("k") is None
@@ -0,0 +1,77 @@
+import pytest
+import early_detector.collector as collector
+from early_detector.ratelimit import AsyncTokenBucket
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+class FakeResponse:
+    def __init__(self, status, body=None):
+        self.status = status
+        self.headers = {}
+        self._body = body
+
+    async def json(self):
+        return self._body
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    def __init__(self, responses):
+        self._responses = list(responses)
+        self.calls = 0
+
+    def get(self, url):
+        self.calls += 1
+        return self._responses.pop(0)
+
+PAIR = {
+    "baseToken": {"address": "mint1", "name": "Mint", "symbol": "MNT"},
+    "priceUsd": "0.01", "marketCap": 10000, "liquidity": {"usd": 3000},
+}
+
+@pytest.fixture(autouse=True)
+def fast_limiter(monkeypatch):
+    monkeypatch.setattr(collector, "dexscreener_limiter", AsyncTokenBucket(rate=1000.0, burst=100))
+
+@pytest.mark.anyio
+async def test_dexscreener_pair_retries_on_5xx():
+    session = FakeSession([FakeResponse(503), FakeResponse(200, {"pairs": [PAIR]})])
+    res = await collector.fetch_dexscreener_pair(session, "mint1")
+    assert session.calls == 2
+    assert res is not None and res["liquidity"] == 3000
+
+@pytest.mark.anyio
+async def test_dexscreener_pair_no_retry_on_404():
+    session = FakeSession([FakeResponse(404)])
+    assert await collector.fetch_dexscreener_pair(session, "mint1") is None
+    assert session.calls == 1
+
+@pytest.mark.anyio
+async def test_background_batch_waits_on_its_own_lane_first(monkeypatch):
+    order = []
+
+    class Recording(AsyncTokenBucket):
+        def __init__(self, name):
+            super().__init__(rate=1000.0, burst=100)
+            self.name = name
+
+        async def acquire(self, timeout=None):
+            order.append((self.name, timeout))
+            await super().acquire(timeout)
+
+    monkeypatch.setattr(collector, "dexscreener_limiter", Recording("shared"))
+    monkeypatch.setattr(collector, "dexscreener_background_limiter", Recording("background"))
+    session = FakeSession([FakeResponse(200, {"pairs": [PAIR]}), FakeResponse(200, {"pairs": [PAIR]})])
+    assert "mint1" in await collector.fetch_dexscreener_pairs_batch(session, ["mint1"], background=True)
+    assert "mint1" in await collector.fetch_dexscreener_pairs_batch(session, ["mint1"])
+    assert order == [
+        ("background", collector.DEXSCREENER_BACKGROUND_ACQUIRE_TIMEOUT),
+        ("shared", collector.DEXSCREENER_ACQUIRE_TIMEOUT),
+        ("shared", collector.DEXSCREENER_ACQUIRE_TIMEOUT),
+    ]
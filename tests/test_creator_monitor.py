@@ -0,0 +1,43 @@
+import asyncio
+import pytest
+import early_detector.creator_monitor as cm
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+def test_creator_stats_ratio_and_lifespan():
+    pairs = {
+        "alive": {"liquidity": 5000, "marketcap": 20000, "price": 0.001},
+        "dead": {"liquidity": 200, "marketcap": 20000, "price": 0.001},
+    }
+    tokens = [
+        {"address": "alive", "hours_since_creation": 30, "is_likely_rug": False},
+        {"address": "dead", "hours_since_creation": 10, "is_likely_rug": None},
+        {"address": "old_rug", "hours_since_creation": 72, "is_likely_rug": True},
+        {"address": "unlisted", "hours_since_creation": 5, "is_likely_rug": None},
+    ]
+    # old_rug counts as rugged without metrics, unlisted is not evaluable
+    assert cm._creator_stats("creator1", tokens, pairs) == ("creator1", 0.67, 10.0)
+
+def test_creator_stats_nothing_evaluable():
+    tokens = [{"address": "x", "hours_since_creation": 1, "is_likely_rug": None}]
+    assert cm._creator_stats("creator1", tokens, {}) is None
+
+@pytest.mark.anyio
+async def test_fetch_pairs_shares_batches_across_creators(monkeypatch):
+    calls = []
+
+    async def fake_batch(session, addresses, background=False):
+        assert background  # creator scan uses the low-priority lane
+        calls.append(addresses)
+        await asyncio.sleep(0)
+        return {a: {"price": 1.0} for a in addresses}
+
+    monkeypatch.setattr(cm, "fetch_dexscreener_pairs_batch", fake_batch)
+    monkeypatch.setattr(cm, "DEXSCREENER_BATCH_SIZE", 3)
+    # 3 creators with 1-2 tokens each → 2 requests, not 3
+    addresses = ["a1", "a2", "b1", "c1", "c2", "a1"]
+    pairs = await cm._fetch_pairs(None, addresses)
+    assert calls == [["a1", "a2", "b1"], ["c1", "c2"]]
+    assert set(pairs) == {"a1", "a2", "b1", "c1", "c2"}
@@ -0,0 +1,68 @@
+import time
+import asyncio
+import pytest
+from fastapi import BackgroundTasks
+import early_detector.dashboard as dashboard
+from early_detector.cache import cache
+from early_detector.dashboard import _tail
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+def test_tail_returns_last_lines(tmp_path):
+    log = tmp_path / "run.log"
+    log.write_text("".join(f"line {i}\n" for i in range(1000)), encoding="utf-8")
+    assert _tail(log, 3, block_size=16) == "line 997\nline 998\nline 999\n"
+    assert _tail(log, 5000) == log.read_text(encoding="utf-8")
+
+def test_tail_without_trailing_newline(tmp_path):
+    log = tmp_path / "run.log"
+    log.write_text("a\nb\nc", encoding="utf-8")
+    assert _tail(log, 2, block_size=2) == "b\nc"
+    assert _tail(log, 0) == ""
+
+class FakeResponse:
+    status = 200
+
+    async def json(self):
+        await asyncio.sleep(0.01)
+        return {"solana": {"usd": 150.0}}
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+class FakeSession:
+    def __init__(self):
+        self.calls = 0
+
+    def get(self, url, timeout=None):
+        self.calls += 1
+        return FakeResponse()
+
+@pytest.fixture
+def http(monkeypatch):
+    session = FakeSession()
+    monkeypatch.setattr(dashboard.app.state, "http", session, raising=False)
+    cache.clear()
+    yield session
+    cache.clear()
+
+@pytest.mark.anyio
+async def test_sol_price_cold_misses_share_one_fetch(http):
+    res = await asyncio.gather(*(dashboard.api_sol_price(BackgroundTasks()) for _ in range(5)))
+    assert all(r == {"price": 150.0} for r in res)
+    assert http.calls == 1
+
+@pytest.mark.anyio
+async def test_sol_price_serves_stale_and_refreshes_in_background(http):
+    cache.set(dashboard.SOL_PRICE_KEY, (100.0, time.time() - 120), ttl_seconds=600)
+    tasks = BackgroundTasks()
+    assert await dashboard.api_sol_price(tasks) == {"price": 100.0}
+    assert http.calls == 0 and len(tasks.tasks) == 1
+    await tasks()
+    assert http.calls == 1
+    assert await dashboard.api_sol_price(BackgroundTasks()) == {"price": 150.0}
@@ -0,0 +1,50 @@
+import pytest
+import early_detector.db as db
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+class FakePool:
+    def __init__(self, age):
+        self.age = age
+        self.calls = 0
+
+    async def fetchval(self, sql, *args):
+        self.calls += 1
+        return self.age
+
+@pytest.fixture
+def fake_pool(monkeypatch):
+    def install(age):
+        pool = FakePool(age)
+        async def get_pool():
+            return pool
+        monkeypatch.setattr(db, "get_pool", get_pool)
+        return pool
+    monkeypatch.setattr(db, "_recent_signals", type(db._recent_signals)())
+    return install
+
+@pytest.mark.anyio
+async def test_recent_signal_hit_is_served_from_memory(fake_pool):
+    pool = fake_pool(age=30.0)
+    assert await db.has_recent_signal("tok", minutes=60)
+    assert await db.has_recent_signal("tok", minutes=60)
+    assert pool.calls == 1
+    # Outside the (shorter) window the DB is asked again
+    pool.age = None
+    assert not await db.has_recent_signal("tok", minutes=0)
+    assert pool.calls == 2
+
+@pytest.mark.anyio
+async def test_no_signal_is_not_cached(fake_pool):
+    pool = fake_pool(age=None)
+    assert not await db.has_recent_signal("tok")
+    assert not await db.has_recent_signal("tok")
+    assert pool.calls == 2
+
+def test_recent_signals_lru_is_bounded(fake_pool, monkeypatch):
+    monkeypatch.setattr(db, "RECENT_SIGNALS_MAX", 3)
+    for i in range(5):
+        db._remember_signal(f"t{i}", float(i))
+    assert list(db._recent_signals) == ["t2", "t3", "t4"]
@@ -0,0 +1,27 @@
+import json
+import pytest
+import early_detector.diary as diary
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+@pytest.fixture
+def diary_file(tmp_path, monkeypatch):
+    path = tmp_path / "quant_diary.jsonl"
+    monkeypatch.setattr(diary, "DIARY_FILE", str(path))
+    return path
+
+@pytest.mark.anyio
+async def test_signals_are_written_in_order_by_background_writer(diary_file):
+    for i in range(100):
+        diary.log_trade_signal({"token_id": f"t{i}", "instability_index": float(i)}, "BULL")
+    assert not diary_file.exists()  # nothing written on the caller's path
+    await diary.flush_diary()
+    entries = [json.loads(l) for l in diary_file.read_text(encoding="utf-8").splitlines()]
+    assert [e["token_id"] for e in entries] == [f"t{i}" for i in range(100)]
+    assert entries[0]["regime"] == "BULL" and entries[0]["outcome"] == "PENDING"
+
+def test_without_event_loop_writes_inline(diary_file):
+    diary.log_trade_signal({"token_id": "x"}, "NEUTRAL")
+    assert json.loads(diary_file.read_text(encoding="utf-8"))["token_id"] == "x"
@@ -4,17 +4,17 @@ from early_detector.features import compute_liquidity_acceleration, compute_volu
 
 def test_hhi_concentration():
     # 1 whale (100% volume) -> HHI = 1.0
-    data = [{"volume": 100}]
+    data = [100]
     assert compute_volume_hhi(data) == 1.0
 
 def test_hhi_distributed():
     # 2 equal buyers -> HHI = 0.5^2 + 0.5^2 = 0.5
-    data = [{"volume": 50}, {"volume": 50}]
+    data = [50, 50]
     assert compute_volume_hhi(data) == 0.5
 
 def test_hhi_diverse():
     # 100 equal buyers -> HHI = 100 * (0.01^2) = 0.01
-    data = [{"volume": 1} for _ in range(100)]
+    data = np.ones(100)
     assert abs(compute_volume_hhi(data) - 0.01) < 1e-5
 
 def test_liquidity_acceleration():
@@ -41,3 +41,21 @@ def test_dip_recovery_none():
     # Low was 10, High was 20, Current is 10 -> 0.0
     price = np.array([20, 15, 10])
     assert compute_dip_recovery(price) == 0.0
+
+def test_mean_std_matches_numpy():
+    from early_detector.features import _mean_std
+    rng = np.random.default_rng(0)
+    for x in (rng.random(20) * 1e-6, np.array([5, 5, 5]), np.array([100, 105, 110, 115])):
+        mean, std = _mean_std(x)
+        assert mean == pytest.approx(np.mean(x), rel=1e-12)
+        assert std == pytest.approx(np.std(x), rel=1e-9, abs=1e-18)
+
+def test_trend_quality_swing_points():
+    from early_detector.features import compute_trend_quality
+    # Highs 3, 4, 5 and lows 2, 3, 4: 4 higher swings out of 6; 5 of 8 moves up
+    price = np.array([1, 3, 2, 4, 3, 5, 4, 6, 7])
+    consistency = 4 / 6
+    strength = 5 / 8
+    efficiency = min(1.0, 6 / (np.std(price) * len(price) + 1e-9))
+    expected = consistency * 0.4 + strength * 0.35 + efficiency * 0.25
+    assert compute_trend_quality(price) == pytest.approx(expected)
@@ -0,0 +1,38 @@
+import pytest
+from early_detector.metadata_store import MetadataStore
+
+def test_metadata_store_roundtrip(tmp_path):
+    store = MetadataStore(path=str(tmp_path / "meta.db"))
+    store.set("MintAddr1234pump", "Doge", "DOGE", "Creator111", True)
+    assert store.get("MintAddr1234pump") == {
+        "name": "Doge", "symbol": "DOGE", "creator": "Creator111", "has_twitter": True
+    }
+    assert store.get("UnknownMint") is None
+    store.close()
+
+def test_metadata_store_expiry(tmp_path):
+    store = MetadataStore(path=str(tmp_path / "meta.db"), ttl_seconds=0)
+    store.set("MintAddr1234pump", "Doge", "DOGE", None, False)
+    assert store.get("MintAddr1234pump") is None
+    store.close()
+
+def test_metadata_store_persists_across_instances(tmp_path):
+    path = str(tmp_path / "meta.db")
+    first = MetadataStore(path=path)
+    first.set("MintAddr1234pump", "Doge", "DOGE", None, False)
+    first.close()
+    second = MetadataStore(path=path)
+    assert second.get("MintAddr1234pump")["symbol"] == "DOGE"
+    second.close()
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+@pytest.mark.anyio
+async def test_metadata_store_async_roundtrip(tmp_path):
+    store = MetadataStore(path=str(tmp_path / "meta.db"))
+    await store.aset("MintAddr1234pump", "Doge", "DOGE", "Creator111", True)
+    assert (await store.aget("MintAddr1234pump"))["creator"] == "Creator111"
+    assert store.get("MintAddr1234pump")["symbol"] == "DOGE"
+    store.close()
@@ -0,0 +1,55 @@
+import asyncio
+import pytest
+import early_detector.db as db
+import early_detector.pumpportal as pumpportal
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+@pytest.fixture
+def flushed(monkeypatch):
+    calls = []
+
+    async def fake_increment(rows):
+        calls.append(("trades", rows))
+
+    async def fake_touch(wallets):
+        calls.append(("touches", wallets))
+
+    monkeypatch.setattr(db, "increment_wallet_trades_bulk", fake_increment)
+    monkeypatch.setattr(db, "touch_wallets_bulk", fake_touch)
+    return calls
+
+@pytest.mark.anyio
+async def test_wallet_buffer_flushed_on_timer_without_messages(monkeypatch, flushed):
+    monkeypatch.setattr(pumpportal, "WALLET_FLUSH_SECONDS", 0.01)
+
+    async def idle_loop(queue, wallets, trades, touched):
+        trades["WalletA"] = [3, "retail"]
+        await asyncio.sleep(3600)  # nessun messaggio in arrivo
+
+    monkeypatch.setattr(pumpportal, "_pumpportal_loop", idle_loop)
+    worker = asyncio.create_task(pumpportal.pumpportal_worker(asyncio.Queue(), []))
+    await asyncio.sleep(0.05)
+    assert ("trades", [("WalletA", 3, "retail")]) in flushed
+    worker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await worker
+
+@pytest.mark.anyio
+async def test_wallet_buffer_flushed_on_cancel(monkeypatch, flushed):
+    monkeypatch.setattr(pumpportal, "WALLET_FLUSH_SECONDS", 3600)
+
+    async def idle_loop(queue, wallets, trades, touched):
+        trades["WalletA"] = [1, "new"]
+        touched.add("WalletB")
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(pumpportal, "_pumpportal_loop", idle_loop)
+    worker = asyncio.create_task(pumpportal.pumpportal_worker(asyncio.Queue(), []))
+    await asyncio.sleep(0)
+    worker.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await worker
+    assert flushed == [("trades", [("WalletA", 1, "new")]), ("touches", ["WalletB"])]
@@ -0,0 +1,43 @@
+import time
+import pytest
+from early_detector.ratelimit import AsyncTokenBucket
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+@pytest.mark.anyio
+async def test_bucket_allows_burst_then_throttles():
+    bucket = AsyncTokenBucket(rate=20.0, burst=3)
+    start = time.monotonic()
+    for _ in range(3):
+        await bucket.acquire()
+    assert time.monotonic() - start < 0.05
+    await bucket.acquire()
+    assert time.monotonic() - start >= 0.04
+
+@pytest.mark.anyio
+async def test_bucket_pauses_on_429_retry_after():
+    bucket = AsyncTokenBucket(rate=100.0, burst=5)
+    bucket.update_from_response(429, {"retry-after": "0.1"})
+    start = time.monotonic()
+    await bucket.acquire()
+    assert time.monotonic() - start >= 0.09
+
+def test_bucket_clamps_to_remaining_header():
+    bucket = AsyncTokenBucket(rate=1.0, burst=10)
+    bucket.update_from_response(200, {"x-ratelimit-remaining": "2"})
+    assert bucket._tokens == 2.0
+    bucket.update_from_response(200, {"x-ratelimit-remaining": "bogus"})
+    assert bucket._tokens == 2.0
+
+@pytest.mark.anyio
+async def test_acquire_times_out_while_queued():
+    bucket = AsyncTokenBucket(rate=1.0, burst=1)
+    await bucket.acquire()
+    with pytest.raises(TimeoutError):
+        await bucket.acquire(timeout=0.05)
+    # A timed-out waiter releases the queue for the next caller
+    bucket.pause(0)
+    bucket._tokens = 1.0
+    await bucket.acquire(timeout=0.05)
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+import early_detector.tp_sl_monitor as monitor
+
+@pytest.fixture
+def anyio_backend():
+    return 'asyncio'
+
+def test_scan_positions_flags_tp_and_sl():
+    entry = np.array([1.0, 1.0, 1.0, 2.0])
+    current = np.array([1.6, 0.6, 1.1, 2.0])
+    tp = np.array([50.0, 50.0, 50.0, 0.0])
+    sl = np.array([30.0, 30.0, 30.0, 0.0])
+    roi, tp_hit, sl_hit = monitor.scan_positions(entry, current, tp, sl)
+    assert roi == pytest.approx([60.0, -40.0, 10.0, 0.0])
+    assert tp_hit.tolist() == [True, False, False, True]   # TP wins over SL at ROI 0 / 0
+    assert sl_hit.tolist() == [False, True, False, False]
+
+@pytest.mark.anyio
+async def test_fetch_prices_batches_unique_addresses(monkeypatch):
+    calls = []
+
+    async def fake_batch(session, addresses):
+        calls.append(addresses)
+        return {a: {"price": 1.5} for a in addresses if a != "none"} | {"none": {"price": None}}
+
+    monkeypatch.setattr(monitor, "fetch_dexscreener_pairs_batch", fake_batch)
+    monkeypatch.setattr(monitor, "DEXSCREENER_BATCH_SIZE", 2)
+    prices = await monitor.fetch_prices(None, ["a", "b", "a", "c", "none"])
+    assert calls == [["a", "b"], ["c", "none"]]
+    assert prices == {"a": 1.5, "b": 1.5, "c": 1.5}